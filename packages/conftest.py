@@ -17,6 +17,7 @@ from control.pv import Pv, PvData
 from control.pv import Config as PvConfig
 from control.pv import Get as PvGet
 from helpermodules import hardware_configuration, pub, timecheck
+from helpermodules.measurement_logging import time_series
 from modules.chargepoints.mqtt.chargepoint_module import ChargepointModule
 from modules.common.component_state import ChargepointState
 from modules.common.store._api import LoggingValueStore
@@ -53,6 +54,11 @@ def mock_today(monkeypatch) -> None:
     monkeypatch.setattr(timecheck, "create_unix_timestamp_current_full_hour", full_hour_timestamp)
 
 
+@pytest.fixture(autouse=True)
+def time_series_folder(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(time_series.time_series_store, "folder", tmp_path / "time_series")
+
+
 @pytest.fixture(autouse=True)
 def mock_pub(monkeypatch) -> Mock:
     pub_mock = Mock()
@@ -10,8 +10,11 @@ import pathlib
 from typing import Any, Dict, List, Optional, Tuple
 
 from control import data
+from control.chargelog.chargelog_store import charge_log_store
+from helpermodules.measurement_logging.log_store import read_log
 from helpermodules.measurement_logging.process_log import (
     FILE_ERRORS, CalculationType, _analyse_energy_source, _process_entries, get_totals)
+from helpermodules.measurement_logging.recent_log_entries import recent_daily_entries
 
 # alte Daten: Startzeitpunkt der Ladung, Endzeitpunkt, Geladene Reichweite, Energie, Leistung, Ladedauer, LP-Nummer,
 # Lademodus, ID-Tag
@@ -303,8 +306,8 @@ def _create_entry(chargepoint, charging_ev):
 def write_new_entry(new_entry):
     # json-Objekt in Datei einfügen
     (_get_parent_file() / "data"/"charge_log").mkdir(mode=0o755, parents=True, exist_ok=True)
-    filepath = str(_get_parent_file() / "data" / "charge_log" /
-                   (timecheck.create_timestamp_YYYYMM() + ".json"))
+    month = timecheck.create_timestamp_YYYYMM()
+    filepath = str(_get_parent_file() / "data" / "charge_log" / (month + ".json"))
     try:
         if os.path.exists(filepath) and os.path.getsize(filepath) == 0:
             content = []
@@ -320,8 +323,9 @@ def write_new_entry(new_entry):
     except FileNotFoundError:
         content = []
     content.append(new_entry)
-    write_and_check(filepath, content)
-    log.debug(f"Neuer Ladelog-Eintrag: {new_entry}")
+    if write_and_check(filepath, content):
+        charge_log_store.entry_written(month, content)
+        log.debug(f"Neuer Ladelog-Eintrag: {new_entry}")
 
 
 def calc_energy_costs(cp, create_log_entry: bool = False):
@@ -396,17 +400,32 @@ def _get_reference_position(cp, create_log_entry: bool) -> ReferenceTime:
             return ReferenceTime.MIDDLE
 
 
-def _get_reference_entries() -> Tuple[List[Dict], List]:
+def _get_reference_entries() -> Tuple[Dict, List]:
+    if len(recent_daily_entries.get_last(2)) < 2:
+        # nach dem Start die Einträge aus den Log-Dateien übernehmen
+        try:
+            recent_daily_entries.fill(_read_recent_entries())
+        except Exception:
+            log.exception("Fehler beim Lesen der letzten Logeinträge")
+    # wird für alle Ladepunkte nur einmal je Log-Eintrag berechnet
+    return recent_daily_entries.get_calculated("charge_costs_reference", _process_reference_entries)
+
+
+def _read_recent_entries() -> List[Dict]:
+    entries = get_todays_daily_log()["entries"]
+    if len(entries) < 2:
+        date_day_before = (datetime.datetime.now() + datetime.timedelta(days=-1)).strftime("%Y%m%d")
+        entries = get_daily_log(date_day_before)["entries"][-1:] + entries
+    return entries
+
+
+def _process_reference_entries(entries: List[Dict]) -> Tuple[Dict, List]:
     processed_entries = {}
     reference_entries = []
     try:
-        entries = get_todays_daily_log()["entries"]
-        if len(entries) >= 2:
-            reference_entries = [entries[-2], entries[-1]]
-        else:
-            date_day_before = (datetime.datetime.now() + datetime.timedelta(days=-1)).strftime("%Y%m%d")
-            entries_day_before = get_daily_log(date_day_before)["entries"]
-            reference_entries = [entries_day_before[-1], entries[0]]
+        if len(entries) < 2:
+            raise ValueError("Es sind weniger als zwei Logeinträge vorhanden.")
+        reference_entries = entries[-2:]
         processed_entries["entries"] = copy.deepcopy(reference_entries)
         processed_entries["entries"] = _process_entries(processed_entries["entries"], CalculationType.ENERGY)
         processed_entries["totals"] = get_totals(processed_entries["entries"], False)
@@ -424,8 +443,7 @@ def get_todays_daily_log():
 def get_daily_log(day):
     filepath = str(_get_parent_file() / "data" / "daily_log" / f"{day}.json")
     try:
-        with open(filepath, "r", encoding="utf-8") as json_file:
-            return json.load(json_file)
+        return read_log(filepath)
     except FILE_ERRORS:
         return []
 
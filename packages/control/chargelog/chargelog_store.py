@@ -0,0 +1,153 @@
+"""Abfrage der Ladelog-Einträge über Indizes
+
+Die Ladelogs werden weiterhin monatsweise als JSON-Liste (charge_log/YYYYMM.json) gespeichert. Beim ersten Zugriff auf
+einen Monat werden die Einträge eingelesen und Indizes für Ladepunkt, Fahrzeug, ID-Tag, Lademodus und Beginn des
+Ladevorgangs erstellt. Die Indizes bleiben gültig, solange sich die Datei nicht ändert. Neue Einträge aus
+write_new_entry werden direkt ergänzt, ohne die Datei erneut einzulesen.
+"""
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import datetime
+import json
+import logging
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+log = logging.getLogger("chargelog")
+
+TIME_FORMAT = "%m/%d/%Y, %H:%M:%S"
+# Anzahl der Monate, deren Indizes im Speicher gehalten werden
+MAX_CACHED_MONTHS = 24
+
+# Filter-Gruppe, Filter-Schlüssel und Abfrage des Werts im Eintrag
+INDEXED_FILTERS: Dict[Tuple[str, str], Callable[[Dict], Any]] = {
+    ("chargepoint", "id"): lambda entry: entry["chargepoint"]["id"],
+    ("vehicle", "id"): lambda entry: entry["vehicle"]["id"],
+    ("vehicle", "tag"): lambda entry: entry["vehicle"]["rfid"],
+    ("vehicle", "chargemode"): lambda entry: entry["vehicle"]["chargemode"],
+}
+
+
+def get_begin_timestamp(entry: Dict) -> Optional[float]:
+    try:
+        return datetime.datetime.strptime(entry["time"]["begin"], TIME_FORMAT).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+@dataclass
+class MonthIndex:
+    stamp: Optional[Tuple[int, int]] = None
+    entries: List[Dict] = field(default_factory=list)
+    # Filter -> Wert -> Positionen der Einträge
+    indexes: Dict[Tuple[str, str], Dict[Any, List[int]]] = field(
+        default_factory=lambda: {key: {} for key in INDEXED_FILTERS})
+    # (Beginn, Position) sortiert nach Beginn
+    begin_times: List[Tuple[float, int]] = field(default_factory=list)
+
+    def add(self, entry: Dict) -> None:
+        position = len(self.entries)
+        self.entries.append(entry)
+        if len(entry) == 0:
+            return
+        for key, get_value in INDEXED_FILTERS.items():
+            try:
+                self.indexes[key].setdefault(get_value(entry), []).append(position)
+            except (KeyError, TypeError):
+                pass
+        begin = get_begin_timestamp(entry)
+        if begin is not None:
+            self.begin_times.insert(bisect_right(self.begin_times, (begin, position)), (begin, position))
+
+    def query(self, filter: Dict, begin: Optional[float] = None, end: Optional[float] = None) -> List[Dict]:
+        positions: Optional[Set[int]] = None
+        for (group, key), index in self.indexes.items():
+            values = filter.get(group, {}).get(key)
+            if values:
+                matching = {position for value in values for position in index.get(value, [])}
+                positions = matching if positions is None else positions & matching
+        if begin is not None or end is not None:
+            start = 0 if begin is None else bisect_left(self.begin_times, (begin, -1))
+            stop = len(self.begin_times) if end is None else bisect_right(self.begin_times, (end, len(self.entries)))
+            matching = {position for _, position in self.begin_times[start:stop]}
+            positions = matching if positions is None else positions & matching
+        if positions is None:
+            positions = range(len(self.entries))
+        result = []
+        prio = filter.get("vehicle", {}).get("prio")
+        for position in sorted(positions):
+            entry = self.entries[position]
+            if len(entry) == 0:
+                continue
+            if "prio" in filter.get("vehicle", {}) and prio is not entry["vehicle"]["prio"]:
+                continue
+            result.append(entry)
+        return result
+
+
+def _get_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+        return stat.st_mtime_ns, stat.st_size
+    except FileNotFoundError:
+        return None
+
+
+class ChargeLogStore:
+    def __init__(self, folder: Path) -> None:
+        self.folder = folder
+        self.lock = Lock()
+        self.months: "OrderedDict[str, MonthIndex]" = OrderedDict()
+
+    def _get_path(self, month: str) -> Path:
+        return self.folder / f"{month}.json"
+
+    def _get_month(self, month: str) -> Optional[MonthIndex]:
+        path = self._get_path(month)
+        stamp = _get_stamp(path)
+        if stamp is None:
+            self.months.pop(month, None)
+            return None
+        month_index = self.months.get(month)
+        if month_index is None or month_index.stamp != stamp:
+            month_index = MonthIndex(stamp=stamp)
+            with open(path, "r", encoding="utf-8") as json_file:
+                for entry in json.load(json_file):
+                    month_index.add(entry)
+            self.months[month] = month_index
+            log.debug(f"Ladelog {month} mit {len(month_index.entries)} Einträgen indiziert.")
+        self.months.move_to_end(month)
+        while len(self.months) > MAX_CACHED_MONTHS:
+            self.months.popitem(last=False)
+        return month_index
+
+    def query(self, months: List[str], filter: Dict,
+              begin: Optional[float] = None, end: Optional[float] = None) -> List[Dict]:
+        """ liefert die Einträge der Monate, die zum Filter passen, in der Reihenfolge der Dateien."""
+        entries = []
+        with self.lock:
+            for month in months:
+                month_index = self._get_month(month)
+                if month_index is None:
+                    log.debug(f"Kein Ladelog für {month} gefunden!")
+                    continue
+                entries.extend(month_index.query(filter, begin, end))
+        return entries
+
+    def entry_written(self, month: str, content: List[Dict]) -> None:
+        """ ergänzt den letzten Eintrag, den write_new_entry an die Datei angehängt hat, in den Indizes."""
+        with self.lock:
+            month_index = self.months.get(month)
+            if month_index is None:
+                return
+            if len(month_index.entries) == len(content) - 1:
+                month_index.add(content[-1])
+                month_index.stamp = _get_stamp(self._get_path(month))
+            else:
+                # Datei wurde zwischenzeitlich anderweitig geändert
+                self.months.pop(month)
+
+
+charge_log_store = ChargeLogStore(Path(__file__).resolve().parents[3] / "data" / "charge_log")
@@ -0,0 +1,108 @@
+import datetime
+import json
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from control.chargelog.chargelog_store import ChargeLogStore
+from control.chargelog import process_chargelog
+
+
+def create_entry(cp: int, vehicle: int, begin: str, chargemode: str = "instant_charging", prio: bool = False,
+                 rfid: str = "1234") -> Dict:
+    return {"chargepoint": {"id": cp},
+            "vehicle": {"id": vehicle, "rfid": rfid, "chargemode": chargemode, "prio": prio},
+            "time": {"begin": begin, "time_charged": "1:00"},
+            "data": {"range_charged": 10, "imported_since_mode_switch": 1000, "power": 2000, "costs": 0.3}}
+
+
+ENTRIES = [create_entry(3, 0, "01/05/2024, 08:00:00"),
+           {},
+           create_entry(4, 1, "01/03/2024, 10:00:00", chargemode="pv_charging", rfid="5678"),
+           create_entry(3, 1, "01/10/2024, 18:00:00", prio=True)]
+
+
+def write_month(folder: Path, month: str, entries: List[Dict]) -> None:
+    with open(folder / f"{month}.json", "w", encoding="utf-8") as file:
+        json.dump(entries, file)
+
+
+def get_filter(cp_ids=[], vehicle_ids=[], **kwargs) -> Dict:
+    return {"chargepoint": {"id": cp_ids}, "vehicle": {"id": vehicle_ids, **kwargs}}
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> ChargeLogStore:
+    write_month(tmp_path, "202401", ENTRIES)
+    return ChargeLogStore(tmp_path)
+
+
+@pytest.mark.parametrize("filter, expected", [
+    pytest.param(get_filter(), [ENTRIES[0], ENTRIES[2], ENTRIES[3]], id="kein Filter"),
+    pytest.param(get_filter(cp_ids=[3]), [ENTRIES[0], ENTRIES[3]], id="Ladepunkt"),
+    pytest.param(get_filter(cp_ids=[3], vehicle_ids=[1]), [ENTRIES[3]], id="Ladepunkt und Fahrzeug"),
+    pytest.param(get_filter(tag=["5678"]), [ENTRIES[2]], id="ID-Tag"),
+    pytest.param(get_filter(chargemode=["instant_charging"]), [ENTRIES[0], ENTRIES[3]], id="Lademodus"),
+    pytest.param(get_filter(prio=False), [ENTRIES[0], ENTRIES[2]], id="Priorität"),
+    pytest.param(get_filter(cp_ids=[5]), [], id="kein Treffer"),
+])
+def test_query(filter: Dict, expected: List[Dict], store: ChargeLogStore):
+    # execution
+    entries = store.query(["202401"], filter)
+
+    # evaluation
+    assert entries == expected
+
+
+def test_query_time_range(store: ChargeLogStore):
+    # execution
+    entries = store.query(["202401"], get_filter(),
+                          begin=datetime.datetime(2024, 1, 4).timestamp(),
+                          end=datetime.datetime(2024, 1, 6).timestamp())
+
+    # evaluation
+    assert entries == [ENTRIES[0]]
+
+
+def test_entry_written(store: ChargeLogStore, tmp_path: Path):
+    # setup
+    store.query(["202401"], get_filter())
+    new_entry = create_entry(5, 0, "01/11/2024, 08:00:00")
+    content = ENTRIES + [new_entry]
+    write_month(tmp_path, "202401", content)
+
+    # execution
+    store.entry_written("202401", content)
+    entries = store.query(["202401"], get_filter(cp_ids=[5]))
+
+    # evaluation
+    assert entries == [new_entry]
+    assert store.months["202401"].entries[-1] is new_entry
+
+
+def test_changed_file_is_read_again(store: ChargeLogStore, tmp_path: Path):
+    # setup
+    store.query(["202401"], get_filter())
+    write_month(tmp_path, "202401", ENTRIES[:1])
+
+    # execution
+    entries = store.query(["202401"], get_filter())
+
+    # evaluation
+    assert entries == ENTRIES[:1]
+
+
+def test_get_log_data_multiple_months(store: ChargeLogStore, tmp_path: Path, monkeypatch):
+    # setup
+    write_month(tmp_path, "202402", [create_entry(3, 0, "02/01/2024, 08:00:00")])
+    monkeypatch.setattr(process_chargelog, "charge_log_store", store)
+    request = {"year": "2024", "month": "01", "end": {"year": "2024", "month": "03"}, "filter": get_filter(cp_ids=[3])}
+
+    # execution
+    log_data = process_chargelog.get_log_data(request)
+
+    # evaluation
+    assert len(log_data["entries"]) == 3
+    assert log_data["totals"] == {"time_charged": "3:00", "range_charged": 30,
+                                  "imported_since_mode_switch": 3000, "power": 2000, "costs": pytest.approx(0.9)}
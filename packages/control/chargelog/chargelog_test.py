@@ -8,6 +8,14 @@ from control import data
 from control.chargelog import chargelog
 from control.chargelog.chargelog import calc_energy_costs
 from control.chargepoint.chargepoint import Chargepoint
+from helpermodules.measurement_logging.recent_log_entries import RecentLogEntries
+
+
+@pytest.fixture(autouse=True)
+def recent_daily_entries(monkeypatch) -> RecentLogEntries:
+    recent_daily_entries = RecentLogEntries()
+    monkeypatch.setattr(chargelog, "recent_daily_entries", recent_daily_entries)
+    return recent_daily_entries
 
 
 @pytest.fixture()
@@ -146,3 +154,19 @@ def test_calc_charge_cost_reference_middle_day_change(mock_data, monkeypatch):
     assert cp.data.set.log.charged_energy_by_source == {
         'grid': 1243, 'pv': 386, 'bat': 671, 'cp': 0.0}
     assert round(cp.data.set.log.costs, 5) == 0.5
+
+
+def test_reference_entries_processed_once(mock_data, monkeypatch):
+    # setup
+    mock_daily_log(monkeypatch)
+    process_entries_mock = Mock(wraps=chargelog._process_entries)
+    monkeypatch.setattr(chargelog, "_process_entries", process_entries_mock)
+
+    # execution
+    first = chargelog._get_reference_entries()
+    second = chargelog._get_reference_entries()
+
+    # evaluation
+    assert first is second
+    assert chargelog.get_todays_daily_log.call_count == 1
+    assert process_entries_mock.call_count == 1
@@ -0,0 +1,77 @@
+"""Ereignisgesteuerter Start des Regelzyklus
+
+Im ereignisgesteuerten Modus wird der Regelzyklus nicht nur im festen Regelintervall, sondern vorzeitig gestartet, wenn
+sich die EVU-Leistung seit dem letzten Zyklus um mehr als den eingestellten Schwellwert geändert hat oder ein Fahrzeug
+an einem internen Ladepunkt an- oder abgesteckt wurde. Zwischen zwei Zyklen liegen mindestens min_spacing Sekunden.
+Abgefragte Zähler werden nur im Regelzyklus ausgelesen, daher wird die EVU-Leistung nur bei Zählern überwacht, die ihre
+Werte per MQTT pushen (openWB/mqtt/counter/<id>/get/power). Bei allen anderen Zählern lösen nur die Stecker-Ereignisse
+einen vorzeitigen Zyklus aus.
+"""
+import logging
+import re
+from threading import Event, Lock
+import time
+from typing import Any, Dict, Optional
+
+from control.general import EventDrivenControl
+
+log = logging.getLogger(__name__)
+
+PUSHED_POWER_TOPIC = re.compile("^openWB/mqtt/counter/([0-9]+)/get/power$")
+
+
+class ControlTrigger:
+    def __init__(self) -> None:
+        self.event = Event()
+        self.lock = Lock()
+        self.config = EventDrivenControl()
+        self.evu_counter: Optional[int] = None
+        self.grid_power_reference: Optional[float] = None
+        self.plug_states: Dict[str, bool] = {}
+        self.last_cycle = 0.0
+        self.reason: Optional[str] = None
+
+    def cycle_started(self, config: EventDrivenControl, evu_counter: Optional[int],
+                      grid_power: Optional[float]) -> None:
+        """ Die bis hier empfangenen Werte werden im aktuellen Zyklus berücksichtigt, daher werden die Bezugswerte
+        aktualisiert und ein bereits ausgelöstes Ereignis zurückgesetzt."""
+        with self.lock:
+            self.config = config
+            self.evu_counter = evu_counter
+            self.grid_power_reference = grid_power
+            self.last_cycle = time.monotonic()
+            self.reason = None
+            self.event.clear()
+
+    def check_grid_power(self, counter: int, power: float) -> None:
+        with self.lock:
+            if (self.config.active and counter == self.evu_counter and self.grid_power_reference is not None and
+                    abs(power - self.grid_power_reference) > self.config.grid_power_threshold):
+                self._fire(f"EVU-Leistung {self.grid_power_reference}W -> {power}W")
+
+    def check_pushed_value(self, topic: str, payload: Any) -> None:
+        """ Listener des BrokerCache für die gepushten Werte der MQTT-Geräte."""
+        match = PUSHED_POWER_TOPIC.match(topic)
+        if match is not None:
+            self.check_grid_power(int(match.group(1)), payload)
+
+    def check_plug_state(self, key: str, plug_state: bool) -> None:
+        with self.lock:
+            previous_plug_state = self.plug_states.get(key)
+            self.plug_states[key] = plug_state
+            if self.config.active and previous_plug_state is not None and previous_plug_state != plug_state:
+                self._fire(f"{key} {'angesteckt' if plug_state else 'abgesteckt'}")
+
+    def _fire(self, reason: str) -> None:
+        if self.event.is_set() is False:
+            self.reason = reason
+            self.event.set()
+            log.debug(f"Vorzeitiger Regelzyklus ausgelöst: {reason}")
+
+    def cycle_due(self) -> bool:
+        """ prüft, ob ein ausgelöstes Ereignis vorliegt und der Mindestabstand zum letzten Zyklus eingehalten wird."""
+        return (self.config.active and self.event.is_set() and
+                time.monotonic() - self.last_cycle >= self.config.min_spacing)
+
+
+control_trigger = ControlTrigger()
@@ -0,0 +1,111 @@
+from unittest.mock import Mock
+
+import pytest
+
+from control import control_trigger as control_trigger_module
+from control.control_trigger import ControlTrigger
+from control.general import EventDrivenControl, General
+from helpermodules import subdata as subdata_module
+from helpermodules.broker_cache import BrokerCache
+from helpermodules.subdata import SubData
+from modules.internal_chargepoint_handler.internal_chargepoint_handler_config import InternalChargepoint
+
+
+@pytest.fixture
+def control_trigger(monkeypatch) -> ControlTrigger:
+    monkeypatch.setattr(control_trigger_module.time, "monotonic", Mock(return_value=100))
+    trigger = ControlTrigger()
+    trigger.cycle_started(EventDrivenControl(active=True, grid_power_threshold=500, min_spacing=5), 0, 1000)
+    return trigger
+
+
+@pytest.mark.parametrize("counter, power, expected_event",
+                         [pytest.param(0, 1400, False, id="Änderung unter Schwellwert"),
+                          pytest.param(0, 1600, True, id="Änderung über Schwellwert"),
+                          pytest.param(0, 400, True, id="Rückgang über Schwellwert"),
+                          pytest.param(1, 1600, False, id="kein EVU-Zähler")])
+def test_check_grid_power(counter: int, power: float, expected_event: bool, control_trigger: ControlTrigger):
+    # execution
+    control_trigger.check_grid_power(counter, power)
+
+    # evaluation
+    assert control_trigger.event.is_set() == expected_event
+
+
+def test_check_plug_state(control_trigger: ControlTrigger):
+    # execution
+    control_trigger.check_plug_state("Interner Ladepunkt 0", False)
+    first_value = control_trigger.event.is_set()
+    control_trigger.check_plug_state("Interner Ladepunkt 0", True)
+
+    # evaluation
+    assert first_value is False
+    assert control_trigger.event.is_set()
+
+
+def test_inactive(control_trigger: ControlTrigger):
+    # setup
+    control_trigger.cycle_started(EventDrivenControl(active=False), 0, 1000)
+
+    # execution
+    control_trigger.check_grid_power(0, 5000)
+
+    # evaluation
+    assert control_trigger.event.is_set() is False
+    assert control_trigger.cycle_due() is False
+
+
+@pytest.mark.parametrize("now, expected_due",
+                         [pytest.param(103, False, id="Mindestabstand nicht eingehalten"),
+                          pytest.param(105, True, id="Mindestabstand eingehalten")])
+def test_cycle_due(now: float, expected_due: bool, control_trigger: ControlTrigger, monkeypatch):
+    # setup
+    control_trigger.check_grid_power(0, 2000)
+    monkeypatch.setattr(control_trigger_module.time, "monotonic", Mock(return_value=now))
+
+    # execution
+    due = control_trigger.cycle_due()
+
+    # evaluation
+    assert due == expected_due
+
+
+def message(topic: str, payload: bytes) -> Mock:
+    return Mock(topic=topic, payload=payload)
+
+
+@pytest.mark.parametrize("topic, payload, expected_due",
+                         [pytest.param("openWB/mqtt/counter/0/get/power", b"1600", True,
+                                       id="gepushte EVU-Leistung über Schwellwert"),
+                          pytest.param("openWB/mqtt/counter/0/get/power", b"1400", False,
+                                       id="gepushte EVU-Leistung unter Schwellwert"),
+                          pytest.param("openWB/mqtt/counter/1/get/power", b"5000", False,
+                                       id="gepushter Wert eines anderen Zählers"),
+                          pytest.param("openWB/internal_chargepoint/0/get/plug_state", b"true", True,
+                                       id="Fahrzeug angesteckt")])
+def test_trigger_by_received_topics(topic: str, payload: bytes, expected_due: bool, monkeypatch):
+    # setup
+    monotonic_mock = Mock(return_value=100)
+    monkeypatch.setattr(control_trigger_module.time, "monotonic", monotonic_mock)
+    trigger = ControlTrigger()
+    monkeypatch.setattr(subdata_module, "control_trigger", trigger)
+    subdata = SubData(*([Mock()]*16))
+    general = General()
+    internal_chargepoints = {"cp0": InternalChargepoint()}
+    cache = BrokerCache("test", ["openWB/mqtt/#"])
+    cache.client = Mock()
+    cache.add_listener(trigger.check_pushed_value)
+    subdata.process_general_topic(general, message("openWB/general/event_driven_control/active", b"true"))
+    subdata.process_internal_chargepoint_topic(
+        None, internal_chargepoints, message("openWB/internal_chargepoint/0/get/plug_state", b"false"))
+    trigger.cycle_started(general.data.event_driven_control, 0, 1000)
+    monotonic_mock.return_value = 110
+
+    # execution
+    if topic.startswith("openWB/mqtt/"):
+        cache.on_message(None, None, message(topic, payload))
+    else:
+        subdata.process_internal_chargepoint_topic(None, internal_chargepoints, message(topic, payload))
+
+    # evaluation
+    assert trigger.cycle_due() == expected_due
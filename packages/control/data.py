@@ -18,6 +18,7 @@ from control.pv_all import PvAll
 import dataclass_utils
 from helpermodules.graph import Graph
 from helpermodules.subdata import SubData
+from helpermodules.utils.change_tracker import SnapshotCache
 from control.counter import Counter
 from control.counter_all import CounterAll
 from control.ev.charge_template import ChargeTemplate
@@ -85,6 +86,7 @@ class Data:
         self._pv_data: Dict[str, Pv] = {}
         self._pv_all_data = PvAll()
         self._system_data = {}
+        self.snapshot_cache = SnapshotCache(SubData.change_tracker)
 
     # getter-Funktion, der Zugriff erfolgt wie bei einem Zugriff auf eine öffentliche Variable.
     @property
@@ -326,6 +328,20 @@ class Data:
             except Exception:
                 log.exception("Fehler im Data-Modul")
 
+    def start_incremental_copy(self) -> None:
+        """ Bis zum Aufruf von stop_incremental_copy werden nur die Instanzen kopiert, die sich seit der letzten Kopie
+        geändert haben. Die kopierten Daten dürfen in diesem Zeitraum nicht verändert werden.
+        """
+        self.snapshot_cache.start()
+
+    def stop_incremental_copy(self) -> None:
+        log.debug(f"Kopieren der Daten: {self.snapshot_cache.copied} Instanzen kopiert, "
+                  f"{self.snapshot_cache.reused} wiederverwendet.")
+        self.snapshot_cache.stop()
+
+    def _copy(self, category: str, source, key=None):
+        return self.snapshot_cache.get(category, key, source)
+
     def copy_system_data(self) -> None:
         with ModuleDataReceivedContext(self.event_module_update_completed):
             self.__copy_system_data()
@@ -339,16 +355,16 @@ class Data:
             # mit simcount werden Werte aktualisiert, diese sollten jedoch nur einmal nach dem Auslesen aktualisiert
             # werden, sodass die Nutzung einer Referenz vorerst funktioniert.
             self.system_data = {
-                "system": copy.deepcopy(SubData.system_data["system"])} | {
+                "system": self._copy("system_data", SubData.system_data["system"])} | {
                 k: SubData.system_data[k] for k in SubData.system_data if "device" in k} | {
                 k: SubData.system_data[k] for k in SubData.system_data if "io" in k}
-            self.general_data = copy.deepcopy(SubData.general_data)
+            self.general_data = self._copy("general_data", SubData.general_data)
             self.__copy_cp_data()
         except Exception:
             log.exception("Fehler im Prepare-Modul")
 
     def __copy_counter_data(self) -> None:
-        self.counter_all_data = copy.deepcopy(SubData.counter_all_data)
+        self.counter_all_data = self._copy("counter_all_data", SubData.counter_all_data)
         self.counter_data.clear()
         for counter in SubData.counter_data:
             stop = False
@@ -357,31 +373,22 @@ class Data:
                     if "device" in dev:
                         for component in SubData.system_data[dev].components:
                             if component[9:] == counter[7:]:
-                                self.counter_data[counter] = copy.deepcopy(SubData.counter_data[counter])
+                                self.counter_data[counter] = self._copy(
+                                    "counter_data", SubData.counter_data[counter], counter)
                                 stop = True
                                 break
                     if stop:
                         break
             else:
-                self.counter_data[counter] = copy.deepcopy(SubData.counter_data[counter])
+                self.counter_data[counter] = self._copy("counter_data", SubData.counter_data[counter], counter)
 
     def __copy_cp_data(self) -> None:
         self.cp_data.clear()
         for cp in SubData.cp_data:
-            # Workaround, da mit Python3.9/pymodbus2.5 eine pymodbus-Instanz nicht mehr kopiert werden kann.
-            # Bei einer Neukonfiguration eines Device/Komponente wird dieses neu initialisiert. Nur bei Komponenten
-            # mit simcount werden Werte aktualisiert, diese sollten jedoch nur einmal nach dem Auslesen aktualisiert
-            # werden, sodass die Nutzung einer Referenz vorerst funktioniert.
-            # Verwendung der Referenz führt bei der Pro zu Instabilität.
-            try:
-                self.cp_data[cp] = copy.deepcopy(SubData.cp_data[cp].chargepoint)
-            except TypeError:
-                self.cp_data[cp] = Chargepoint(SubData.cp_data[cp].chargepoint.num, None)
-                self.cp_data[cp].template = copy.deepcopy(SubData.cp_data[cp].chargepoint.template)
-                self.cp_data[cp].data = copy.deepcopy(SubData.cp_data[cp].chargepoint.data)
-                self.cp_data[cp].chargepoint_module = SubData.cp_data[cp].chargepoint.chargepoint_module
-        self.cp_all_data = copy.deepcopy(SubData.cp_all_data)
-        self.cp_template_data = copy.deepcopy(SubData.cp_template_data)
+            self.cp_data[cp] = self.snapshot_cache.get(
+                "cp_data", cp, SubData.cp_data[cp].chargepoint, _copy_chargepoint)
+        self.cp_all_data = self._copy("cp_all_data", SubData.cp_all_data)
+        self.cp_template_data = self._copy("cp_template_data", SubData.cp_template_data)
         for chargepoint in self.cp_data:
             try:
                 if "cp" in chargepoint:
@@ -408,12 +415,12 @@ class Data:
                     if "device" in dev:
                         for component in SubData.system_data[dev].components:
                             if component[9:] == pv[2:]:
-                                self.pv_data[pv] = copy.deepcopy(SubData.pv_data[pv])
+                                self.pv_data[pv] = self._copy("pv_data", SubData.pv_data[pv], pv)
                                 stop = True
                                 break
                     if stop:
                         break
-            self.pv_all_data = copy.deepcopy(SubData.pv_all_data)
+            self.pv_all_data = self._copy("pv_all_data", SubData.pv_all_data)
             self.bat_data.clear()
             for bat in SubData.bat_data:
                 stop = False
@@ -421,12 +428,12 @@ class Data:
                     if "device" in dev:
                         for component in SubData.system_data[dev].components:
                             if component[9:] == bat[3:]:
-                                self.bat_data[bat] = copy.deepcopy(SubData.bat_data[bat])
+                                self.bat_data[bat] = self._copy("bat_data", SubData.bat_data[bat], bat)
                                 stop = True
                                 break
                     if stop:
                         break
-            self.bat_all_data = copy.deepcopy(SubData.bat_all_data)
+            self.bat_all_data = self._copy("bat_all_data", SubData.bat_all_data)
         except Exception:
             log.exception("Fehler im Prepare-Modul")
 
@@ -435,25 +442,25 @@ class Data:
         """
         with ModuleDataReceivedContext(self.event_module_update_completed):
             try:
-                self.general_data = copy.deepcopy(SubData.general_data)
-                self.io_actions = copy.deepcopy(SubData.io_actions)
-                self.io_states = copy.deepcopy(SubData.io_states)
-                self.optional_data = copy.deepcopy(SubData.optional_data)
+                self.general_data = self._copy("general_data", SubData.general_data)
+                self.io_actions = self._copy("io_actions", SubData.io_actions)
+                self.io_states = self._copy("io_states", SubData.io_states)
+                self.optional_data = self._copy("optional_data", SubData.optional_data)
                 self.__copy_ev_data()
                 self.__copy_cp_data()
                 self.__copy_counter_data()
                 self.__copy_system_data()
                 self.__copy_module_data()
-                self.graph_data = copy.deepcopy(SubData.graph_data)
+                self.graph_data = self._copy("graph_data", SubData.graph_data)
             except Exception:
                 log.exception("Fehler im Prepare-Modul")
 
     def __copy_ev_data(self) -> None:
         self.ev_data.clear()
         for ev in SubData.ev_data:
-            self.ev_data[ev] = copy.deepcopy(SubData.ev_data[ev])
-        self.ev_template_data = copy.deepcopy(SubData.ev_template_data)
-        self.ev_charge_template_data = copy.deepcopy(SubData.ev_charge_template_data)
+            self.ev_data[ev] = self._copy("ev_data", SubData.ev_data[ev], ev)
+        self.ev_template_data = self._copy("ev_template_data", SubData.ev_template_data)
+        self.ev_charge_template_data = self._copy("ev_charge_template_data", SubData.ev_charge_template_data)
         for vehicle in self.ev_data:
             try:
                 self.ev_data[vehicle].charge_template = self.ev_charge_template_data["ct" + str(
@@ -465,6 +472,22 @@ class Data:
                 log.exception("Fehler im Prepare-Modul für EV "+str(vehicle))
 
 
+def _copy_chargepoint(chargepoint: Chargepoint) -> Chargepoint:
+    # Workaround, da mit Python3.9/pymodbus2.5 eine pymodbus-Instanz nicht mehr kopiert werden kann.
+    # Bei einer Neukonfiguration eines Device/Komponente wird dieses neu initialisiert. Nur bei Komponenten
+    # mit simcount werden Werte aktualisiert, diese sollten jedoch nur einmal nach dem Auslesen aktualisiert
+    # werden, sodass die Nutzung einer Referenz vorerst funktioniert.
+    # Verwendung der Referenz führt bei der Pro zu Instabilität.
+    try:
+        return copy.deepcopy(chargepoint)
+    except TypeError:
+        copied = Chargepoint(chargepoint.num, None)
+        copied.template = copy.deepcopy(chargepoint.template)
+        copied.data = copy.deepcopy(chargepoint.data)
+        copied.chargepoint_module = chargepoint.chargepoint_module
+        return copied
+
+
 class ModuleDataReceivedContext:
     """ Moduldaten erst kopieren, wenn alle Daten vom Broker empfangen wurden."""
 
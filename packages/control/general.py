@@ -80,10 +80,33 @@ def prices_factory() -> Prices:
     return Prices()
 
 
+@dataclass
+class EventDrivenControl:
+    active: bool = field(default=False, metadata={"topic": "event_driven_control/active"})
+    grid_power_threshold: int = field(default=500, metadata={"topic": "event_driven_control/grid_power_threshold"})
+    min_spacing: int = field(default=5, metadata={"topic": "event_driven_control/min_spacing"})
+
+
+def event_driven_control_factory() -> EventDrivenControl:
+    return EventDrivenControl()
+
+
+@dataclass
+class TimeSeriesConfig:
+    active: bool = field(default=False, metadata={"topic": "time_series/active"})
+    # Maximalgröße aller Zeitreihen [MB]
+    max_size: int = field(default=100, metadata={"topic": "time_series/max_size"})
+
+
+def time_series_config_factory() -> TimeSeriesConfig:
+    return TimeSeriesConfig()
+
+
 @dataclass
 class GeneralData:
     chargemode_config: ChargemodeConfig = field(default_factory=chargemode_config_factory)
     control_interval: int = field(default=10, metadata={"topic": "control_interval"})
+    event_driven_control: EventDrivenControl = field(default_factory=event_driven_control_factory)
     extern_display_mode: str = field(default="primary", metadata={
                                      "topic": "extern_display_mode"})
     extern: bool = field(default=False, metadata={"topic": "extern"})
@@ -105,6 +128,7 @@ class GeneralData:
     temporary_charge_templates_active: bool = False
     prices: Prices = field(default_factory=prices_factory)
     range_unit: str = "km"
+    time_series: TimeSeriesConfig = field(default_factory=time_series_config_factory)
 
 
 class General:
@@ -0,0 +1,102 @@
+""" Dauerhaft abonnierte Topics des internen Brokers.
+
+Statt in jedem Zyklus einen neuen BrokerClient zu verbinden, zu abonnieren und eine Sekunde auf die empfangenen Werte
+zu warten, hält der BrokerCache eine Verbindung offen und speichert den jeweils letzten Wert je Topic mit dem Zeitpunkt
+des Empfangs. Abfragen lesen ohne Wartezeit aus dem Cache, nur beim ersten Zugriff wird auf die retained Topics
+gewartet. Die Verbindung wird asynchron aufgebaut, paho versucht bei Fehlern selbstständig erneut zu verbinden und
+abonniert die Topics nach jeder Verbindung neu. Listener werden bei jedem empfangenen Wert aufgerufen, zB um zwischen
+zwei Regelzyklen auf gepushte Zählerwerte zu reagieren.
+"""
+from dataclasses import dataclass
+import logging
+from threading import Event, Lock, Timer
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from paho.mqtt.client import Client as MqttClient, MQTTMessage
+
+from helpermodules.broker import get_name_suffix
+from helpermodules.utils.topic_parser import decode_payload
+
+log = logging.getLogger(__name__)
+
+# Zeit nach dem Abonnieren, in der der Broker die retained Topics sendet (entspricht BrokerClient.start_finite_loop)
+INITIAL_VALUES_TIMEOUT = 1
+
+
+@dataclass
+class CachedValue:
+    payload: Any
+    timestamp: float
+
+
+class BrokerCache:
+    def __init__(self, name: str, topics: List[str]) -> None:
+        self.name = name
+        self.topics = topics
+        self.lock = Lock()
+        self.values: Dict[str, CachedValue] = {}
+        self.initialized = Event()
+        # nur beim ersten Zugriff auf die retained Topics warten, nicht in jedem Zyklus
+        self.initial_wait_done = False
+        self.client: Optional[MqttClient] = None
+        self.listeners: List[Callable[[str, Any], None]] = []
+
+    def start(self, host: str = "localhost", port: int = 1886) -> None:
+        with self.lock:
+            if self.client is not None:
+                return
+            self.client = MqttClient(f"openWB-{self.name}-{get_name_suffix()}")
+        self.client.on_connect = self.on_connect
+        self.client.on_subscribe = self.on_subscribe
+        self.client.on_message = self.on_message
+        self.client.connect_async(host, port)
+        self.client.loop_start()
+
+    def on_connect(self, client: MqttClient, userdata, flags: dict, rc: int):
+        if rc == 0:
+            client.subscribe([(topic, 2) for topic in self.topics])
+        else:
+            log.error(f"{self.name}: Verbindung zum internen Broker fehlgeschlagen: {rc}")
+
+    def on_subscribe(self, client: MqttClient, userdata, mid, granted_qos):
+        Timer(INITIAL_VALUES_TIMEOUT, self.initialized.set).start()
+
+    def add_listener(self, listener: Callable[[str, Any], None]) -> None:
+        self.listeners.append(listener)
+
+    def on_message(self, client: MqttClient, userdata, msg: MQTTMessage):
+        with self.lock:
+            if msg.payload:
+                payload = decode_payload(msg.payload)
+                self.values[msg.topic] = CachedValue(payload, time.time())
+            else:
+                # gelöschte retained Topics
+                self.values.pop(msg.topic, None)
+                return
+        for listener in self.listeners:
+            try:
+                listener(msg.topic, payload)
+            except Exception:
+                log.exception(f"{self.name}: Fehler beim Verarbeiten von {msg.topic}")
+
+    def get_values(self, topic_prefix: str) -> Dict[str, CachedValue]:
+        """ liefert die zuletzt empfangenen Werte aller Topics, die mit topic_prefix beginnen."""
+        self.start()
+        if self.initial_wait_done is False:
+            self.initial_wait_done = True
+            if self.initialized.wait(2*INITIAL_VALUES_TIMEOUT) is False:
+                log.error(f"{self.name}: Topics wurden noch nicht vollständig empfangen.")
+        with self.lock:
+            return {topic: value for topic, value in self.values.items() if topic.startswith(topic_prefix)}
+
+    def get_payloads(self, topic_prefix: str) -> Dict[str, Any]:
+        return {topic: value.payload for topic, value in self.get_values(topic_prefix).items()}
+
+    def get_stale_topics(self, topic_prefix: str, max_age: float) -> List[str]:
+        """ liefert die Topics, die seit mehr als max_age Sekunden nicht aktualisiert wurden."""
+        now = time.time()
+        return [topic for topic, value in self.get_values(topic_prefix).items() if now - value.timestamp > max_age]
+
+
+broker_cache = BrokerCache("broker-cache", ["openWB/mqtt/#", "openWB/LegacySmartHome/#"])
@@ -0,0 +1,88 @@
+from unittest.mock import Mock
+
+from helpermodules import broker_cache
+from helpermodules.broker_cache import BrokerCache
+
+
+def message(topic: str, payload: bytes) -> Mock:
+    return Mock(topic=topic, payload=payload)
+
+
+def setup_cache() -> BrokerCache:
+    cache = BrokerCache("test", ["openWB/mqtt/#"])
+    cache.client = Mock()
+    cache.initialized.set()
+    return cache
+
+
+def test_get_payloads():
+    # setup
+    cache = setup_cache()
+    cache.on_message(None, None, message("openWB/mqtt/counter/1/get/power", b"1500"))
+    cache.on_message(None, None, message("openWB/mqtt/counter/10/get/power", b"200"))
+    cache.on_message(None, None, message("openWB/mqtt/bat/2/get/soc", b"50"))
+
+    # execution
+    payloads = cache.get_payloads("openWB/mqtt/counter/1/")
+
+    # evaluation
+    assert payloads == {"openWB/mqtt/counter/1/get/power": 1500}
+
+
+def test_deleted_topic():
+    # setup
+    cache = setup_cache()
+    cache.on_message(None, None, message("openWB/mqtt/bat/2/get/soc", b"50"))
+
+    # execution
+    cache.on_message(None, None, message("openWB/mqtt/bat/2/get/soc", b""))
+
+    # evaluation
+    assert cache.get_payloads("openWB/mqtt/") == {}
+
+
+def test_get_stale_topics(monkeypatch):
+    # setup
+    cache = setup_cache()
+    monkeypatch.setattr(broker_cache.time, "time", Mock(return_value=1000))
+    cache.on_message(None, None, message("openWB/mqtt/counter/1/get/power", b"1500"))
+    monkeypatch.setattr(broker_cache.time, "time", Mock(return_value=1200))
+    cache.on_message(None, None, message("openWB/mqtt/counter/1/get/currents", b"[1, 2, 3]"))
+
+    # execution
+    stale_topics = cache.get_stale_topics("openWB/mqtt/counter/1/", 100)
+
+    # evaluation
+    assert stale_topics == ["openWB/mqtt/counter/1/get/power"]
+
+
+def test_get_values_waits_once(monkeypatch):
+    # setup
+    cache = BrokerCache("test", ["openWB/mqtt/#"])
+    cache.client = Mock()
+    wait_mock = Mock(return_value=False)
+    monkeypatch.setattr(cache.initialized, "wait", wait_mock)
+
+    # execution
+    cache.get_payloads("openWB/mqtt/")
+    cache.get_payloads("openWB/mqtt/")
+
+    # evaluation
+    wait_mock.assert_called_once()
+
+
+def test_start_connects_async(monkeypatch):
+    # setup
+    client_mock = Mock()
+    monkeypatch.setattr(broker_cache, "MqttClient", Mock(return_value=client_mock))
+    monkeypatch.setattr(broker_cache, "get_name_suffix", Mock(return_value="0"))
+    cache = BrokerCache("test", ["openWB/mqtt/#"])
+
+    # execution
+    cache.start()
+    cache.start()
+
+    # evaluation
+    client_mock.connect_async.assert_called_once_with("localhost", 1886)
+    client_mock.loop_start.assert_called_once()
+    client_mock.connect.assert_not_called()
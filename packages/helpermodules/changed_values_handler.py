@@ -1,13 +1,16 @@
+import copy
 from dataclasses import fields, is_dataclass
 from enum import Enum
+from functools import lru_cache
 import logging
 from threading import Event
-from typing import Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
 from control import data
 
-from control.data import Data
+from control.data import ModuleDataReceivedContext
 from dataclass_utils._dataclass_asdict import asdict
 from helpermodules.pub import Pub
+from helpermodules.subdata import SubData
 
 
 log = logging.getLogger(__name__)
@@ -64,76 +67,118 @@ log = logging.getLogger(__name__)
 #         self.data = SampleData()
 
 
+@lru_cache(maxsize=None)
+def _get_fields(cls: Type) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """ ermittelt einmalig je Klasse die Felder und deren Topic-Suffix (None, falls das Feld keine Metadaten hat)."""
+    return tuple((f.name, f.metadata.get("topic") if hasattr(f, "metadata") else None) for f in fields(cls))
+
+
+def _get_comparable(value, copy_value: bool = True) -> Any:
+    """ wandelt den Wert eines Topic-Felds in eine vergleichbare Form um. Dataclasses werden feldweise anhand der
+    zwischengespeicherten Feldliste in Tupel umgewandelt, Listen und Dictionaries werden nur für den Wert zum
+    Zyklus-Beginn kopiert."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (bool, str, int, float, type(None))):
+        return value
+    if isinstance(value, (Dict, List, Tuple)):
+        return copy.deepcopy(value) if copy_value else value
+    if is_dataclass(value):
+        return tuple(_get_comparable(getattr(value, name), copy_value) for name, _ in _get_fields(type(value)))
+    return asdict(value)
+
+
+def _get_payload(value) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (bool, str, int, float, type(None), Dict, List, Tuple)):
+        return value
+    return asdict(value)
+
+
+def get_topic_values(topic_prefix: str, data_inst) -> Iterator[Tuple[str, Any]]:
+    """ liefert für alle Felder mit Topic-Metadaten das vollständige Topic und den Wert. Felder ohne Metadaten, die
+    selbst eine Dataclass enthalten, werden rekursiv durchlaufen."""
+    for name, topic in _get_fields(type(data_inst)):
+        try:
+            value = getattr(data_inst, name)
+            if topic:
+                yield f"{topic_prefix}{topic}", value
+            elif is_dataclass(value):
+                yield from get_topic_values(topic_prefix, value)
+        except Exception as e:
+            log.exception(e)
+
+
+def _get_instances(cp_data: Dict, bat_data: Dict, counter_data: Dict) -> Iterator[Tuple[str, Any]]:
+    for value in cp_data.values():
+        yield f"openWB/set/chargepoint/{value.num}/", value.data
+    for value in bat_data.values():
+        yield f"openWB/set/bat/{value.num}/", value.data
+    for value in counter_data.values():
+        yield f"openWB/set/counter/{value.num}/", value.data
+
+
 class ChangedValuesHandler:
     def __init__(self, event_module_update_completed: Event) -> None:
-        self.prev_data: Data = Data(event_module_update_completed)
+        self.event_module_update_completed = event_module_update_completed
+        # Topic -> Wert zum Zyklus-Beginn
+        self.initial_values: Dict[str, Any] = {}
 
     def store_initial_values(self):
         try:
-            # speichern der Daten zum Zyklus-Beginn, um später die geänderten Werte zu ermitteln
-            self.prev_data.copy_data()
+            # speichern der Daten zum Zyklus-Beginn, um später die geänderten Werte zu ermitteln. Es werden nur die
+            # Werte der Felder mit Topic-Metadaten gespeichert, nicht die vollständigen Instanzen.
+            with ModuleDataReceivedContext(self.event_module_update_completed):
+                self.initial_values.clear()
+                for topic_prefix, data_inst in self._get_data_instances(
+                        SubData.bat_all_data, SubData.cp_all_data, SubData.counter_all_data, SubData.optional_data,
+                        _get_instances({key: value.chargepoint for key, value in SubData.cp_data.items()},
+                                       SubData.bat_data, SubData.counter_data)):
+                    self.store_topic_values(get_topic_values(topic_prefix, data_inst))
         except Exception as e:
             log.exception(e)
 
+    def store_topic_values(self, topic_values: Iterator[Tuple[str, Any]]) -> None:
+        self.initial_values.update((topic, _get_comparable(value)) for topic, value in topic_values)
+
     def pub_changed_values(self):
         try:
             # veröffentlichen der geänderten Werte
-            self._update_value("openWB/set/bat/", self.prev_data.bat_all_data.data, data.data.bat_all_data.data)
-            self._update_value("openWB/set/chargepoint/", self.prev_data.cp_all_data.data.get,
-                               data.data.cp_all_data.data.get)
-            self._update_value("openWB/set/counter/", self.prev_data.counter_all_data.data,
-                               data.data.counter_all_data.data)
-            self._update_value("openWB/set/optional/", self.prev_data.optional_data.data,
-                               data.data.optional_data.data)
-            for key, value in data.data.cp_data.items():
-                self._update_value(f"openWB/set/chargepoint/{value.num}/", self.prev_data.cp_data[key].data, value.data)
-            for key, value in data.data.bat_data.items():
-                self._update_value(f"openWB/set/bat/{value.num}/", self.prev_data.bat_data[key].data, value.data)
-            for key, value in data.data.counter_data.items():
-                self._update_value(f"openWB/set/counter/{value.num}/",
-                                   self.prev_data.counter_data[key].data, value.data)
+            for topic_prefix, data_inst in self._get_data_instances(
+                    data.data.bat_all_data, data.data.cp_all_data, data.data.counter_all_data, data.data.optional_data,
+                    _get_instances(data.data.cp_data, data.data.bat_data, data.data.counter_data)):
+                self.pub_changed_topics(get_topic_values(topic_prefix, data_inst))
             # chargepoint, ev template, autolock, time and scheduled charging plans mutable_by_algorithm immer false
         except Exception as e:
             log.exception(e)
 
-    def _update_value(self, topic_prefix, data_inst_previous, data_inst):
-        try:
-            for f in fields(data_inst):
-                try:
-                    changed = False
-                    value = getattr(data_inst, f.name)
-                    if isinstance(value, Enum):
-                        value = value.value
-                    previous_value = getattr(data_inst_previous, f.name)
-                    if isinstance(previous_value, Enum):
-                        previous_value = previous_value.value
-                    if hasattr(f, "metadata"):
-                        if f.metadata.get("topic"):
-                            if isinstance(value, (str, int, float, Dict, List, Tuple)):
-                                if previous_value != value:
-                                    changed = True
-                            elif isinstance(value, (bool, type(None))):
-                                if previous_value is not value:
-                                    changed = True
-                            else:
-                                dict_prev = dict(asdict(previous_value))
-                                dict_current = dict(asdict(value))
-                                if dict_prev != dict_current:
-                                    changed = True
-                                    value = asdict(value)
-                                    previous_value = asdict(previous_value)
-
-                            if changed:
-                                topic = f"{topic_prefix}{f.metadata['topic']}"
-                                Pub().pub(topic, value)
-                                log.debug(f"Topic {topic}, Payload {value}, vorherige Payload: {previous_value}")
-                            continue
-                    if is_dataclass(value):
-                        self._update_value(topic_prefix, previous_value, value)
-                except Exception as e:
-                    log.exception(e)
-        except Exception as e:
-            log.exception(e)
+    def _get_data_instances(self, bat_all_data, cp_all_data, counter_all_data, optional_data,
+                            instances: Iterator[Tuple[str, Any]]) -> Iterator[Tuple[str, Any]]:
+        yield "openWB/set/bat/", bat_all_data.data
+        yield "openWB/set/chargepoint/", cp_all_data.data.get
+        yield "openWB/set/counter/", counter_all_data.data
+        yield "openWB/set/optional/", optional_data.data
+        yield from instances
+
+    def pub_changed_topics(self, topic_values: Iterator[Tuple[str, Any]]) -> None:
+        for topic, value in topic_values:
+            try:
+                # Instanzen, die zu Zyklus-Beginn noch nicht existierten, werden nicht verglichen.
+                if topic not in self.initial_values:
+                    continue
+                previous_value = self.initial_values[topic]
+                current_value = _get_comparable(value, copy_value=False)
+                if previous_value is None or current_value is None:
+                    changed = previous_value is not current_value
+                else:
+                    changed = previous_value != current_value
+                if changed:
+                    payload = _get_payload(value)
+                    Pub().pub(topic, payload)
+                    log.debug(f"Topic {topic}, Payload {payload}, vorherige Payload: {previous_value}")
+            except Exception as e:
+                log.exception(e)
 
 
 class ChangedValuesContext:
@@ -141,8 +186,12 @@ class ChangedValuesContext:
         self.changed_values_handler = ChangedValuesHandler(event_module_update_completed)
 
     def __enter__(self):
+        Pub().start_batch()
         self.changed_values_handler.store_initial_values()
 
     def __exit__(self, exception_type, exception, exception_traceback) -> bool:
-        self.changed_values_handler.pub_changed_values()
+        try:
+            self.changed_values_handler.pub_changed_values()
+        finally:
+            Pub().flush_batch()
         return False
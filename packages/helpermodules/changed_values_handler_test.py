@@ -6,7 +6,10 @@ from unittest.mock import Mock
 import pytest
 
 from dataclass_utils.factories import currents_list_factory
-from helpermodules.changed_values_handler import ChangedValuesHandler
+from control import data
+from control.counter import Counter
+from helpermodules.changed_values_handler import ChangedValuesHandler, get_topic_values
+from helpermodules.subdata import SubData
 
 NONE_TYPE = type(None)
 
@@ -98,19 +101,57 @@ cases = [
            expected_pub_call=("openWB/get/field_str", "Hello")),
     Params(name="change tuple", sample_data=SampleData(sample_field_tuple=(1, 2, 4)),
            expected_pub_call=("openWB/get/field_tuple", (1, 2, 4))),
-
+    Params(name="equal int and bool", sample_data=SampleData(sample_field_int=False), expected_calls=0),
+    Params(name="equal int and float", sample_data=SampleData(sample_field_float=0.0), expected_calls=0),
+    Params(name="no change", sample_data=SampleData(), expected_calls=0),
 ]
 
 
 @pytest.mark.parametrize("params", cases, ids=[c.name for c in cases])
-def test_update_value(params: Params, mock_pub: Mock, monkeypatch):
+def test_pub_changed_topics(params: Params, mock_pub: Mock, monkeypatch):
     # setup
     handler = ChangedValuesHandler(Mock())
+    handler.store_topic_values(get_topic_values("openWB/", SampleData()))
 
     # execution
-    handler._update_value("openWB/", SampleData(), params.sample_data)
+    handler.pub_changed_topics(get_topic_values("openWB/", params.sample_data))
 
     # evaluation
-    assert len(mock_pub.method_calls) - 1 == params.expected_calls
+    assert len(mock_pub.method_calls) == params.expected_calls
     if params.expected_calls > 0:
-        assert mock_pub.method_calls[1].args == params.expected_pub_call
+        assert mock_pub.method_calls[0].args == params.expected_pub_call
+
+
+def test_pub_changed_values(mock_pub: Mock, monkeypatch):
+    # setup
+    data.data_init(Mock())
+    monkeypatch.setattr(SubData, "counter_data", {"counter0": Counter(0), "counter1": Counter(1)})
+    data.data.counter_data = {"counter0": Counter(0), "counter1": Counter(1), "counter2": Counter(2)}
+    handler = ChangedValuesHandler(Mock())
+    handler.store_initial_values()
+    mock_pub.reset_mock()
+    data.data.counter_data["counter0"].data.get.power = 1000
+    data.data.counter_data["counter2"].data.get.power = 2000
+
+    # execution
+    handler.pub_changed_values()
+
+    # evaluation
+    assert [c.args for c in mock_pub.method_calls] == [("openWB/set/counter/0/get/power", 1000)]
+
+
+def test_pub_changed_topics_nested_class_changed_in_place(mock_pub: Mock):
+    # setup
+    sample_data = SampleData()
+    handler = ChangedValuesHandler(Mock())
+    handler.store_topic_values(get_topic_values("openWB/", sample_data))
+    sample_data.sample_field_class.parameter2 = 6
+    sample_data.sample_field_list[0] = 10
+
+    # execution
+    handler.pub_changed_topics(get_topic_values("openWB/", sample_data))
+
+    # evaluation
+    assert [c.args for c in mock_pub.method_calls] == [
+        ("openWB/get/field_class", {"parameter1": False, "parameter2": 6}),
+        ("openWB/get/field_list", [10, 0, 0])]
@@ -30,6 +30,7 @@ from modules.io_devices.eebus.api import create_pub_cert_ski
 from helpermodules.broker import BrokerClient
 from helpermodules.data_migration.data_migration import MigrateData
 from helpermodules.measurement_logging.process_log import get_daily_log, get_monthly_log, get_yearly_log
+from helpermodules.measurement_logging.time_series import time_series_store
 from helpermodules.messaging import MessageType, pub_user_message
 from helpermodules.mosquitto_dynsec.mosquitto_dynsec import (generate_password_reset_token, get_user_email,
                                                              send_password_reset_to_server, verify_password_reset_token)
@@ -833,6 +834,13 @@ class Command:
         Pub().pub(f'openWB/set/log/yearly/{payload["data"]["date"]}',
                   get_yearly_log(payload["data"]["date"]))
 
+    def getTimeSeries(self, connection_id: str, payload: dict) -> None:
+        """ sendet die Zeitreihe einer Komponente (zB "counter0"), payload["data"]: series, begin, end und optional
+        resolution in Sekunden"""
+        Pub().pub(f'openWB/set/log/{connection_id}/data',
+                  time_series_store.query(payload["data"]["series"], payload["data"]["begin"],
+                                          payload["data"]["end"], payload["data"].get("resolution", 10)))
+
     def initCloud(self, connection_id: str, payload: dict) -> None:
         parent_file = Path(__file__).resolve().parents[2]
         result = run_command(
@@ -5,6 +5,7 @@ import pytest
 from control.chargepoint.chargepoint import Chargepoint
 from control.chargepoint.chargepoint_state_update import ChargepointStateUpdate
 import dataclass_utils
+from helpermodules import command
 from helpermodules.command import Command
 from helpermodules.subdata import SubData
 from modules.chargepoints.external_openwb.config import OpenWBSeries
@@ -51,3 +52,20 @@ def test_check_max_num_of_internal_chargepoints(additional_cp_mode, config, expe
 
     # evaluation
     assert msg == expected_msg
+
+
+def test_get_time_series(mock_pub: Mock, monkeypatch):
+    # setup
+    monkeypatch.setattr(Command, "_get_max_ids", Mock())
+    monkeypatch.setattr(Command, "_get_max_id_by_json_object", Mock())
+    store_mock = Mock(query=Mock(return_value=[{"timestamp": 1704067200, "power": 100}]))
+    monkeypatch.setattr(command, "time_series_store", store_mock)
+
+    # execution
+    Command(Mock()).getTimeSeries("1234", {"command": "getTimeSeries",
+                                           "data": {"series": "counter0", "begin": 1704067200, "end": 1704070800,
+                                                    "resolution": 60}})
+
+    # evaluation
+    store_mock.query.assert_called_once_with("counter0", 1704067200, 1704070800, 60)
+    assert mock_pub.pub.call_args.args == ("openWB/set/log/1234/data", [{"timestamp": 1704067200, "power": 100}])
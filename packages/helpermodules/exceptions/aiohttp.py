@@ -0,0 +1,32 @@
+import asyncio
+import concurrent.futures
+
+from aiohttp import ClientConnectionError, ClientResponseError
+
+from helpermodules.exceptions.registry import ExceptionRegistry
+
+
+def handle_client_connection_error(e: ClientConnectionError):
+    return "Die Verbindung zum Server ist fehlgeschlagen. Überprüfe Adresse und Netzwerk."
+
+
+def handle_timeout_error(e: asyncio.TimeoutError):
+    return "Innerhalb des Timeouts wurde keine Antwort erhalten. Überprüfe Adresse und Netzwerk."
+
+
+def handle_client_response_error(e: ClientResponseError):
+    code = e.status
+    if 400 <= code < 500:
+        if code == 401:
+            return "HTTP 401: Authentifizierung fehlgeschlagen. Überprüfe die Zugangsdaten"
+        return "HTTP {}: Client-Fehler. Überprüfe die Konfiguration.".format(code)
+    if 500 <= code < 600:
+        return "HTTP {}: Server-Fehler. Versuche es später erneut.".format(code)
+    return "HTTP {}: Unbekannter Fehler an Host {}".format(code, e.request_info.url)
+
+
+def register_aiohttp_exception_handlers(registry: ExceptionRegistry) -> None:
+    registry.add(ClientConnectionError, handle_client_connection_error)
+    registry.add(ClientResponseError, handle_client_response_error)
+    registry.add(asyncio.TimeoutError, handle_timeout_error)
+    registry.add(concurrent.futures.TimeoutError, handle_timeout_error)
@@ -1,17 +1,22 @@
+from collections import deque
 from dataclasses import dataclass, field
 import json
-from pathlib import Path
 import time
 import datetime
 import logging
+from typing import Dict, List
 
 from control import data
 from helpermodules.pub import Pub
-from helpermodules.utils.run_command import run_command
 from modules.common.fault_state import FaultStateLevel
 
 log = logging.getLogger(__name__)
 
+LIVE_VALUES_TOPIC = "openWB/graph/alllivevaluesJson"
+# Aufteilung der Live-Werte auf die Topics alllivevaluesJson1 bis alllivevaluesJson16
+CHUNK_SIZE = 50
+NUMBER_OF_CHUNKS = 16
+
 
 @dataclass
 class Config:
@@ -30,9 +35,14 @@ class GraphData:
 class Graph:
     def __init__(self) -> None:
         self.data = GraphData()
+        # Zeilen der Live-Werte für die eingestellte Dauer (ein Eintrag je 10s)
+        self.live_values = deque(maxlen=self.data.config.duration*6)
+        self.published_chunks: Dict[str, str] = {}
+        # nach dem Neustart die retained Topics, um den Graphen fortzusetzen
+        self.restored_chunks: Dict[int, str] = {}
 
     def pub_graph_data(self):
-        """ schreibt die Graph-Daten, sodass sie zu dem 1.9er graphing.sh passen.
+        """ veröffentlicht die Graph-Daten im Format des 1.9er graphing.sh.
         """
         def _convert_to_kW(value): return round(value/1000, 3)
 
@@ -62,9 +72,49 @@ class Graph:
 
             Pub().pub("openWB/set/graph/lastlivevaluesJson", data_line)
             Pub().pub("openWB/set/system/lastlivevaluesJson", data_line)
-            with open(str(Path(__file__).resolve().parents[2] / "ramdisk"/"graph_live.json"), "a") as f:
-                f.write(f"{json.dumps(data_line, separators=(',', ':'))}\n")
-            run_command([str(Path(__file__).resolve().parents[2] / "runs"/"graphing.sh"),
-                         str(self.data.config.duration*6)])
+            self._pub_live_values(json.dumps(data_line, separators=(',', ':')))
         except Exception:
             log.exception("Fehler im Graph-Modul")
+
+    def restore_chunk(self, index: int, payload: str) -> None:
+        if len(self.live_values) == 0:
+            self.restored_chunks[index] = payload
+
+    def _pub_live_values(self, line: str) -> None:
+        maxlen = self.data.config.duration*6
+        if len(self.live_values) == 0 and self.restored_chunks:
+            self._restore_live_values()
+        if self.live_values.maxlen != maxlen:
+            self.live_values = deque(self.live_values, maxlen=maxlen)
+        self.live_values.append(line)
+        for topic, payload in get_chunks(list(self.live_values)).items():
+            if self.published_chunks.get(topic) != payload:
+                Pub().pub(topic, payload, no_json=True)
+                self.published_chunks[topic] = payload
+
+    def _restore_live_values(self) -> None:
+        lines: List[str] = []
+        for index in range(1, NUMBER_OF_CHUNKS + 1):
+            payload = self.restored_chunks.get(index, "-")
+            if payload == "-":
+                break
+            self.published_chunks[f"{LIVE_VALUES_TOPIC}{index}"] = payload
+            # der zweite Abschnitt beginnt mit der letzten Zeile des ersten
+            lines.extend(payload.split("\n")[1 if index == 2 else 0:])
+        self.live_values.extend(lines)
+        self.restored_chunks.clear()
+        log.debug(f"{len(lines)} Live-Werte aus den retained Topics übernommen.")
+
+
+def get_chunks(lines: List[str]) -> Dict[str, str]:
+    """ teilt die Live-Werte wie graphing.sh auf: alllivevaluesJson enthält die letzten 50 Zeilen, alllivevaluesJson1
+    die ersten 50 Zeilen und die folgenden Topics jeweils 50 Zeilen ab Zeile 50, 100, ... (tail -n +50), sodass sich
+    die ersten beiden Abschnitte um eine Zeile überschneiden. Leere Abschnitte werden als "-" veröffentlicht.
+    """
+    chunks = {LIVE_VALUES_TOPIC: "\n".join(lines[-CHUNK_SIZE:]),
+              f"{LIVE_VALUES_TOPIC}1": "\n".join(lines[:CHUNK_SIZE])}
+    for index in range(2, NUMBER_OF_CHUNKS + 1):
+        start = (index - 1) * CHUNK_SIZE - 1
+        chunk = "\n".join(lines[start:start + CHUNK_SIZE])
+        chunks[f"{LIVE_VALUES_TOPIC}{index}"] = chunk if len(chunk) >= 10 else "-"
+    return chunks
@@ -0,0 +1,74 @@
+from unittest.mock import Mock
+
+import pytest
+
+from helpermodules import graph
+from helpermodules.graph import LIVE_VALUES_TOPIC, Graph, get_chunks
+
+
+def create_lines(number: int):
+    return [f'{{"timestamp":{i}}}' for i in range(number)]
+
+
+def test_get_chunks():
+    # setup
+    lines = create_lines(120)
+
+    # execution
+    chunks = get_chunks(lines)
+
+    # evaluation
+    assert chunks[LIVE_VALUES_TOPIC] == "\n".join(lines[70:])
+    assert chunks[f"{LIVE_VALUES_TOPIC}1"] == "\n".join(lines[:50])
+    assert chunks[f"{LIVE_VALUES_TOPIC}2"] == "\n".join(lines[49:99])
+    assert chunks[f"{LIVE_VALUES_TOPIC}3"] == "\n".join(lines[99:])
+    assert chunks[f"{LIVE_VALUES_TOPIC}4"] == "-"
+    assert len(chunks) == 17
+
+
+@pytest.fixture
+def mock_pub(monkeypatch) -> Mock:
+    mock_pub = Mock()
+    monkeypatch.setattr(graph, "Pub", Mock(return_value=mock_pub))
+    return mock_pub
+
+
+def test_pub_only_changed_chunks(mock_pub: Mock):
+    # setup
+    g = Graph()
+    for line in create_lines(10):
+        g._pub_live_values(line)
+    mock_pub.pub.reset_mock()
+
+    # execution
+    g._pub_live_values('{"timestamp":10}')
+
+    # evaluation
+    assert [call.args[0] for call in mock_pub.pub.call_args_list] == [LIVE_VALUES_TOPIC, f"{LIVE_VALUES_TOPIC}1"]
+
+
+def test_duration_limits_live_values(mock_pub: Mock):
+    # setup
+    g = Graph()
+    g.data.config.duration = 10
+
+    # execution
+    for line in create_lines(100):
+        g._pub_live_values(line)
+
+    # evaluation
+    assert list(g.live_values) == create_lines(100)[40:]
+
+
+def test_restore_live_values(mock_pub: Mock):
+    # setup
+    g = Graph()
+    for index, payload in get_chunks(create_lines(120)).items():
+        if index != LIVE_VALUES_TOPIC:
+            g.restore_chunk(int(index[len(LIVE_VALUES_TOPIC):]), payload)
+
+    # execution
+    g._pub_live_values('{"timestamp":120}')
+
+    # evaluation
+    assert list(g.live_values) == create_lines(121)
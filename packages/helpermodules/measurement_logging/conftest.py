@@ -1,3 +1,4 @@
+from pathlib import Path
 from threading import Event
 import pytest
 
@@ -6,6 +7,14 @@ from control.chargepoint import chargepoint
 from control.chargepoint.chargepoint_all import AllChargepoints
 from control import bat_all, counter, pv_all, pv
 from control import data
+from helpermodules.measurement_logging import log_cache
+
+
+@pytest.fixture(autouse=True)
+def log_cache_folder(monkeypatch, tmp_path: Path) -> Path:
+    monkeypatch.setattr(log_cache, "CACHE_FOLDER", tmp_path / "log_cache")
+    monkeypatch.setattr(log_cache, "open_records", {})
+    return tmp_path / "log_cache"
 
 
 @pytest.fixture(autouse=True)
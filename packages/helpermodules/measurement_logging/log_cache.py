@@ -0,0 +1,108 @@
+"""Zwischenspeicher für ausgewertete Tages-, Monats- und Jahres-Logs
+
+Die Auswertung eines Logs (Differenzen, Summen und Strom-Mix) wird je Zeitraum in data/log_cache gespeichert. Zu jedem
+Eintrag im Zwischenspeicher werden Änderungszeit und Größe der Log-Dateien gespeichert, aus denen er berechnet wurde.
+Hat sich eine dieser Dateien geändert, ist der Eintrag ungültig und wird neu berechnet.
+
+Die Einträge des laufenden Tages, Monats und Jahres ändern sich alle 5 Minuten und werden nur im Speicher gehalten, um
+die SD-Karte nicht zu belasten. Gespeichert werden nur abgeschlossene Zeiträume, je Ansicht höchstens MAX_RECORDS
+Einträge. Die ältesten werden gelöscht.
+"""
+from copy import deepcopy
+from enum import Enum
+import json
+import logging
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Tuple, Union
+
+from helpermodules import timecheck
+from helpermodules.measurement_logging.log_store import APPEND_FILE_SUFFIX
+from helpermodules.utils.json_file_handler import write_atomic
+
+log = logging.getLogger(__name__)
+
+CACHE_FOLDER = Path(__file__).resolve().parents[3] / "data" / "log_cache"
+
+# maximale Anzahl gespeicherter Einträge je Ansicht
+MAX_RECORDS = 100
+
+# Zugriff aus dem Regelungs-Thread (neue Log-Einträge) und dem Command-Thread (Abfragen der Logs)
+lock = Lock()
+
+
+class LogView(Enum):
+    DAILY = "daily"
+    MONTHLY = "monthly"
+    YEARLY = "yearly"
+
+
+# Einträge der laufenden Zeiträume
+open_records: Dict[Tuple[LogView, str], Dict] = {}
+
+
+def get_source_stamp(path: Union[str, Path]) -> List[Optional[List[int]]]:
+    """ liefert Änderungszeit und Größe der JSON-Datei und der angehängten Einträge eines Logs (None, wenn die Datei
+    nicht existiert)."""
+    path = Path(path)
+    stamp = []
+    for file in (path, path.with_suffix(APPEND_FILE_SUFFIX)):
+        try:
+            stat = file.stat()
+            stamp.append([stat.st_mtime_ns, stat.st_size])
+        except FileNotFoundError:
+            stamp.append(None)
+    return stamp
+
+
+def sources_unchanged(sources: Dict[str, List]) -> bool:
+    return all(get_source_stamp(path) == stamp for path, stamp in sources.items())
+
+
+def _get_record_path(view: LogView, name: str) -> Path:
+    return CACHE_FOLDER / view.value / f"{name}.json"
+
+
+def _is_open(view: LogView, name: str) -> bool:
+    if view == LogView.DAILY:
+        return name == timecheck.create_timestamp_YYYYMMDD()
+    elif view == LogView.MONTHLY:
+        return name == timecheck.create_timestamp_YYYYMM()
+    else:
+        return name == timecheck.create_timestamp_YYYY()
+
+
+def load_record(view: LogView, name: str) -> Optional[Dict]:
+    record = open_records.get((view, name))
+    if record is not None:
+        return deepcopy(record)
+    try:
+        with open(_get_record_path(view, name), "r") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+    except json.decoder.JSONDecodeError:
+        log.warning(f"Ungültiger Zwischenspeicher für {view.value}/{name} wird verworfen.")
+        return None
+
+
+def save_record(view: LogView, name: str, record: Dict) -> None:
+    # abgeschlossene Zeiträume werden aus den Log-Dateien neu berechnet und dann gespeichert
+    for key in [key for key in open_records if _is_open(*key) is False]:
+        open_records.pop(key)
+    if _is_open(view, name):
+        open_records[(view, name)] = deepcopy(record)
+        return
+    path = _get_record_path(view, name)
+    try:
+        path.parent.mkdir(mode=0o755, parents=True, exist_ok=True)
+        write_atomic(path, record)
+        _evict(path.parent)
+    except Exception:
+        log.exception(f"Fehler beim Speichern des Zwischenspeichers für {view.value}/{name}")
+
+
+def _evict(folder: Path) -> None:
+    records = sorted(folder.glob("*.json"), key=lambda path: (path.stat().st_mtime_ns, path.name))
+    for path in records[:max(len(records) - MAX_RECORDS, 0)]:
+        path.unlink(missing_ok=True)
@@ -0,0 +1,92 @@
+from copy import deepcopy
+from pathlib import Path
+from typing import Dict, List
+from unittest.mock import Mock
+
+from helpermodules import timecheck
+from helpermodules.measurement_logging import log_cache, process_log
+from helpermodules.measurement_logging.log_cache import LogView
+from helpermodules.measurement_logging.log_store import append_entry
+from helpermodules.measurement_logging.process_log import (CalculationType, _analyse_energy_source, _process_entries,
+                                                           get_daily_log, get_totals, update_log_cache)
+from helpermodules.measurement_logging.write_log import LogType
+
+NAMES = {"counter0": "EVU"}
+
+
+def evaluate(entries: List[Dict]) -> Dict:
+    # Auswertung ohne Zwischenspeicher
+    data = {"entries": _process_entries(deepcopy(entries), CalculationType.ALL), "names": NAMES}
+    data["totals"] = get_totals(data["entries"], False)
+    return _analyse_energy_source(data)
+
+
+def setup_daily_log(monkeypatch, tmp_path: Path, entries: List[Dict], today: str) -> None:
+    monkeypatch.setattr(process_log, "_get_data_folder_path", Mock(return_value=str(tmp_path)))
+    monkeypatch.setattr(timecheck, "create_timestamp_YYYYMMDD", Mock(return_value=today))
+    (tmp_path / "daily_log").mkdir()
+    for entry in entries:
+        append_entry(tmp_path / "daily_log" / "20240101.json", entry, NAMES)
+
+
+def test_closed_day_is_cached(daily_log_sample, monkeypatch, tmp_path: Path):
+    # setup
+    setup_daily_log(monkeypatch, tmp_path, daily_log_sample[:2], "20240105")
+    append_entry(tmp_path / "daily_log" / "20240102.json", daily_log_sample[2], NAMES)
+    expected = evaluate(daily_log_sample)
+
+    # execution
+    first = get_daily_log("20240101")
+    monkeypatch.setattr(process_log, "read_log", Mock(side_effect=FileNotFoundError))
+    second = get_daily_log("20240101")
+
+    # evaluation
+    assert first == expected
+    assert second == expected
+
+
+def test_changed_log_invalidates_cache(daily_log_sample, monkeypatch, tmp_path: Path):
+    # setup
+    setup_daily_log(monkeypatch, tmp_path, daily_log_sample[:2], "20240105")
+    get_daily_log("20240101")
+    append_entry(tmp_path / "daily_log" / "20240101.json", daily_log_sample[2], NAMES)
+
+    # execution
+    data = get_daily_log("20240101")
+
+    # evaluation
+    assert data == evaluate(daily_log_sample)
+
+
+def test_new_entry_updates_cache(daily_log_sample, monkeypatch, tmp_path: Path, log_cache_folder: Path):
+    # setup
+    setup_daily_log(monkeypatch, tmp_path, daily_log_sample[:2], "20240101")
+    current_entry = deepcopy(daily_log_sample[2])
+    current_entry["timestamp"] += 300
+    monkeypatch.setattr(process_log, "LegacySmartHomeLogData", Mock())
+    monkeypatch.setattr(process_log, "create_entry", Mock(side_effect=lambda *args: deepcopy(current_entry)))
+    get_daily_log("20240101")
+    append_entry(tmp_path / "daily_log" / "20240101.json", daily_log_sample[2])
+
+    # execution
+    update_log_cache(LogType.DAILY, {"entries": deepcopy(daily_log_sample), "names": NAMES})
+    monkeypatch.setattr(process_log, "read_log", Mock(side_effect=FileNotFoundError))
+    data = get_daily_log("20240101")
+
+    # evaluation
+    assert data == evaluate(daily_log_sample + [current_entry])
+    # der laufende Tag wird nur im Speicher gehalten
+    assert list(log_cache_folder.glob("**/*.json")) == []
+
+
+def test_evict_records(monkeypatch, log_cache_folder: Path):
+    # setup
+    monkeypatch.setattr(log_cache, "MAX_RECORDS", 2)
+    monkeypatch.setattr(timecheck, "create_timestamp_YYYYMMDD", Mock(return_value="20240105"))
+
+    # execution
+    for name in ("20240101", "20240102", "20240103"):
+        log_cache.save_record(LogView.DAILY, name, {"count": 0})
+
+    # evaluation
+    assert sorted(path.name for path in (log_cache_folder / "daily").iterdir()) == ["20240102.json", "20240103.json"]
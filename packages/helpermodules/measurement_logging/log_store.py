@@ -0,0 +1,116 @@
+"""Speicherung der Tages- und Monats-Logs
+
+Neue Einträge werden nicht mehr durch Neuschreiben der gesamten JSON-Datei gespeichert, sondern als einzelne Zeile an
+eine Datei im Format JSON Lines (<Name>.jsonl) angehängt. Jede Zeile enthält die CRC32-Prüfsumme des Datensatzes, damit
+eine bei einem Absturz unvollständig geschriebene letzte Zeile erkannt und verworfen wird.
+Sobald ein Log abgeschlossen ist (neuer Tag bzw. Monat), wird es in das bisherige Format {"entries", "names"}
+(<Name>.json) überführt. Zum Lesen muss immer read_log verwendet werden, da das aktuelle Log aus beiden Dateien bestehen
+kann.
+"""
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+import zlib
+
+from helpermodules.utils.json_file_handler import write_atomic
+
+log = logging.getLogger(__name__)
+
+LOG_FILE_SUFFIX = ".json"
+APPEND_FILE_SUFFIX = ".jsonl"
+
+
+def _encode_record(record: Dict) -> bytes:
+    payload = json.dumps(record, separators=(",", ":")).encode("utf-8")
+    return b"%08x %s\n" % (zlib.crc32(payload), payload)
+
+
+def _read_records(path: Path) -> Iterator[Dict]:
+    with open(path, "rb") as file:
+        lines = file.read().split(b"\n")
+    # Nach der letzten vollständigen Zeile folgt ein leerer String oder eine unvollständig geschriebene Zeile.
+    if lines[-1]:
+        log.warning(f"Unvollständiger letzter Datensatz in {path} wird verworfen.")
+    for line in lines[:-1]:
+        try:
+            checksum, payload = line.split(b" ", 1)
+            if int(checksum, 16) != zlib.crc32(payload):
+                raise ValueError("Prüfsumme stimmt nicht überein.")
+            yield json.loads(payload)
+        except ValueError:
+            log.warning(f"Ungültiger Datensatz in {path} wird verworfen: {line[:100]}")
+
+
+def read_log(path: Union[str, Path]) -> Dict:
+    """ liest das Log aus der JSON-Datei und den angehängten Einträgen. Existiert keine der Dateien, wird ein
+    FileNotFoundError ausgelöst."""
+    path = Path(path)
+    append_path = path.with_suffix(APPEND_FILE_SUFFIX)
+    try:
+        with open(path, "r") as json_file:
+            content = json.load(json_file)
+    except FileNotFoundError:
+        if append_path.is_file() is False:
+            raise
+        content = {"entries": [], "names": {}}
+    if append_path.is_file():
+        for record in _read_records(append_path):
+            if "entry" in record:
+                content["entries"].append(record["entry"])
+            if "names" in record:
+                content["names"] = record["names"]
+    return content
+
+
+def log_exists(path: Union[str, Path]) -> bool:
+    path = Path(path)
+    return path.is_file() or path.with_suffix(APPEND_FILE_SUFFIX).is_file()
+
+
+def get_log_names(folder: Path) -> List[str]:
+    """ liefert die sortierten Namen (ohne Endung) aller Logs im Ordner."""
+    return sorted({path.stem for path in folder.glob(f"*{LOG_FILE_SUFFIX}")
+                   if not path.stem.endswith("_invalid")} |
+                  {path.stem for path in folder.glob(f"*{APPEND_FILE_SUFFIX}")})
+
+
+def append_entry(path: Union[str, Path], entry: Dict, names: Optional[Dict] = None) -> None:
+    """ hängt einen Eintrag an. names wird nur gespeichert, wenn sich die Namen geändert haben."""
+    append_path = Path(path).with_suffix(APPEND_FILE_SUFFIX)
+    record = {"entry": entry}
+    if names is not None:
+        record["names"] = names
+    with open(append_path, "ab+") as file:
+        _truncate_incomplete_record(file)
+        file.write(_encode_record(record))
+
+
+def _truncate_incomplete_record(file) -> None:
+    size = file.seek(0, 2)
+    if size == 0:
+        return
+    file.seek(size - 1)
+    if file.read(1) == b"\n":
+        return
+    # Absturz während des Schreibens: unvollständige letzte Zeile abschneiden
+    file.seek(0)
+    data = file.read()
+    file.truncate(data.rfind(b"\n") + 1)
+    log.warning(f"Unvollständiger letzter Datensatz in {file.name} wurde entfernt.")
+
+
+def compact_logs(folder: Path, current_name: str) -> None:
+    """ überführt die angehängten Einträge abgeschlossener Logs in das JSON-Format."""
+    for append_path in folder.glob(f"*{APPEND_FILE_SUFFIX}"):
+        if append_path.stem == current_name:
+            continue
+        try:
+            path = append_path.with_suffix(LOG_FILE_SUFFIX)
+            content = read_log(path)
+            # write_atomic löst bei Fehlern eine Exception aus, die angehängten Einträge bleiben dann erhalten
+            write_atomic(path, content)
+            append_path.unlink()
+            log.debug(f"Log {append_path.stem} wurde in {path.name} überführt.")
+        except Exception:
+            log.exception(f"Fehler beim Überführen von {append_path}")
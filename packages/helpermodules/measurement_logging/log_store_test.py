@@ -0,0 +1,77 @@
+import json
+from pathlib import Path
+
+from helpermodules.measurement_logging import log_store
+from helpermodules.measurement_logging.log_store import append_entry, compact_logs, get_log_names, read_log
+
+
+def test_append_and_read(tmp_path: Path):
+    # setup
+    path = tmp_path / "20240101.json"
+
+    # execution
+    append_entry(path, {"timestamp": 1}, {"counter0": "EVU"})
+    append_entry(path, {"timestamp": 2})
+
+    # evaluation
+    assert read_log(path) == {"entries": [{"timestamp": 1}, {"timestamp": 2}], "names": {"counter0": "EVU"}}
+
+
+def test_read_json_and_appended_entries(tmp_path: Path):
+    # setup
+    path = tmp_path / "20240101.json"
+    path.write_text(json.dumps({"entries": [{"timestamp": 1}], "names": {"counter0": "EVU"}}))
+
+    # execution
+    append_entry(path, {"timestamp": 2}, {"counter0": "Netz"})
+
+    # evaluation
+    assert read_log(path) == {"entries": [{"timestamp": 1}, {"timestamp": 2}], "names": {"counter0": "Netz"}}
+
+
+def test_incomplete_record(tmp_path: Path):
+    # setup
+    path = tmp_path / "20240101.json"
+    append_entry(path, {"timestamp": 1}, {})
+    with open(path.with_suffix(log_store.APPEND_FILE_SUFFIX), "ab") as file:
+        # Absturz während des Schreibens
+        file.write(b'1234abcd {"entry":{"time')
+
+    # execution
+    entries_before_append = read_log(path)["entries"]
+    append_entry(path, {"timestamp": 2})
+
+    # evaluation
+    assert entries_before_append == [{"timestamp": 1}]
+    assert read_log(path)["entries"] == [{"timestamp": 1}, {"timestamp": 2}]
+
+
+def test_invalid_checksum(tmp_path: Path):
+    # setup
+    path = tmp_path / "20240101.json"
+    append_entry(path, {"timestamp": 1}, {})
+    append_entry(path, {"timestamp": 2})
+    append_path = path.with_suffix(log_store.APPEND_FILE_SUFFIX)
+    append_path.write_bytes(append_path.read_bytes().replace(b'"timestamp":2', b'"timestamp":3'))
+
+    # execution
+    content = read_log(path)
+
+    # evaluation
+    assert content["entries"] == [{"timestamp": 1}]
+
+
+def test_compact_logs(tmp_path: Path):
+    # setup
+    append_entry(tmp_path / "20240101.json", {"timestamp": 1}, {"counter0": "EVU"})
+    append_entry(tmp_path / "20240102.json", {"timestamp": 2}, {"counter0": "EVU"})
+
+    # execution
+    compact_logs(tmp_path, "20240102")
+
+    # evaluation
+    compacted = json.loads((tmp_path / "20240101.json").read_text())
+    assert compacted == {"entries": [{"timestamp": 1}], "names": {"counter0": "EVU"}}
+    assert (tmp_path / "20240101.jsonl").exists() is False
+    assert (tmp_path / "20240102.jsonl").exists()
+    assert get_log_names(tmp_path) == ["20240101", "20240102"]
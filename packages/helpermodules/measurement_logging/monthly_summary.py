@@ -0,0 +1,56 @@
+"""Zusammenfassungen der Monats-Logs
+
+Für die Jahresansicht werden je Monat nur der erste und letzte Eintrag und die Namen benötigt. Damit dafür nicht alle
+Monats-Logs vollständig eingelesen werden müssen, wird je Monat eine Zusammenfassung (erster und letzter Eintrag, Namen,
+Summen) in data/monthly_summary/<YYYYMM>.json gespeichert. Zu jeder Zusammenfassung werden Änderungszeit und Größe des
+Monats-Logs gespeichert. Passen diese nicht mehr zum Monats-Log, zB nach dem Wiederherstellen einer Sicherung, ist die
+Zusammenfassung ungültig und muss neu erstellt werden.
+"""
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from helpermodules.measurement_logging.log_cache import get_source_stamp
+from helpermodules.utils.json_file_handler import write_atomic
+
+log = logging.getLogger(__name__)
+
+SUMMARY_FOLDER = "monthly_summary"
+
+
+def get_summary_path(log_path: Path) -> Path:
+    return log_path.parent.parent / SUMMARY_FOLDER / f"{log_path.stem}.json"
+
+
+def create_summary(content: Dict, totals: Dict, stamp: List) -> Dict:
+    entries = content["entries"]
+    return {"stamp": stamp,
+            "count": len(entries),
+            "first": entries[0] if entries else None,
+            "last": entries[-1] if entries else None,
+            "names": content["names"],
+            "totals": totals}
+
+
+def load_summary(log_path: Path) -> Optional[Dict]:
+    """ liefert die Zusammenfassung, wenn sie zum aktuellen Stand des Monats-Logs passt."""
+    try:
+        with open(get_summary_path(log_path), "r") as file:
+            summary = json.load(file)
+        if summary["stamp"] == get_source_stamp(log_path):
+            return summary
+    except FileNotFoundError:
+        pass
+    except (json.decoder.JSONDecodeError, KeyError, TypeError):
+        log.warning(f"Ungültige Zusammenfassung für {log_path} wird verworfen.")
+    return None
+
+
+def save_summary(log_path: Path, summary: Dict) -> None:
+    path = get_summary_path(log_path)
+    try:
+        path.parent.mkdir(mode=0o755, parents=True, exist_ok=True)
+        write_atomic(path, summary)
+    except Exception:
+        log.exception(f"Fehler beim Speichern der Zusammenfassung für {log_path}")
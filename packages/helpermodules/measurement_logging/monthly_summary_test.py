@@ -0,0 +1,73 @@
+from copy import deepcopy
+from pathlib import Path
+from typing import Dict, List
+from unittest.mock import Mock
+
+from helpermodules import timecheck
+from helpermodules.measurement_logging import process_log
+from helpermodules.measurement_logging.log_store import append_entry
+from helpermodules.measurement_logging.monthly_summary import get_summary_path, load_summary
+from helpermodules.measurement_logging.process_log import (CalculationType, _analyse_energy_source, _process_entries,
+                                                           create_monthly_summaries, get_totals, get_yearly_log,
+                                                           update_monthly_summary)
+
+NAMES = {"counter0": "EVU"}
+
+
+def setup_monthly_logs(monkeypatch, tmp_path: Path, logs: Dict[str, List[Dict]]) -> None:
+    monkeypatch.setattr(process_log, "_get_data_folder_path", Mock(return_value=str(tmp_path)))
+    monkeypatch.setattr(timecheck, "create_timestamp_YYYY", Mock(return_value="2024"))
+    monkeypatch.setattr(timecheck, "create_timestamp_YYYYMM", Mock(return_value="202401"))
+    (tmp_path / "monthly_log").mkdir()
+    for month, entries in logs.items():
+        for entry in entries:
+            append_entry(tmp_path / "monthly_log" / f"{month}.json", entry, NAMES)
+
+
+def test_yearly_log_reads_summaries(daily_log_sample, monkeypatch, tmp_path: Path):
+    # setup
+    setup_monthly_logs(monkeypatch, tmp_path, {"202301": daily_log_sample[:2], "202302": daily_log_sample[2:]})
+    create_monthly_summaries(tmp_path / "monthly_log")
+    monkeypatch.setattr(process_log, "read_log", Mock(side_effect=FileNotFoundError))
+    # erster Eintrag je Monat und letzter Eintrag des letzten Monats, da das Log des Folgemonats fehlt
+    entries = [daily_log_sample[0], daily_log_sample[2], daily_log_sample[2]]
+    data = {"entries": _process_entries(deepcopy(entries), CalculationType.ENERGY), "names": NAMES}
+    data["totals"] = get_totals(data["entries"], False)
+
+    # execution
+    yearly_log = get_yearly_log("2023")
+
+    # evaluation
+    assert yearly_log == _analyse_energy_source(data)
+
+
+def test_changed_log_invalidates_summary(daily_log_sample, monkeypatch, tmp_path: Path):
+    # setup
+    setup_monthly_logs(monkeypatch, tmp_path, {"202301": daily_log_sample[:1]})
+    path = tmp_path / "monthly_log" / "202301.json"
+    create_monthly_summaries(tmp_path / "monthly_log")
+    append_entry(path, daily_log_sample[1])
+
+    # execution
+    summary = process_log._get_monthly_summary(path)
+
+    # evaluation
+    assert summary["count"] == 2
+    assert summary["last"] == daily_log_sample[1]
+    assert load_summary(path) == summary
+
+
+def test_update_monthly_summary(daily_log_sample, monkeypatch, tmp_path: Path):
+    # setup
+    setup_monthly_logs(monkeypatch, tmp_path, {"202401": daily_log_sample})
+    path = tmp_path / "monthly_log" / "202401.json"
+
+    # execution
+    update_monthly_summary({"entries": deepcopy(daily_log_sample), "names": NAMES})
+
+    # evaluation
+    assert get_summary_path(path) == tmp_path / "monthly_summary" / "202401.json"
+    summary = load_summary(path)
+    assert summary["first"] == daily_log_sample[0]
+    assert summary["last"] == daily_log_sample[-1]
+    assert summary["totals"] == get_totals(deepcopy(daily_log_sample))
@@ -1,12 +1,18 @@
+from copy import deepcopy
 import datetime
 from decimal import Decimal
 from enum import Enum
 import json
 import logging
 from pathlib import Path
-from typing import Dict, List, Tuple, Union
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 from helpermodules import timecheck
+from helpermodules.measurement_logging import log_cache
+from helpermodules.measurement_logging.log_cache import LogView, get_source_stamp
+from helpermodules.measurement_logging.log_store import get_log_names, log_exists, read_log
+from helpermodules.measurement_logging.monthly_summary import create_summary, load_summary, save_summary
+from helpermodules.measurement_logging.recent_log_entries import recent_daily_entries
 from helpermodules.measurement_logging.write_log import (LegacySmartHomeLogData, LogType, create_entry,
                                                          get_previous_entry)
 from helpermodules.messaging import MessageType, pub_system_message
@@ -62,45 +68,51 @@ def string_to_int(value: str, default: int = 0) -> int:
         return default
 
 
-def get_totals(entries: List, process_entries: bool = True) -> Dict:
+def get_totals(entries: List, process_entries: bool = True, totals: Optional[Dict] = None) -> Dict:
     """ Berechnet aus der übergebenen Liste "entries" die Summen (totals).
         "process_entries" besagt, ob die Differenzen der einzelnen Einträge noch
         berechnet werden müssen.
+        "totals" sind bereits berechnete Summen vorheriger Einträge, zu denen die Einträge addiert werden.
     """
     if process_entries:
         entries = _process_entries(entries, CalculationType.ENERGY)
-    totals = {"cp": {}, "counter": {}, "pv": {}, "bat": {}, "sh": {}, "hc": {}}
-    for totals_group in totals.keys():
+    if totals is None:
+        totals = {"cp": {}, "counter": {}, "pv": {}, "bat": {}, "sh": {}, "hc": {}}
+    for totals_group, group_totals in totals.items():
         for entry in entries:
             if totals_group in entry:
-                for entry_module in entry[totals_group]:
+                for entry_module, module_data in entry[totals_group].items():
                     try:
-                        if entry_module not in totals[totals_group]:
+                        module_totals = group_totals.get(entry_module)
+                        if module_totals is None:
                             if totals_group == "hc":
-                                totals[totals_group][entry_module] = {"energy_imported": 0.0}
+                                module_totals = {"energy_imported": 0.0}
                             elif totals_group == "pv":
-                                totals[totals_group][entry_module] = {"energy_exported": 0.0}
+                                module_totals = {"energy_exported": 0.0}
                             else:
-                                totals[totals_group][entry_module] = {"energy_imported": 0.0, "energy_exported": 0.0}
-                                if totals_group == "counter" and "grid" in entry[totals_group][entry_module]:
-                                    totals[totals_group][entry_module]["grid"] = entry[
-                                        totals_group][entry_module]["grid"]
-                        for entry_module_key, entry_module_value in entry[totals_group][entry_module].items():
-                            if "grid" != entry_module_key and entry_module_key in totals[totals_group][entry_module]:
+                                module_totals = {"energy_imported": 0.0, "energy_exported": 0.0}
+                                if totals_group == "counter" and "grid" in module_data:
+                                    module_totals["grid"] = module_data["grid"]
+                            group_totals[entry_module] = module_totals
+                        for entry_module_key, entry_module_value in module_data.items():
+                            if "grid" != entry_module_key and entry_module_key in module_totals:
                                 # avoid floating point issues with using Decimal
-                                value = (Decimal(str(totals[totals_group][entry_module][entry_module_key]))
-                                         + Decimal(str(entry_module_value * 1000)))  # totals in Wh!
-                                value.quantize(Decimal('0.001'))
-                                value = f'{value: f}'
-                                # remove trailing zeros
-                                totals[totals_group][entry_module][entry_module_key] = string_to_float(
-                                    value) if "." in value else string_to_int(value)
-
+                                module_totals[entry_module_key] = _decimal_to_number(
+                                    Decimal(str(module_totals[entry_module_key]))
+                                    + Decimal(str(entry_module_value * 1000)))  # totals in Wh!
                     except Exception:
                         log.exception(f"Fehler beim Berechnen der Summe von {entry_module}; "
                                       f"group:{totals_group}, module:{entry_module}, key:{entry_module_key}")
     return totals
 
+
+def _decimal_to_number(value: Decimal) -> Union[float, int]:
+    """ entspricht der Umwandlung über f'{value: f}': mit Nachkommastellen float, sonst int (nachfolgende Nullen
+    entfallen)"""
+    if value.is_finite() is False:
+        return 0
+    return float(value) if value.as_tuple().exponent < 0 else int(value)
+
 #     {"entries": [
 #         {
 #             "timestamp": int,
@@ -167,174 +179,246 @@ def get_totals(entries: List, process_entries: bool = True) -> Dict:
 
 
 def get_daily_log(date: str):
-    data = _collect_daily_log_data(date)
-    data["entries"] = _process_entries(data["entries"], CalculationType.ALL)
-    data["totals"] = get_totals(data["entries"], False)
-    data = _analyse_energy_source(data)
-    return data
+    return _get_log(LogView.DAILY, date, CalculationType.ALL, lambda: _read_daily_log(date),
+                    lambda pending: _get_daily_log_tail(date, pending))
 
 
-def _collect_daily_log_data(date: str):
+def _read_daily_log(date: str) -> Tuple[Optional[Dict], Dict]:
+    path = _get_log_path("daily_log", date)
+    sources = {str(path): get_source_stamp(path)}
     try:
-        parent_file = Path(__file__).resolve().parents[3] / "data"/"daily_log"
-        with open(str(parent_file / (date+".json")), "r") as json_file:
-            log_data = json.load(json_file)
-            if date == timecheck.create_timestamp_YYYYMMDD():
-                # beim aktuellen Tag den aktuellen Datensatz ergänzen
-                log_data["entries"].append(create_entry(
-                    LogType.DAILY, LegacySmartHomeLogData(), get_previous_entry(parent_file, log_data)))
-            else:
-                # bei älteren als letzten Datensatz den des nächsten Tags
-                try:
-                    next_date = timecheck.get_relative_date_string(date, day_offset=1)
-                    with open(str(parent_file / (next_date+".json")),
-                              "r") as next_json_file:
-                        next_log_data = json.load(next_json_file)
-                        log_data["entries"].append(next_log_data["entries"][0])
-                except FILE_ERRORS:
-                    pass
+        return read_log(path), sources
     except FILE_ERRORS:
-        log_data = {"entries": [], "totals": {}, "names": {}}
-    return log_data
+        return None, sources
+
+
+def _get_daily_log_tail(date: str, pending: Optional[Dict]) -> Tuple[Optional[Dict], Dict, Optional[Dict]]:
+    if date == timecheck.create_timestamp_YYYYMMDD():
+        # beim aktuellen Tag den aktuellen Datensatz ergänzen
+        parent_file = Path(_get_data_folder_path()) / "daily_log"
+        previous_entry = get_previous_entry(parent_file, {"entries": [] if pending is None else [pending]})
+        return create_entry(LogType.DAILY, LegacySmartHomeLogData(), previous_entry), {}, None
+    else:
+        # bei älteren als letzten Datensatz den des nächsten Tags
+        next_path = _get_log_path("daily_log", timecheck.get_relative_date_string(date, day_offset=1))
+        sources = {str(next_path): get_source_stamp(next_path)}
+        try:
+            return read_log(next_path)["entries"][0], {}, sources
+        except FILE_ERRORS:
+            return None, {}, sources
 
 
 def get_monthly_log(date: str):
-    data = _collect_monthly_log_data(date)
-    data["entries"] = _process_entries(data["entries"], CalculationType.ENERGY)
-    data["totals"] = get_totals(data["entries"], False)
-    data = _analyse_energy_source(data)
-    return data
+    return _get_log(LogView.MONTHLY, date, CalculationType.ENERGY, lambda: _read_monthly_log(date),
+                    lambda pending: _get_monthly_log_tail(date))
 
 
-def _collect_monthly_log_data(date: str):
+def _read_monthly_log(date: str) -> Tuple[Optional[Dict], Dict]:
+    path = _get_log_path("monthly_log", date)
+    sources = {str(path): get_source_stamp(path)}
     try:
-        with open(f"{_get_data_folder_path()}/monthly_log/{date}.json", "r") as jsonFile:
-            log_data = json.load(jsonFile)
-        this_month = timecheck.create_timestamp_YYYYMM()
-        if date == this_month:
-            # add last entry of current day, if current month is requested
-            try:
-                today = timecheck.create_timestamp_YYYYMMDD()
-                with open(f"{_get_data_folder_path()}/daily_log/{today}.json",
-                          "r") as todayJsonFile:
-                    today_log_data = json.load(todayJsonFile)
-                    if len(today_log_data["entries"]) > 0:
-                        log_data["entries"].append(today_log_data["entries"][-1])
-            except FILE_ERRORS:
-                pass
-        else:
-            # add first entry of next month
-            try:
-                next_date = timecheck.get_relative_date_string(date, month_offset=1)
-                with open(f"{_get_data_folder_path()}/monthly_log/{next_date}.json",
-                          "r") as nextJsonFile:
-                    next_log_data = json.load(nextJsonFile)
-                    log_data["entries"].append(next_log_data["entries"][0])
-            except FILE_ERRORS:
-                pass
+        return read_log(path), sources
     except FILE_ERRORS:
-        log_data = {"entries": [], "totals": {}, "names": {}}
-    return log_data
+        return None, sources
+
+
+def _get_monthly_log_tail(date: str) -> Tuple[Optional[Dict], Dict, Optional[Dict]]:
+    if date == timecheck.create_timestamp_YYYYMM():
+        # add last entry of current day, if current month is requested
+        return _get_last_entry_of_today(), {}, None
+    else:
+        # add first entry of next month
+        next_path = _get_log_path("monthly_log", timecheck.get_relative_date_string(date, month_offset=1))
+        sources = {str(next_path): get_source_stamp(next_path)}
+        summary = _get_monthly_summary(next_path)
+        return (None if summary is None else summary["first"]), {}, sources
+
+
+def _get_last_entry_of_today() -> Optional[Dict]:
+    """ liefert den letzten Eintrag des aktuellen Tages-Logs aus den zuletzt gespeicherten Einträgen, sodass das
+    Tages-Log nur nach einem Neustart gelesen werden muss."""
+    this_day = timecheck.create_timestamp_YYYYMMDD()
+    recent_entries = recent_daily_entries.get_last(1)
+    if (len(recent_entries) > 0 and
+            datetime.datetime.fromtimestamp(recent_entries[0]["timestamp"]).strftime("%Y%m%d") == this_day):
+        return deepcopy(recent_entries[0])
+    try:
+        entries = read_log(_get_log_path("daily_log", this_day))["entries"]
+        if len(entries) > 0:
+            return entries[-1]
+    except FILE_ERRORS:
+        pass
+    return None
+
+
+def _get_monthly_summary(path: Path) -> Optional[Dict]:
+    """ liefert die Zusammenfassung des Monats-Logs und erstellt sie, wenn sie fehlt oder nicht mehr zum Log passt."""
+    if log_exists(path) is False:
+        return None
+    summary = load_summary(path)
+    if summary is None:
+        stamp = get_source_stamp(path)
+        try:
+            content = read_log(path)
+        except FILE_ERRORS:
+            return None
+        summary = create_summary(content, get_totals(deepcopy(content["entries"])), stamp)
+        save_summary(path, summary)
+    return summary
+
+
+def update_monthly_summary(content: Optional[Dict]) -> None:
+    """ aktualisiert die Zusammenfassung des aktuellen Monats-Logs, nachdem save_log einen Eintrag angehängt hat."""
+    if content is None:
+        return
+    try:
+        path = _get_log_path("monthly_log", timecheck.create_timestamp_YYYYMM())
+        save_summary(path, create_summary(content, get_totals(deepcopy(content["entries"])), get_source_stamp(path)))
+    except Exception:
+        log.exception("Fehler beim Aktualisieren der Zusammenfassung des Monats-Logs")
+
+
+def create_monthly_summaries(folder: Path) -> None:
+    """ erstellt die Zusammenfassungen aller vorhandenen Monats-Logs."""
+    for name in get_log_names(folder):
+        try:
+            _get_monthly_summary(folder / f"{name}.json")
+        except Exception:
+            log.exception(f"Fehler beim Erstellen der Zusammenfassung für Monat {name}")
 
 
 def get_yearly_log(year: str):
-    data = _collect_yearly_log_data(year)
-    data["entries"] = _process_entries(data["entries"], CalculationType.ENERGY)
-    data["totals"] = get_totals(data["entries"], False)
-    data = _analyse_energy_source(data)
-    return data
+    this_year = timecheck.create_timestamp_YYYY()
+    # die Auswahl der Monate hängt vom aktuellen Monat ab
+    context = timecheck.create_timestamp_YYYYMM() if year >= this_year else None
+    return _get_log(LogView.YEARLY, year, CalculationType.ENERGY, lambda: _read_yearly_log(year),
+                    lambda pending: _get_yearly_log_tail(year), context)
 
 
-def get_log_from_date_until_now(timestamp: int):
+def get_log_from_date_until_now(timestamp: int) -> Dict:
+    """ liefert die Summen (inkl. Strom-Mix) vom Zeitpunkt timestamp bis jetzt.
+    Die Tages-Logs werden nacheinander ausgewertet und nur die laufenden Summen behalten, sodass der Speicherbedarf
+    nicht von der Dauer des Zeitraums abhängt.
+    """
     data = {}
     try:
-        entries = _collect_log_data_from_date_until_now(timestamp)
-        data["entries"] = _process_entries(entries, CalculationType.ENERGY)
-        data["totals"] = get_totals(data["entries"], False)
-        data = _analyse_energy_source(data)
+        totals = get_totals([], False)
+        for day_totals in _iter_totals_from_date_until_now(timestamp):
+            _add_totals(totals, day_totals)
+        data["totals"] = totals
     except Exception:
         log.exception(f"Fehler beim Zusammenstellen der Logdaten von {timestamp}")
     finally:
         return data
 
 
-def _collect_log_data_from_date_until_now(timestamp: int):
-    def add_to_list(log_data: List, data: Union[Dict, List]):
-        if isinstance(data, list):
-            log_data.extend(data)
-        else:
-            log_data.append(data)
-        return log_data
-    log_data = []
+def _iter_totals_from_date_until_now(timestamp: int) -> Iterator[Dict]:
+    """ liefert die Summen je Tag. Für den ersten Tag werden die Einträge ab timestamp ausgewertet, für die folgenden
+    Tage die (zwischengespeicherte) Auswertung der Tages-Logs. Fehlen Tages-Logs, wird der letzte Eintrag davor mit
+    dem nächsten vorhandenen Eintrag ausgewertet.
+    """
+    today = timecheck.create_timestamp_YYYYMMDD()
+    date = datetime.datetime.fromtimestamp(timestamp).strftime("%Y%m%d")
+    entries = _read_daily_entries(date)
+    # Wenn der Ladevorgang nicht über volle 5 Minuten ging, wurde während dem Laden kein Eintrag ins daily-log
+    # geschrieben.
+    entries = [entry for entry in entries if entry["timestamp"] > timestamp] or entries[-1:]
+    if len(entries) == 0:
+        previous = None
+    else:
+        previous = entries[-1]
+        next_entry = _get_first_entry_of_next_day(date, today, previous)
+        if next_entry is not None:
+            yield _get_totals_of_entries(entries + [next_entry])
+            previous = None
+        elif len(entries) > 1:
+            yield _get_totals_of_entries(entries)
+    del entries
+    while date < today:
+        date = timecheck.get_relative_date_string(date, day_offset=1)
+        if previous is not None:
+            next_entry = _get_first_entry_of_day(date, today, previous)
+            if next_entry is None:
+                continue
+            yield _get_totals_of_entries([previous, next_entry])
+            previous = None
+        if log_exists(_get_log_path("daily_log", date)):
+            yield get_daily_log(date)["totals"]
+            next_date = timecheck.get_relative_date_string(date, day_offset=1)
+            if date < today and log_exists(_get_log_path("daily_log", next_date)) is False:
+                # ohne Folgeeintrag wurde der letzte Eintrag des Tages nicht ausgewertet
+                previous = (_read_daily_entries(date) or [None])[-1]
+
+
+def _read_daily_entries(date: str) -> List[Dict]:
     try:
-        date = datetime.datetime.fromtimestamp(timestamp).strftime("%Y%m%d")
-        try:
-            with open(f"{_get_data_folder_path()}/daily_log/{date}.json", "r") as jsonFile:
-                entries = json.load(jsonFile)["entries"]
-        except FILE_ERRORS:
-            pass
-        for index, entry in enumerate(entries):
-            if entry["timestamp"] > timestamp:
-                log_data = add_to_list(log_data, entries[index:])
-                break
-        else:
-            try:
-                # Wenn der Ladevorgang nicht über volle 5 Minuten ging, wurde während dem Laden kein Eintrag ins
-                # daily-log geschrieben.
-                log_data = add_to_list(log_data, entries[-1])
-            except KeyError:
-                log.exception(f"Fehler beim Zusammenstellen der Logdaten. Bitte Logdatei daily_log/{date}.json prüfen.")
-        # Das Teillog vom ersten Tag wurde bereits ermittelt.
-        start_date = datetime.datetime.fromtimestamp(timestamp) + datetime.timedelta(days=1)
-        end_date = datetime.datetime.now()
-        current_date = start_date
-        date_list = []
-        while current_date <= end_date:
-            date_list.append(current_date.strftime('%Y%m%d'))
-            current_date += datetime.timedelta(days=1)
-        for date_str in date_list:
-            try:
-                with open(f"{_get_data_folder_path()}/daily_log/{date_str}.json", "r") as jsonFile:
-                    log_data = add_to_list(log_data, json.load(jsonFile)["entries"])
-            except FILE_ERRORS:
-                pass
-        log_data = add_to_list(log_data, create_entry(LogType.DAILY, LegacySmartHomeLogData(), log_data[-1]))
-    except Exception:
-        log.exception(f"Fehler beim Zusammenstellen der Logdaten von {timestamp}")
-    finally:
-        return log_data
+        return read_log(_get_log_path("daily_log", date))["entries"]
+    except FILE_ERRORS:
+        return []
+
+
+def _get_first_entry_of_day(date: str, today: str, previous: Optional[Dict]) -> Optional[Dict]:
+    """ liefert den ersten Eintrag des Tages, für den aktuellen Tag ohne Einträge den aktuellen Datensatz."""
+    entries = _read_daily_entries(date)
+    if len(entries) > 0:
+        return entries[0]
+    elif date == today and previous is not None:
+        return create_entry(LogType.DAILY, LegacySmartHomeLogData(), previous)
+    return None
+
 
+def _get_first_entry_of_next_day(date: str, today: str, previous: Optional[Dict]) -> Optional[Dict]:
+    """ liefert den Folgeeintrag des letzten Eintrags des Tages, für den aktuellen Tag den aktuellen Datensatz."""
+    if date == today:
+        return None if previous is None else create_entry(LogType.DAILY, LegacySmartHomeLogData(), previous)
+    return _get_first_entry_of_day(timecheck.get_relative_date_string(date, day_offset=1), today, previous)
+
+
+def _get_totals_of_entries(entries: List[Dict]) -> Dict:
+    data = {"entries": _process_entries(entries, CalculationType.ENERGY)}
+    data["totals"] = get_totals(data["entries"], False)
+    return _analyse_energy_source(data)["totals"]
 
-def _collect_yearly_log_data(year: str):
+
+def _add_totals(totals: Dict, day_totals: Dict) -> None:
+    """ addiert die Summen eines Tages zu den Summen des gesamten Zeitraums."""
+    for group, modules in day_totals.items():
+        group_totals = totals.setdefault(group, {})
+        for module, module_data in modules.items():
+            module_totals = group_totals.setdefault(module, {})
+            for key, value in module_data.items():
+                if key == "grid":
+                    module_totals[key] = value
+                else:
+                    # avoid floating point issues with using Decimal
+                    module_totals[key] = _decimal_to_number(Decimal(str(module_totals.get(key, 0))) +
+                                                            Decimal(str(value)))
+
+
+def _read_yearly_log(year: str) -> Tuple[Dict, Dict]:
     def add_monthly_log(month: str, check_next_month: bool = False) -> None:
-        monthly_log_path = Path(__file__).resolve().parents[3]/"data"/"monthly_log"
-        try:
-            with open(monthly_log_path / f"{month}.json", "r") as jsonFile:
-                content = json.load(jsonFile)
-                entries.append(content["entries"][0])
-            # add last entry of current file if next file is missing
-            if check_next_month:
-                next_month = timecheck.get_relative_date_string(month, month_offset=1)
-                if not (monthly_log_path / (next_month+".json")).is_file():
-                    entries.append(content["entries"][-1])
-                    log.debug(f"Keine Logdatei für Monat {next_month} gefunden, "
-                              f"füge letzten Datensatz von {month} ein: {entries[-1]['date']}")
-            names.update(content["names"])
-        except FILE_ERRORS:
+        path = _get_log_path("monthly_log", month)
+        sources[str(path)] = get_source_stamp(path)
+        summary = _get_monthly_summary(path)
+        if summary is None or summary["first"] is None:
             log.debug(f"Kein Log für Monat {month} gefunden.")
-
-    def add_daily_log(day: str) -> None:
-        try:
-            with open(f"{_get_data_folder_path()}/daily_log/{day}.json", "r") as dayJsonFile:
-                day_log_data = json.load(dayJsonFile)
-                if len(day_log_data["entries"]) > 0:
-                    entries.append(day_log_data["entries"][-1])
-        except FILE_ERRORS:
-            pass
+            return
+        entries.append(summary["first"])
+        # add last entry of current file if next file is missing
+        if check_next_month:
+            next_month = timecheck.get_relative_date_string(month, month_offset=1)
+            next_path = _get_log_path("monthly_log", next_month)
+            sources[str(next_path)] = get_source_stamp(next_path)
+            if not log_exists(next_path):
+                entries.append(summary["last"])
+                log.debug(f"Keine Logdatei für Monat {next_month} gefunden, "
+                          f"füge letzten Datensatz von {month} ein: {entries[-1]['date']}")
+        names.update(summary["names"])
 
     entries = []
     names = {}
     dates = []
+    sources = {}
 
     # we have to find a valid data range
     this_year = timecheck.create_timestamp_YYYY()
@@ -354,33 +438,147 @@ def _collect_yearly_log_data(year: str):
             add_monthly_log(date, date != this_month)
         except Exception:
             log.exception(f"Fehler beim Zusammenstellen der Jahresdaten für Monat {date}")
+    return {"entries": entries, "names": names}, sources
 
+
+def _get_yearly_log_tail(year: str) -> Tuple[Optional[Dict], Dict, Optional[Dict]]:
     # now we have to find a valid "next" entry for proper calculation
-    if year == this_year:  # current year
+    if year == timecheck.create_timestamp_YYYY():  # current year
         # add todays last entry
-        this_day = timecheck.create_timestamp_YYYYMMDD()
         try:
-            log.debug(f"add today: {this_day}")
-            add_daily_log(this_day)
+            return _get_last_entry_of_today(), {}, None
         except Exception:
-            log.exception(f"Fehler beim Zusammenstellen der Jahresdaten für den aktuellen Tag {this_day}")
+            log.exception("Fehler beim Zusammenstellen der Jahresdaten für den aktuellen Tag")
+        return None, {}, None
     else:
         # no special handling here, just add first entry of next month
         next_date = f"{int(year)+1}01"
+        next_path = _get_log_path("monthly_log", next_date)
+        sources = {str(next_path): get_source_stamp(next_path)}
         try:
             log.debug(f"add next month: {next_date}")
-            add_monthly_log(next_date)
+            summary = _get_monthly_summary(next_path)
+            if summary is not None:
+                return summary["first"], summary["names"], sources
+            log.debug(f"Kein Log für Monat {next_date} gefunden.")
         except Exception:
             log.exception(f"Fehler beim Zusammenstellen der Jahresdaten für Monat {next_date}")
+        return None, {}, sources
+
+
+def _get_log(view: LogView, name: str, calculation: CalculationType,
+             read_stored: Callable[[], Tuple[Optional[Dict], Dict]],
+             get_tail: Callable[[Optional[Dict]], Tuple[Optional[Dict], Dict, Optional[Dict]]],
+             context: Optional[str] = None) -> Dict:
+    """ liefert das ausgewertete Log eines Zeitraums.
+    Die Auswertung der gespeicherten Einträge wird zwischengespeichert. Der letzte gespeicherte Eintrag wird bei jeder
+    Abfrage mit dem Folgeeintrag (aktueller Datensatz bzw. erster Eintrag des nächsten Zeitraums) ausgewertet, den
+    get_tail liefert. Stammt der Folgeeintrag aus einer Datei (tail_sources), wird das vollständige Ergebnis
+    zwischengespeichert.
+    """
+    with log_cache.lock:
+        record = log_cache.load_record(view, name)
+        if record is not None and (record["context"] != context or
+                                   log_cache.sources_unchanged(record["sources"]) is False):
+            record = None
+        if record is None:
+            log_data, sources = read_stored()
+            if log_data is None:
+                return {"entries": [], "totals": get_totals([], False), "names": {}}
+            record = _create_cache_record(log_data, sources, calculation, context)
+            changed = True
+        else:
+            result = record.pop("result", None)
+            if result is not None and log_cache.sources_unchanged(result["sources"]):
+                return result["data"]
+            changed = result is not None
+        tail, tail_names, tail_sources = get_tail(record["pending"])
+        data = _complete_cache_record(record, tail, tail_names, calculation)
+        if tail_sources is not None:
+            record["result"] = {"sources": tail_sources, "data": data}
+            changed = True
+        if changed:
+            log_cache.save_record(view, name, record)
+        return data
 
-    # return our data
-    return {"entries": entries, "names": names}
 
+def _create_cache_record(log_data: Dict, sources: Dict, calculation: CalculationType,
+                         context: Optional[str]) -> Dict:
+    entries = log_data["entries"]
+    count = len(entries)
+    pending = deepcopy(entries[-1]) if entries else None
+    # für den letzten Eintrag kann erst mit dem Folgeeintrag eine Differenz berechnet werden
+    processed = _process_entries(entries, calculation) if len(entries) > 1 else []
+    totals = get_totals(processed, False)
+    for entry in processed:
+        analyse_percentage(entry)
+    return {"context": context,
+            "sources": sources,
+            "names": log_data["names"],
+            "count": count,
+            "entries": processed,
+            "totals": totals,
+            "pending": pending}
+
+
+def _complete_cache_record(record: Dict, tail: Optional[Dict], tail_names: Dict,
+                           calculation: CalculationType) -> Dict:
+    """ ergänzt die zwischengespeicherte Auswertung um den letzten gespeicherten Eintrag, ohne den Zwischenspeicher zu
+    verändern."""
+    entries = record["entries"]
+    if tail is None and entries:
+        # ohne Folgeeintrag entfällt der letzte gespeicherte Eintrag
+        remaining = []
+    else:
+        remaining = [entry for entry in (deepcopy(record["pending"]), tail) if entry is not None]
+    new_entries = _process_entries(remaining, calculation)
+    data = {"entries": entries + new_entries,
+            "totals": get_totals(new_entries, False, deepcopy(record["totals"])),
+            "names": {**record["names"], **tail_names}}
+    return _analyse_energy_source(data, len(entries))
+
+
+def update_log_cache(log_type: LogType, content: Optional[Dict]) -> None:
+    """ ergänzt die zwischengespeicherte Auswertung des aktuellen Tages- bzw. Monats-Logs um den neuen Eintrag, den
+    save_log angehängt hat. Ist die Auswertung nicht zwischengespeichert, wird sie erst bei der nächsten Abfrage
+    erstellt."""
+    if content is None:
+        return
+    if log_type == LogType.DAILY:
+        view, name, folder, calculation = (LogView.DAILY, timecheck.create_timestamp_YYYYMMDD(), "daily_log",
+                                           CalculationType.ALL)
+    else:
+        view, name, folder, calculation = (LogView.MONTHLY, timecheck.create_timestamp_YYYYMM(), "monthly_log",
+                                           CalculationType.ENERGY)
+    try:
+        with log_cache.lock:
+            record = log_cache.load_record(view, name)
+            entries = content["entries"]
+            if (record is None or record["count"] != len(entries) - 1 or
+                    record["pending"] != (entries[-2] if len(entries) > 1 else None)):
+                return
+            new_entry = deepcopy(entries[-1])
+            if record["pending"] is not None:
+                processed = _process_entries([record["pending"], deepcopy(new_entry)], calculation)
+                for entry in processed:
+                    analyse_percentage(entry)
+                record["totals"] = get_totals(processed, False, record["totals"])
+                record["entries"].extend(processed)
+            path = _get_log_path(folder, name)
+            record.update({"sources": {str(path): get_source_stamp(path)},
+                           "names": content["names"],
+                           "count": len(entries),
+                           "pending": new_entry})
+            record.pop("result", None)
+            log_cache.save_record(view, name, record)
+    except Exception:
+        log.exception("Fehler beim Aktualisieren des Zwischenspeichers der Logs")
 
-def _analyse_energy_source(data) -> Dict:
+
+def _analyse_energy_source(data, first_entry: int = 0) -> Dict:
     if data and len(data["entries"]) > 0:
         try:
-            for i in range(0, len(data["entries"])):
+            for i in range(first_entry, len(data["entries"])):
                 data["entries"][i] = analyse_percentage(data["entries"][i])
             data["totals"] = analyse_percentage_totals(data["entries"], data["totals"])
         except Exception:
@@ -504,14 +702,141 @@ def _process_entries(entries: List, calculation: CalculationType):
                                 "energy_exported": 0
                             })
         elif len(entries) > 1:
+            results = _calculate_module_columns(entries, calculation)
             for i in range(0, len(entries)-1):
-                entry = entries[i]
-                next_entry = entries[i+1]
-                entries[i] = process_entry(entry, next_entry, calculation)
+                _apply_results(entries[i], entries[i+1], results, i, calculation)
             entries.pop()
     return entries
 
 
+TYPES = ("bat", "counter", "cp", "pv", "sh", "hc")
+PRECISION = Decimal('0.001')
+
+
+def _calculate_module_columns(entries: List, calculation: CalculationType) -> Dict[Tuple[str, str], List]:
+    """ Berechnet die Energie und mittlere Leistung spaltenweise je Modul. Liefert je Modul eine Liste mit den neuen
+    Werten je Eintrag (None, wenn für den Eintrag nichts zu aktualisieren ist).
+    Jeder Zählerstand geht als aktueller und als nächster Wert in die Differenzen ein, wird aber nur einmal in Decimal
+    umgewandelt. Die Rundung entspricht _calculate_energy_difference und _calculate_average_power.
+    """
+    calculate_power = calculation in [CalculationType.POWER, CalculationType.ALL]
+    calculate_energy = calculation in [CalculationType.ENERGY, CalculationType.ALL]
+    power_factors: List[Optional[Decimal]] = []
+    if calculate_power:
+        for entry, next_entry in zip(entries, entries[1:]):
+            time_diff = next_entry["timestamp"] - entry["timestamp"]
+            power_factors.append(Decimal(str(3600 / time_diff)) if time_diff != 0 else None)  # Ws
+    modules: Dict[Tuple[str, str], List[Optional[Dict]]] = {}
+    for i, entry in enumerate(entries):
+        for type in TYPES:
+            if isinstance(entry.get(type), dict):
+                for module, module_data in entry[type].items():
+                    if isinstance(module_data, dict):
+                        column = modules.get((type, module))
+                        if column is None:
+                            column = modules[(type, module)] = [None] * len(entries)
+                        column[i] = module_data
+    return {key: _calculate_module_column(column, power_factors, calculate_power, calculate_energy)
+            for key, column in modules.items()}
+
+
+def _get_meter_column(column: List[Optional[Dict]], value_key: str) -> Tuple[List[bool], List, List]:
+    """ liefert, ob der Zählerstand im Eintrag vorhanden ist, den Zählerstand (Standardwert 0) und den Zählerstand in
+    kWh als Decimal (None, wenn er nicht umgewandelt werden kann)."""
+    present = [module_data is not None and value_key in module_data for module_data in column]
+    values = [module_data[value_key] if value_present else 0 for module_data, value_present in zip(column, present)]
+    try:
+        decimals = [Decimal(str(value / 1000)) for value in values]
+    except Exception:
+        decimals = []
+        for value in values:
+            try:
+                decimals.append(Decimal(str(value / 1000)))
+            except Exception:
+                decimals.append(None)
+    return present, values, decimals
+
+
+def _calculate_module_column(column: List[Optional[Dict]], power_factors: List[Optional[Decimal]],
+                             calculate_power: bool, calculate_energy: bool) -> List[Optional[Dict]]:
+    imported_present, imported, imported_decimals = _get_meter_column(column, "imported")
+    exported_present, exported, exported_decimals = _get_meter_column(column, "exported")
+    results: List[Optional[Dict]] = [None] * (len(column) - 1)
+    for i in range(len(column) - 1):
+        module_data = column[i]
+        if module_data is None:
+            continue
+        try:
+            new_data = {}
+            if "imported" in module_data or "exported" in module_data:
+                # fehlt der Zählerstand im nächsten Eintrag, wird der aktuelle verwendet
+                next_i = i + 1 if imported_present[i + 1] else i
+                next_e = i + 1 if exported_present[i + 1] else i
+                if calculate_power:
+                    if imported[next_i] < imported[i] or exported[next_e] < exported[i]:
+                        # do not calculate as we have a backwards jump in our meter value!
+                        average_power = 0
+                    else:
+                        if power_factors[i] is None:
+                            raise ZeroDivisionError("Die Einträge haben denselben Zeitstempel.")
+                        average_power = float(((imported_decimals[next_i] - imported_decimals[i] -
+                                                (exported_decimals[next_e] - exported_decimals[i])) *
+                                               power_factors[i]).quantize(PRECISION))
+                    new_data.update({
+                        "power_average": average_power,
+                        "power_imported": average_power if average_power >= 0 else 0,
+                        "power_exported": average_power * -1 if average_power < 0 else 0
+                    })
+                if calculate_energy:
+                    if imported[next_i] < imported[i]:
+                        # do not calculate as we have a backwards jump in our meter value!
+                        energy_imported = 0
+                    else:
+                        energy_imported = float(
+                            (imported_decimals[next_i] - imported_decimals[i]).quantize(PRECISION))
+                    if exported[next_e] < exported[i]:
+                        # do not calculate as we have a backwards jump in our meter value!
+                        energy_exported = 0
+                    else:
+                        energy_exported = float(
+                            (exported_decimals[next_e] - exported_decimals[i]).quantize(PRECISION))
+                    new_data.update({
+                        "energy_imported": energy_imported,
+                        "energy_exported": energy_exported
+                    })
+            results[i] = new_data
+        except Exception:
+            log.exception("Fehler beim Berechnen der Leistung")
+    return results
+
+
+def _apply_results(entry: Dict, next_entry: Dict, results: Dict[Tuple[str, str], List], index: int,
+                   calculation: CalculationType) -> None:
+    """ überträgt die berechneten Werte in der Reihenfolge von process_entry, da Module, die erst im nächsten Eintrag
+    vorhanden sind, mit dessen Eintrag geteilt werden."""
+    for type in TYPES:
+        if type in entry:
+            for module in entry[type].keys():
+                new_data = results.get((type, module))
+                if new_data is not None and new_data[index] is not None:
+                    entry[type][module].update(new_data[index])
+            # next_entry may contain new modules, we add them here
+            try:
+                for module, module_data in next_entry[type].items():
+                    if module not in entry[type].keys():
+                        log.debug(f"adding module {module} from next entry")
+                        if calculation in [CalculationType.POWER, CalculationType.ALL]:
+                            module_data.update({"power_average": 0, "power_imported": 0, "power_exported": 0})
+                        if calculation in [CalculationType.ENERGY, CalculationType.ALL]:
+                            module_data.update({"energy_imported": 0, "energy_exported": 0})
+                        # Kopie: ohne sie teilen sich beide Einträge dasselbe dict und die Energie, die beim
+                        # Verarbeiten von next_entry berechnet wird, erscheint zusätzlich in diesem Eintrag.
+                        entry[type].update({module: dict(module_data)})
+            except KeyError:
+                # catch missing "type"
+                pass
+
+
 def process_entry(entry: dict, next_entry: dict, calculation: CalculationType):
     time_diff = next_entry["timestamp"] - entry["timestamp"]
     for type in ("bat", "counter", "cp", "pv", "sh", "hc"):
@@ -572,7 +897,9 @@ def process_entry(entry: dict, next_entry: dict, calculation: CalculationType):
                             module_data.update({"power_average": 0, "power_imported": 0, "power_exported": 0})
                         if calculation in [CalculationType.ENERGY, CalculationType.ALL]:
                             module_data.update({"energy_imported": 0, "energy_exported": 0})
-                        entry[type].update({module: module_data})
+                        # Kopie: ohne sie teilen sich beide Einträge dasselbe dict und die Energie, die beim
+                        # Verarbeiten von next_entry berechnet wird, erscheint zusätzlich in diesem Eintrag.
+                        entry[type].update({module: dict(module_data)})
             except KeyError:
                 # catch missing "type"
                 pass
@@ -597,3 +924,7 @@ def _calculate_average_power(time_diff: float, current_imported: float = 0, next
 
 def _get_data_folder_path() -> str:
     return str(Path(__file__).resolve().parents[3] / "data")
+
+
+def _get_log_path(folder: str, name: str) -> Path:
+    return Path(_get_data_folder_path()) / folder / f"{name}.json"
@@ -1,7 +1,12 @@
 from copy import deepcopy
+import datetime
+from pathlib import Path
+from typing import Dict, List
 from unittest.mock import Mock
 import pytest
 
+from helpermodules import timecheck
+
 from helpermodules.measurement_logging import process_log
 from helpermodules.measurement_logging.process_log import (
     analyse_percentage,
@@ -9,6 +14,7 @@ from helpermodules.measurement_logging.process_log import (
     process_entry,
     get_totals,
     CalculationType)
+from helpermodules.measurement_logging.log_store import append_entry
 
 from helpermodules.measurement_logging.process_log_testdata import (counter_jumps_forward,
                                                                     counter_jumps_forward_processed,
@@ -69,11 +75,98 @@ def test_convert(daily_log_entry_kw, daily_log_sample):
 ])
 def test_get_daily_log(data, expected, monkeypatch):
     # setup
-    collect_daily_log_data_mock = Mock(return_value=data)
-    monkeypatch.setattr(process_log, "_collect_daily_log_data", collect_daily_log_data_mock)
+    data = deepcopy(data)
+    tail = data["entries"].pop()
+    monkeypatch.setattr(process_log, "_read_daily_log", Mock(return_value=(data, {})))
+    monkeypatch.setattr(process_log, "_get_daily_log_tail", Mock(return_value=(tail, {}, None)))
 
     # execution
     daily_log_processed = process_log.get_daily_log("20250616")
 
     # evaluation
     assert daily_log_processed == expected
+
+
+@pytest.mark.parametrize("calculation", [CalculationType.ALL, CalculationType.ENERGY, CalculationType.POWER])
+def test_process_entries_matches_process_entry(calculation, daily_log_sample):
+    # setup: Rücksprung, fehlender Zählerstand und Ladepunkt cp6, der erst im letzten Eintrag vorhanden ist
+    daily_log_sample[1]["counter"]["counter0"]["imported"] = 4000
+    del daily_log_sample[1]["cp"]["cp3"]["exported"]
+    expected = deepcopy(daily_log_sample)
+    for i in range(len(expected) - 1):
+        expected[i] = process_entry(expected[i], expected[i+1], calculation)
+    expected.pop()
+
+    # execution
+    entries = process_log._process_entries(daily_log_sample, calculation)
+
+    # evaluation
+    assert entries == expected
+
+
+def test_process_entry_copies_new_module(daily_log_sample):
+    # setup: Ladepunkt cp6 ist erst ab dem zweiten Eintrag vorhanden
+    entries = deepcopy(daily_log_sample[:3])
+    for entry in entries:
+        entry["cp"].pop("cp6", None)
+    entries[1]["cp"]["cp6"] = {"imported": 1000, "exported": 0}
+    entries[2]["cp"]["cp6"] = {"imported": 3000, "exported": 0}
+
+    # execution
+    first = process_entry(entries[0], entries[1], CalculationType.ENERGY)
+    process_entry(entries[1], entries[2], CalculationType.ENERGY)
+
+    # evaluation
+    assert first["cp"]["cp6"] is not entries[1]["cp"]["cp6"]
+    assert first["cp"]["cp6"]["energy_imported"] == 0
+    assert entries[1]["cp"]["cp6"]["energy_imported"] == 2
+
+
+def create_daily_entries(day: int, hours: List[int]) -> List[Dict]:
+    entries = []
+    for hour in hours:
+        # Zählerstände steigen stündlich über alle Tage
+        value = ((day - 1) * 24 + hour) * 1000
+        entries.append({"timestamp": int(datetime.datetime(2024, 1, day, hour).timestamp()),
+                        "date": f"{hour}:00",
+                        "cp": {"cp3": {"imported": value / 2, "exported": 0},
+                               "all": {"imported": value / 2, "exported": 0}},
+                        "counter": {"counter0": {"imported": value * 0.7, "exported": 0, "grid": True}},
+                        "pv": {"all": {"exported": value * 0.3}},
+                        "bat": {},
+                        "sh": {},
+                        "hc": {"all": {"imported": value / 2}}})
+    return entries
+
+
+@pytest.mark.parametrize("days", [
+    pytest.param({1: [6, 12, 18], 2: [0, 12], 3: [0, 6]}, id="mehrere Tage"),
+    pytest.param({1: [6, 12, 18], 3: [0, 6]}, id="fehlender Tag"),
+    pytest.param({1: [6, 12, 18], 2: [0, 12]}, id="noch kein Eintrag am aktuellen Tag"),
+    pytest.param({3: [0, 6]}, id="Beginn am aktuellen Tag"),
+])
+def test_get_log_from_date_until_now(days: Dict[int, List[int]], monkeypatch, tmp_path: Path):
+    # setup
+    monkeypatch.setattr(process_log, "_get_data_folder_path", Mock(return_value=str(tmp_path)))
+    monkeypatch.setattr(timecheck, "create_timestamp_YYYYMMDD", Mock(return_value="20240103"))
+    monkeypatch.setattr(process_log, "LegacySmartHomeLogData", Mock())
+    current_entry = create_daily_entries(3, [9])[0]
+    monkeypatch.setattr(process_log, "create_entry", Mock(side_effect=lambda *args: deepcopy(current_entry)))
+    (tmp_path / "daily_log").mkdir()
+    all_entries = []
+    for day, hours in days.items():
+        for entry in create_daily_entries(day, hours):
+            append_entry(tmp_path / "daily_log" / f"2024010{day}.json", entry)
+            all_entries.append(entry)
+    begin = all_entries[0]["timestamp"] + 60
+    # bisherige Auswertung aller Einträge ab Beginn
+    data = {"entries": process_log._process_entries(deepcopy(all_entries[1:] + [current_entry]),
+                                                    CalculationType.ENERGY)}
+    data["totals"] = get_totals(data["entries"], False)
+    expected = process_log._analyse_energy_source(data)["totals"]
+
+    # execution
+    totals = process_log.get_log_from_date_until_now(begin)["totals"]
+
+    # evaluation
+    assert totals == expected
@@ -0,0 +1,48 @@
+"""Die letzten Einträge des Tages-Logs im Arbeitsspeicher
+
+save_log ergänzt jeden neuen Eintrag des Tages-Logs. Daraus berechnete Werte (zB die Auswertung der letzten beiden
+Einträge für die Ladekosten) werden bis zum nächsten Eintrag zwischengespeichert, sodass sie nur einmal je Intervall
+berechnet werden, auch wenn sie für jeden Ladepunkt abgefragt werden.
+"""
+from collections import deque
+from copy import deepcopy
+from threading import Lock
+from typing import Any, Callable, Dict, List
+
+# Einträge der letzten Stunde
+NUMBER_OF_ENTRIES = 12
+
+
+class RecentLogEntries:
+    def __init__(self, maxlen: int = NUMBER_OF_ENTRIES) -> None:
+        self.lock = Lock()
+        self.entries = deque(maxlen=maxlen)
+        self.calculated: Dict[str, Any] = {}
+
+    def append(self, entry: Dict) -> None:
+        with self.lock:
+            self.entries.append(deepcopy(entry))
+            self.calculated.clear()
+
+    def fill(self, entries: List[Dict]) -> None:
+        """ ersetzt die Einträge durch die Einträge aus den Log-Dateien, zB wenn seit dem Start noch nicht genügend
+        Einträge ergänzt wurden."""
+        with self.lock:
+            self.entries.clear()
+            self.entries.extend(deepcopy(entries[-self.entries.maxlen:]))
+            self.calculated.clear()
+
+    def get_last(self, number: int) -> List[Dict]:
+        with self.lock:
+            return list(self.entries)[-number:]
+
+    def get_calculated(self, key: str, calculate: Callable[[List[Dict]], Any]) -> Any:
+        """ liefert den aus den Einträgen berechneten Wert. calculate wird nur aufgerufen, wenn sich die Einträge seit
+        der letzten Berechnung geändert haben."""
+        with self.lock:
+            if key not in self.calculated:
+                self.calculated[key] = calculate(list(self.entries))
+            return self.calculated[key]
+
+
+recent_daily_entries = RecentLogEntries()
@@ -0,0 +1,33 @@
+from unittest.mock import Mock
+
+from helpermodules.measurement_logging.recent_log_entries import RecentLogEntries
+
+
+def test_calculated_until_next_entry():
+    # setup
+    recent_entries = RecentLogEntries(maxlen=3)
+    recent_entries.fill([{"timestamp": 1}, {"timestamp": 2}])
+    calculate = Mock(side_effect=lambda entries: entries[-1]["timestamp"])
+
+    # execution
+    first = recent_entries.get_calculated("last", calculate)
+    second = recent_entries.get_calculated("last", calculate)
+    recent_entries.append({"timestamp": 3})
+    third = recent_entries.get_calculated("last", calculate)
+
+    # evaluation
+    assert (first, second, third) == (2, 2, 3)
+    assert calculate.call_count == 2
+
+
+def test_keeps_last_entries():
+    # setup
+    recent_entries = RecentLogEntries(maxlen=3)
+
+    # execution
+    for timestamp in range(5):
+        recent_entries.append({"timestamp": timestamp})
+
+    # evaluation
+    assert recent_entries.get_last(2) == [{"timestamp": 3}, {"timestamp": 4}]
+    assert len(recent_entries.get_last(5)) == 3
@@ -0,0 +1,317 @@
+"""Zeitreihen der Komponenten in hoher Auflösung
+
+Leistung, Zählerstände, Ströme und SoC der Zähler, Wechselrichter, Speicher und Ladepunkte werden bei jeder
+Aktualisierung der Komponenten (Regelintervall) gespeichert. Je Auflösung, Tag (UTC) und Komponente gibt es eine
+Segment-Datei (data/time_series/<Auflösung>s/<YYYYMMDD>/<Komponente>.bin) mit Datensätzen fester Länge. Die Position
+eines Datensatzes ergibt sich aus dem Zeitstempel, sodass die Dateien memory-mapped geschrieben und gelesen werden,
+ohne sie zu durchsuchen. Der Speicherplatz einer Segment-Datei wird beim Anlegen vollständig reserviert. Neben den
+Werten im Regelintervall (10s) werden Mittelwerte für 1 und 5 Minuten gespeichert, die länger aufbewahrt werden.
+Speicherbedarf je Komponente und Tag: 10s 338kB, 1min 56kB, 5min 11kB
+Die Aufzeichnung ist standardmäßig deaktiviert (openWB/general/time_series/active). Überschreiten die Segment-Dateien
+aller Komponenten die eingestellte Maximalgröße, werden die ältesten Tage gelöscht, zuerst die der feinsten Auflösung.
+"""
+from dataclasses import dataclass, field
+import datetime
+import errno
+import logging
+import math
+import mmap
+import os
+from pathlib import Path
+import shutil
+import struct
+from threading import Lock
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from helpermodules import timecheck
+
+log = logging.getLogger(__name__)
+
+# Zeitstempel, Leistung, Zähler Bezug, Zähler Einspeisung, Ströme L1-L3, SoC; nicht vorhandene Werte sind NaN
+RECORD = struct.Struct("<Ifdd3ff")
+SECONDS_PER_DAY = 86400
+# Maximalgröße aller Segment-Dateien [MB]
+MAX_SIZE = 100
+# Sekunden zwischen zwei gleichen Fehlermeldungen, da sonst in jedem Zyklus für jede Komponente geloggt wird
+ERROR_LOG_INTERVAL = 3600
+
+
+@dataclass(frozen=True)
+class Tier:
+    resolution: int  # Sekunden
+    retention: int  # Tage
+
+
+TIERS = (Tier(10, 28), Tier(60, 180), Tier(300, 730))
+
+
+def _to_float(value) -> float:
+    return math.nan if value is None else float(value)
+
+
+def _to_value(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+def get_values(state) -> Tuple:
+    """ liefert die Werte eines Komponenten-Status (CounterState, InverterState, BatState, ChargepointState) für einen
+    Datensatz ohne Zeitstempel."""
+    currents = getattr(state, "currents", None) or [None]*3
+    return (_to_float(state.power),
+            _to_float(getattr(state, "imported", None)),
+            _to_float(getattr(state, "exported", None)),
+            *(_to_float(current) for current in currents[:3]),
+            _to_float(getattr(state, "soc", None)))
+
+
+@dataclass
+class Aggregate:
+    """ Mittelwerte von Leistung und Strömen, letzte Zählerstände und letzter SoC eines Zeitraums."""
+    timestamp: int
+    sums: List[float] = field(default_factory=lambda: [0.0]*4)
+    counts: List[int] = field(default_factory=lambda: [0]*4)
+    last: List[float] = field(default_factory=lambda: [math.nan]*3)
+
+    def add(self, values: Tuple) -> None:
+        power, imported, exported, current_1, current_2, current_3, soc = values
+        for i, value in enumerate((power, current_1, current_2, current_3)):
+            if math.isnan(value) is False:
+                self.sums[i] += value
+                self.counts[i] += 1
+        for i, value in enumerate((imported, exported, soc)):
+            if math.isnan(value) is False:
+                self.last[i] = value
+
+    def get_values(self) -> Tuple:
+        power, current_1, current_2, current_3 = (
+            sum / count if count else math.nan for sum, count in zip(self.sums, self.counts))
+        imported, exported, soc = self.last
+        return (power, imported, exported, current_1, current_2, current_3, soc)
+
+
+def _get_segment_size(resolution: int) -> int:
+    return SECONDS_PER_DAY // resolution * RECORD.size
+
+
+class Segment:
+    def __init__(self, path: Path, resolution: int) -> None:
+        self.path = path
+        self.resolution = resolution
+        size = _get_segment_size(resolution)
+        path.parent.mkdir(mode=0o755, parents=True, exist_ok=True)
+        self.file = open(path, "a+b")
+        current_size = self.file.seek(0, 2)
+        try:
+            # Speicherplatz für den ganzen Tag reservieren, leere Datensätze haben den Zeitstempel 0. Eine Datei mit
+            # Lücken (truncate) würde erst beim Schreiben in die Map belegt und bei voller SD-Karte zu SIGBUS führen.
+            os.posix_fallocate(self.file.fileno(), 0, size)
+            if current_size > size:
+                self.file.truncate(size)
+        except OSError:
+            self.file.close()
+            if current_size == 0:
+                path.unlink(missing_ok=True)
+            raise
+        self.mmap = mmap.mmap(self.file.fileno(), size)
+
+    def write(self, timestamp: int, values: Tuple) -> None:
+        offset = timestamp % SECONDS_PER_DAY // self.resolution * RECORD.size
+        RECORD.pack_into(self.mmap, offset, timestamp, *values)
+
+    def close(self) -> None:
+        self.mmap.close()
+        self.file.close()
+
+
+def read_segment(path: Path, day: int, begin: int, end: int) -> Iterator[Tuple]:
+    """ liefert die Datensätze der Segment-Datei des Tags von begin bis end (einschließlich)."""
+    try:
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            resolution = SECONDS_PER_DAY // (len(data) // RECORD.size)
+            day_start = day * SECONDS_PER_DAY
+            first = max(begin - day_start, 0) // resolution
+            last = min(end - day_start, SECONDS_PER_DAY - 1) // resolution
+            for record in RECORD.iter_unpack(data[first * RECORD.size:(last + 1) * RECORD.size]):
+                if record[0] != 0 and begin <= record[0] <= end:
+                    yield record
+    except (FileNotFoundError, ValueError):
+        return
+
+
+def _get_date(day: int) -> str:
+    return datetime.datetime.fromtimestamp(day * SECONDS_PER_DAY, datetime.timezone.utc).strftime("%Y%m%d")
+
+
+class TimeSeriesStore:
+    def __init__(self, folder: Path) -> None:
+        self.folder = folder
+        self.lock = Lock()
+        self.segments: Dict[Tuple[Path, int, int, str], Segment] = {}
+        self.aggregates: Dict[Tuple[str, int], Aggregate] = {}
+        self.day: Optional[int] = None
+        self.active = False
+        self.max_size = MAX_SIZE * 1024 * 1024
+        # Größe aller Segment-Dateien, None: wird beim nächsten Zugriff ermittelt
+        self.size: Optional[int] = None
+        self.last_error_log: Dict[str, float] = {}
+
+    def configure(self, active: bool, max_size: int) -> None:
+        """ aktiviert die Aufzeichnung, max_size: Maximalgröße aller Segment-Dateien in MB"""
+        with self.lock:
+            self.active = active
+            self.max_size = max_size * 1024 * 1024
+            if active is False:
+                self._close_segments()
+                self.aggregates.clear()
+
+    def _get_segment_path(self, resolution: int, day: int, series: str) -> Path:
+        return self.folder / f"{resolution}s" / _get_date(day) / f"{series}.bin"
+
+    def _get_segment(self, resolution: int, day: int, series: str) -> Optional[Segment]:
+        key = (self.folder, resolution, day, series)
+        segment = self.segments.get(key)
+        if segment is None:
+            path = self._get_segment_path(resolution, day, series)
+            new_file = path.exists() is False
+            if new_file and self._free_space(_get_segment_size(resolution)) is False:
+                self.log_error("max_size", f"Zeitreihe {path} wird nicht angelegt, da die Maximalgröße von "
+                               f"{self.max_size // 1024 // 1024}MB erreicht ist.")
+                return None
+            segment = self.segments[key] = Segment(path, resolution)
+            if new_file:
+                self.size += _get_segment_size(resolution)
+        return segment
+
+    def _get_size(self) -> int:
+        if self.size is None:
+            self.size = sum(path.stat().st_size for path in self.folder.glob("*s/*/*.bin"))
+        return self.size
+
+    def _free_space(self, size: int) -> bool:
+        """ löscht die ältesten Tage, bis ein neues Segment mit size Bytes in die Maximalgröße passt. Die Tage der
+        feinsten Auflösung werden zuerst gelöscht, der aktuelle Tag wird nicht gelöscht."""
+        while self._get_size() + size > self.max_size:
+            oldest = self._get_oldest_day()
+            if oldest is None:
+                return False
+            log.debug(f"Zeitreihen {oldest} werden gelöscht, da die Maximalgröße erreicht ist.")
+            shutil.rmtree(oldest, ignore_errors=True)
+            self.size = None
+        return True
+
+    def _get_oldest_day(self) -> Optional[Path]:
+        today = _get_date(self.day)
+        for tier in TIERS:
+            try:
+                days = [path for path in (self.folder / f"{tier.resolution}s").iterdir() if path.name < today]
+            except FileNotFoundError:
+                continue
+            if days:
+                return min(days)
+        return None
+
+    def log_error(self, key: str, message: str) -> None:
+        now = time.monotonic()
+        if now - self.last_error_log.get(key, -ERROR_LOG_INTERVAL) >= ERROR_LOG_INTERVAL:
+            self.last_error_log[key] = now
+            log.error(message)
+
+    def add(self, series: str, timestamp: float, state) -> None:
+        """ speichert den Status der Komponente (zB "counter0", "cp3") in allen Auflösungen."""
+        timestamp = int(timestamp)
+        values = get_values(state)
+        with self.lock:
+            if self.active is False:
+                return
+            day = timestamp // SECONDS_PER_DAY
+            if day != self.day:
+                self._start_day(day)
+            segment = self._get_segment(TIERS[0].resolution, day, series)
+            if segment is not None:
+                segment.write(timestamp, values)
+            for tier in TIERS[1:]:
+                slot = timestamp - timestamp % tier.resolution
+                aggregate = self.aggregates.get((series, tier.resolution))
+                if aggregate is None or aggregate.timestamp != slot:
+                    aggregate = self.aggregates[(series, tier.resolution)] = Aggregate(slot)
+                aggregate.add(values)
+                segment = self._get_segment(tier.resolution, day, series)
+                if segment is not None:
+                    segment.write(slot, aggregate.get_values())
+
+    def _start_day(self, day: int) -> None:
+        """ schließt die Segmente des Vortags und löscht die Segmente, deren Aufbewahrungsdauer abgelaufen ist."""
+        self._close_segments()
+        self.day = day
+        self.size = None
+        for tier in TIERS:
+            oldest = _get_date(day - tier.retention)
+            try:
+                for path in (self.folder / f"{tier.resolution}s").iterdir():
+                    if path.name < oldest:
+                        log.debug(f"Zeitreihen {path} werden gelöscht.")
+                        shutil.rmtree(path, ignore_errors=True)
+            except FileNotFoundError:
+                pass
+
+    def query(self, series: str, begin: float, end: float, resolution: int = TIERS[0].resolution) -> List[Dict]:
+        """ liefert die Werte der Komponente von begin bis end. Es wird die gröbste gespeicherte Auflösung verwendet,
+        die nicht größer als die angefragte ist und für den Zeitraum noch aufbewahrt wird. Ist die angefragte
+        Auflösung gröber, werden die Werte entsprechend zusammengefasst."""
+        begin, end = int(begin), int(end)
+        age = (int(timecheck.create_timestamp()) - begin) // SECONDS_PER_DAY
+        tier = next((tier for tier in reversed(TIERS) if tier.resolution <= resolution and age < tier.retention),
+                    None)
+        if tier is None:
+            tier = next((tier for tier in TIERS if age < tier.retention), TIERS[-1])
+        records = (record
+                   for day in range(begin // SECONDS_PER_DAY, end // SECONDS_PER_DAY + 1)
+                   for record in read_segment(self._get_segment_path(tier.resolution, day, series), day, begin, end))
+        if resolution > tier.resolution:
+            records = _downsample(records, resolution)
+        return [{"timestamp": record[0],
+                 "power": _to_value(record[1]),
+                 "imported": _to_value(record[2]),
+                 "exported": _to_value(record[3]),
+                 "currents": [_to_value(current) for current in record[4:7]],
+                 "soc": _to_value(record[7])} for record in records]
+
+    def _close_segments(self) -> None:
+        for segment in self.segments.values():
+            segment.close()
+        self.segments.clear()
+
+    def close(self) -> None:
+        with self.lock:
+            self._close_segments()
+
+
+def _downsample(records: Iterator[Tuple], resolution: int) -> Iterator[Tuple]:
+    aggregate = None
+    for record in records:
+        slot = record[0] - record[0] % resolution
+        if aggregate is not None and aggregate.timestamp != slot:
+            yield (aggregate.timestamp, *aggregate.get_values())
+            aggregate = None
+        if aggregate is None:
+            aggregate = Aggregate(slot)
+        aggregate.add(record[1:])
+    if aggregate is not None:
+        yield (aggregate.timestamp, *aggregate.get_values())
+
+
+time_series_store = TimeSeriesStore(Path(__file__).resolve().parents[3] / "data" / "time_series")
+
+
+def add_to_time_series(series: str, state) -> None:
+    try:
+        time_series_store.add(series, timecheck.create_timestamp(), state)
+    except OSError as e:
+        if e.errno == errno.ENOSPC:
+            time_series_store.log_error("no_space", "Zeitreihen können nicht gespeichert werden, da kein "
+                                        "Speicherplatz frei ist.")
+        else:
+            log.exception(f"Fehler beim Speichern der Zeitreihe von {series}")
+    except Exception:
+        log.exception(f"Fehler beim Speichern der Zeitreihe von {series}")
@@ -0,0 +1,170 @@
+import errno
+import os
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from control.general import General
+from helpermodules import subdata, timecheck
+from helpermodules.measurement_logging import time_series
+from helpermodules.measurement_logging.time_series import TimeSeriesStore
+from helpermodules.subdata import SubData
+from modules.common.component_state import BatState, CounterState
+
+# 01.01.2024 00:00:00 UTC
+DAY_START = 1704067200
+
+
+@pytest.fixture
+def store(tmp_path: Path, monkeypatch) -> TimeSeriesStore:
+    monkeypatch.setattr(timecheck, "create_timestamp", Mock(return_value=DAY_START + 3600))
+    store = TimeSeriesStore(tmp_path)
+    store.configure(True, 100)
+    yield store
+    store.close()
+
+
+def add_counter_values(store: TimeSeriesStore, begin: int, number: int) -> None:
+    for i in range(number):
+        store.add("counter0", begin + i * 10, CounterState(power=100 * i, imported=1000 + i, exported=0,
+                                                           currents=[i, i, i]))
+
+
+def test_query_raw_values(store: TimeSeriesStore):
+    # setup
+    add_counter_values(store, DAY_START, 6)
+
+    # execution
+    values = store.query("counter0", DAY_START + 10, DAY_START + 30)
+
+    # evaluation
+    assert values == [{"timestamp": DAY_START + 10 * i, "power": 100 * i, "imported": 1000 + i, "exported": 0,
+                       "currents": [i, i, i], "soc": None} for i in range(1, 4)]
+
+
+@pytest.mark.parametrize("resolution", [pytest.param(60, id="gespeicherte Auflösung"),
+                                        pytest.param(30, id="zusammengefasste Auflösung")])
+def test_query_mean_values(resolution: int, store: TimeSeriesStore):
+    # setup
+    add_counter_values(store, DAY_START, 12)
+
+    # execution
+    values = store.query("counter0", DAY_START, DAY_START + 119, resolution)
+
+    # evaluation
+    if resolution == 60:
+        assert [value["power"] for value in values] == [250, 850]
+        assert [value["imported"] for value in values] == [1005, 1011]
+    else:
+        assert [value["power"] for value in values] == [100, 400, 700, 1000]
+        assert [value["timestamp"] for value in values] == [DAY_START + 30 * i for i in range(4)]
+
+
+def test_query_over_days(store: TimeSeriesStore):
+    # setup
+    add_counter_values(store, DAY_START - 20, 4)
+
+    # execution
+    values = store.query("counter0", DAY_START - 20, DAY_START + 10)
+
+    # evaluation
+    assert [value["timestamp"] for value in values] == [DAY_START - 20, DAY_START - 10, DAY_START, DAY_START + 10]
+
+
+def test_battery_values(store: TimeSeriesStore):
+    # setup
+    store.add("bat2", DAY_START, BatState(power=-500, soc=50))
+
+    # execution
+    values = store.query("bat2", DAY_START, DAY_START + 60)
+
+    # evaluation
+    assert values == [{"timestamp": DAY_START, "power": -500, "imported": 0, "exported": 0,
+                       "currents": [0, 0, 0], "soc": 50}]
+
+
+def test_expired_segments_are_deleted(store: TimeSeriesStore, tmp_path: Path):
+    # setup
+    add_counter_values(store, DAY_START - 30 * 86400, 1)
+    add_counter_values(store, DAY_START - 86400, 1)
+
+    # execution
+    add_counter_values(store, DAY_START, 1)
+
+    # evaluation
+    assert sorted(path.name for path in (tmp_path / "10s").iterdir()) == ["20231231", "20240101"]
+    assert len(list((tmp_path / "60s").iterdir())) == 3
+
+
+def test_segment_space_is_reserved(store: TimeSeriesStore, tmp_path: Path):
+    # execution
+    add_counter_values(store, DAY_START, 1)
+
+    # evaluation
+    stat = (tmp_path / "10s" / "20240101" / "counter0.bin").stat()
+    assert stat.st_blocks * 512 >= stat.st_size
+
+
+def test_segment_no_space_left(store: TimeSeriesStore, tmp_path: Path, monkeypatch, caplog):
+    # setup
+    monkeypatch.setattr(time_series, "time_series_store", store)
+    monkeypatch.setattr(os, "posix_fallocate", Mock(side_effect=OSError(errno.ENOSPC, "No space left on device")))
+
+    # execution
+    for _ in range(2):
+        time_series.add_to_time_series("counter0", CounterState(power=100, imported=1000, exported=0))
+
+    # evaluation
+    assert store.segments == {}
+    assert list((tmp_path / "10s" / "20240101").iterdir()) == []
+    # die Meldung wird nicht in jedem Zyklus wiederholt
+    assert caplog.text.count("kein Speicherplatz") == 1
+
+
+def test_inactive(tmp_path: Path, monkeypatch):
+    # setup
+    store = TimeSeriesStore(tmp_path)
+    monkeypatch.setattr(subdata, "time_series_store", store)
+    general = General()
+    SubData(*([Mock()]*16)).process_general_topic(general, Mock(topic="openWB/general/time_series/active",
+                                                                payload=b"true"))
+    SubData(*([Mock()]*16)).process_general_topic(general, Mock(topic="openWB/general/time_series/active",
+                                                                payload=b"false"))
+
+    # execution
+    add_counter_values(store, DAY_START, 1)
+
+    # evaluation
+    assert store.active is False
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_max_size_deletes_oldest_days(store: TimeSeriesStore, tmp_path: Path):
+    # setup
+    add_counter_values(store, DAY_START - 2 * 86400, 1)
+    add_counter_values(store, DAY_START - 86400, 1)
+    # zwei Tage einer Komponente
+    store.max_size = store._get_size()
+
+    # execution
+    add_counter_values(store, DAY_START, 1)
+
+    # evaluation
+    # die Tage der feinsten Auflösung werden zuerst gelöscht
+    assert [path.name for path in (tmp_path / "10s").iterdir()] == ["20240101"]
+    assert len(list((tmp_path / "60s").iterdir())) == 3
+    assert store.size == sum(path.stat().st_size for path in tmp_path.glob("*s/*/*.bin"))
+
+
+def test_max_size_reached(store: TimeSeriesStore, tmp_path: Path, caplog):
+    # setup
+    store.max_size = 100000
+
+    # execution
+    add_counter_values(store, DAY_START, 2)
+
+    # evaluation
+    assert (tmp_path / "10s" / "20240101" / "counter0.bin").exists() is False
+    assert (tmp_path / "60s" / "20240101" / "counter0.bin").exists()
+    assert caplog.text.count("Maximalgröße") == 1
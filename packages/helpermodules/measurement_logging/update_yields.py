@@ -1,4 +1,3 @@
-import json
 import logging
 from pathlib import Path
 from typing import Dict, List
@@ -9,6 +8,7 @@ from control.ev.ev import Ev
 from control.pv_all import PvAll
 from control.pv import Pv
 from helpermodules import timecheck
+from helpermodules.measurement_logging.log_store import get_log_names, read_log
 from helpermodules.measurement_logging.process_log import get_totals
 from helpermodules.pub import Pub
 
@@ -81,8 +81,7 @@ def _update_pv_monthly_yields():
     """
     try:
         pv_all_monthly_yield = 0
-        with open(f"data/monthly_log/{timecheck.create_timestamp_YYYYMM()}.json", "r") as f:
-            monthly_log = json.load(f)
+        monthly_log = read_log(f"data/monthly_log/{timecheck.create_timestamp_YYYYMM()}.json")
         for pv_module in data.data.pv_data.values():
             for entry in monthly_log["entries"]:
                 if entry["pv"].get(f"pv{pv_module.num}"):
@@ -101,8 +100,7 @@ def _update_pv_monthly_yields():
 
 def pub_yearly_module_yield(sorted_path_list: List[str], pv_module: Pv):
     for path in sorted_path_list:
-        with open(path, "r") as f:
-            monthly_log = json.load(f)
+        monthly_log = read_log(path)
         for entry in monthly_log["entries"]:
             # erster Eintrag mit PV im Jahr,falls WR erst im laufenden Jahr hinzugefügt wurden
             if entry["pv"].get(f"pv{pv_module.num}"):
@@ -120,13 +118,13 @@ def _update_pv_yearly_yields():
     """
     try:
         pv_all_yearly_yield = 0
-        path_list = list(Path(_get_parent_path()/"data"/"monthly_log").glob(f"{timecheck.create_timestamp_YYYY()}*"))
-        sorted_path_list = sorted([str(p) for p in path_list])
+        monthly_log_path = Path(_get_parent_path()/"data"/"monthly_log")
+        sorted_path_list = [str(monthly_log_path / f"{name}.json") for name in get_log_names(monthly_log_path)
+                            if name.startswith(timecheck.create_timestamp_YYYY())]
         for pv_module in data.data.pv_data.values():
             found_pv = False
             for path in sorted_path_list:
-                with open(path, "r") as f:
-                    monthly_log = json.load(f)
+                monthly_log = read_log(path)
                 for entry in monthly_log["entries"]:
                     # erster Eintrag mit PV im Jahr, falls WR erst im laufenden Jahr hinzugefügt wurden
                     if entry["pv"].get(f"pv{pv_module.num}"):
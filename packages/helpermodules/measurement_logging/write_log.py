@@ -6,14 +6,15 @@ from math import isnan
 from pathlib import Path
 import re
 import string
-from paho.mqtt.client import Client as MqttClient, MQTTMessage
 from typing import Dict, Optional
 
 from control import data
-from helpermodules.broker import BrokerClient
+from helpermodules.broker_cache import broker_cache
 from helpermodules import timecheck
-from helpermodules.utils.json_file_handler import write_and_check
-from helpermodules.utils.topic_parser import decode_payload, get_index
+from helpermodules.measurement_logging.log_store import (append_entry, compact_logs, get_log_names, log_exists,
+                                                         read_log)
+from helpermodules.measurement_logging.recent_log_entries import recent_daily_entries
+from helpermodules.utils.topic_parser import get_index
 from modules.common.utils.component_parser import get_component_name_by_id
 
 log = logging.getLogger(__name__)
@@ -104,36 +105,34 @@ class LegacySmartHomeLogData:
         self.sh_dict: Dict = {}
         self.sh_names: Dict = {}
         try:
-            BrokerClient("smart-home-logging", self.on_connect, self.on_message).start_finite_loop()
+            self.all_received_topics = broker_cache.get_payloads("openWB/LegacySmartHome/")
             for topic, payload in self.all_received_topics.items():
                 if re.search("openWB/LegacySmartHome/config/get/Devices/[1-9]/device_configured", topic) is not None:
-                    if decode_payload(payload) == 1:
+                    if payload == 1:
                         index = get_index(topic)
                         self.sh_dict.update({f"sh{index}": {}})
-                        for topic, payload in self.all_received_topics.items():
-                            if f"openWB/LegacySmartHome/Devices/{index}/Wh" == topic:
-                                self.sh_dict[f"sh{index}"].update({"imported": decode_payload(payload), "exported": 0})
-                            for sensor_id in range(0, 3):
-                                if f"openWB/LegacySmartHome/Devices/{index}/TemperatureSensor{sensor_id}" == topic:
-                                    self.sh_dict[f"sh{index}"].update({f"temp{sensor_id}": decode_payload(payload)})
-                        for topic, payload in self.all_received_topics.items():
-                            if f"openWB/LegacySmartHome/config/get/Devices/{index}/device_name" == topic:
-                                self.sh_names.update({f"sh{index}": decode_payload(payload)})
+                        if f"openWB/LegacySmartHome/Devices/{index}/Wh" in self.all_received_topics:
+                            self.sh_dict[f"sh{index}"].update({
+                                "imported": self.all_received_topics[f"openWB/LegacySmartHome/Devices/{index}/Wh"],
+                                "exported": 0})
+                        for sensor_id in range(0, 3):
+                            sensor_topic = f"openWB/LegacySmartHome/Devices/{index}/TemperatureSensor{sensor_id}"
+                            if sensor_topic in self.all_received_topics:
+                                self.sh_dict[f"sh{index}"].update(
+                                    {f"temp{sensor_id}": self.all_received_topics[sensor_topic]})
+                        name_topic = f"openWB/LegacySmartHome/config/get/Devices/{index}/device_name"
+                        if name_topic in self.all_received_topics:
+                            self.sh_names.update({f"sh{index}": self.all_received_topics[name_topic]})
         except Exception:
             log.exception("Fehler im Werte-Logging-Modul für SmartHome")
 
-    def on_connect(self, client: MqttClient, userdata, flags: dict, rc: int):
-        client.subscribe("openWB/LegacySmartHome/#", 2)
-
-    def on_message(self, client: MqttClient, userdata, msg: MQTTMessage):
-        self.all_received_topics.update({msg.topic: msg.payload})
-
 
 def save_log(log_type: LogType):
     """ Parameter
     ---------
     folder: str
         gibt an, ob ein Tages-oder Monats-Log-Eintrag erstellt werden soll.
+    Rückgabe: Inhalt des Logs mit dem neuen Eintrag
     """
     try:
         parent_file = Path(__file__).resolve().parents[3] / "data" / \
@@ -146,27 +145,29 @@ def save_log(log_type: LogType):
         filepath = str(parent_file / f"{file_name}.json")
 
         try:
-            with open(filepath, "r") as jsonFile:
-                content = json.load(jsonFile)
+            content = read_log(filepath)
         except FileNotFoundError:
             content = {"entries": [], "names": {}}
         except json.JSONDecodeError:
             new_filepath = str(parent_file / f"{file_name}_invalid.json")
             os.rename(filepath, new_filepath)
-            content = {"entries": [], "names": {}}
+            content = read_log(filepath) if log_exists(filepath) else {"entries": [], "names": {}}
 
         previous_entry = get_previous_entry(parent_file, content)
 
         sh_log_data = LegacySmartHomeLogData()
         new_entry = create_entry(log_type, sh_log_data, previous_entry)
 
-        # json-Objekt in Datei einfügen
-
+        # Eintrag an die Datei anhängen, die Namen nur bei Änderungen speichern
         entries = content["entries"]
         entries.append(new_entry)
-        content["names"] = get_names(content["entries"][-1], sh_log_data.sh_names)
-        write_and_check(filepath, content)
-        return content["entries"]
+        names = get_names(content["entries"][-1], sh_log_data.sh_names)
+        append_entry(filepath, new_entry, names if names != content["names"] else None)
+        if log_type == LogType.DAILY:
+            recent_daily_entries.append(new_entry)
+        content["names"] = names
+        compact_logs(parent_file, file_name)
+        return content
     except Exception:
         log.exception("Fehler beim Speichern des Log-Eintrags")
         return None
@@ -176,13 +177,10 @@ def get_previous_entry(parent_file: Path, content: Dict) -> Optional[Dict]:
     try:
         previous_entry = content["entries"][-1]
     except IndexError:
-        # get all files in Folder
-        path_list = parent_file.glob('*.json')
-        # sort path list by name
-        path_list = sorted(path_list, key=lambda x: x.name)
+        # Logs im Ordner nach Namen sortiert
+        log_names = get_log_names(parent_file)
         try:
-            with open(path_list[-2], "r") as jsonFile:
-                content = json.load(jsonFile)
+            content = read_log(parent_file / f"{log_names[-2]}.json")
             previous_entry = content["entries"][-1]
         except (IndexError, FileNotFoundError, json.decoder.JSONDecodeError):
             previous_entry = None
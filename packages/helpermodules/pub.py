@@ -1,5 +1,8 @@
+from dataclasses import dataclass
 import json
 import logging
+from threading import Lock, local
+from typing import Dict
 import paho.mqtt.publish as publish
 
 from helpermodules.broker import InternalBrokerPublisher
@@ -8,16 +11,98 @@ from helpermodules.broker import InternalBrokerPublisher
 log = logging.getLogger(__name__)
 
 
+@dataclass
+class BatchStatistics:
+    queued: int = 0
+    messages: int = 0
+    bytes: int = 0
+    unchanged: int = 0
+
+
 class PubSingleton:
+    """ Während eines Regelzyklus (siehe ChangedValuesContext) werden die Nachrichten des Threads, der den Zyklus
+    ausführt, gesammelt. Mehrfach veröffentlichte Topics werden zum letzten Wert zusammengefasst und retained Topics,
+    deren Payload sich seit der letzten Veröffentlichung nicht geändert hat, ausgelassen. Am Ende des Zyklus werden die
+    Nachrichten gebündelt gesendet, um den vom Display und den Brücken genutzten Broker nicht mit vielen
+    Einzelnachrichten zu belasten. Nachrichten anderer Threads werden weiterhin sofort gesendet.
+    """
+
     def __init__(self) -> None:
         self.publisher = InternalBrokerPublisher()
         self.publisher.start_loop()
+        self.lock = Lock()
+        # Hash der zuletzt gesendeten Payload je retained Topic
+        self.payload_hashes: Dict[str, int] = {}
+        self.batch = local()
+        self.last_batch_statistics = BatchStatistics()
 
     def pub(self, topic: str, payload, qos: int = 0, retain: bool = True, no_json: bool = False) -> None:
-        if payload == "" or no_json:
-            self.publisher.client.publish(topic, payload, qos=qos, retain=retain)
+        if payload != "" and no_json is False:
+            payload = json.dumps(payload)
+        queue = getattr(self.batch, "queue", None)
+        if queue is None:
+            self._publish(topic, payload, qos, retain)
         else:
-            self.publisher.client.publish(topic, payload=json.dumps(payload), qos=qos, retain=retain)
+            # erneut veröffentlichte Topics ans Ende verschieben, damit die Reihenfolge der letzten Werte erhalten
+            # bleibt
+            queue.pop(topic, None)
+            queue[topic] = (payload, qos, retain)
+            self.batch.statistics.queued += 1
+
+    def pub_immediately(self, topic: str, payload, qos: int = 0, retain: bool = True, no_json: bool = False) -> None:
+        """ sendet die Nachricht auch während eines Zyklus sofort, zB wenn danach der Prozess beendet wird."""
+        if payload != "" and no_json is False:
+            payload = json.dumps(payload)
+        queue = getattr(self.batch, "queue", None)
+        if queue is not None:
+            queue.pop(topic, None)
+        self._publish(topic, payload, qos, retain)
+
+    def _publish(self, topic: str, payload, qos: int, retain: bool) -> None:
+        self.publisher.client.publish(topic, payload, qos=qos, retain=retain)
+        with self.lock:
+            if retain:
+                self.payload_hashes[topic] = _payload_hash(payload)
+            else:
+                self.payload_hashes.pop(topic, None)
+
+    def start_batch(self) -> None:
+        if getattr(self.batch, "queue", None) is None:
+            self.batch.queue = {}
+            self.batch.statistics = BatchStatistics()
+            self.batch.depth = 0
+        self.batch.depth += 1
+
+    def flush_batch(self) -> None:
+        """ sendet die gesammelten Nachrichten. Bei verschachtelten Aufrufen erst am Ende des äußersten Zyklus."""
+        if getattr(self.batch, "queue", None) is None:
+            return
+        self.batch.depth -= 1
+        if self.batch.depth > 0:
+            return
+        queue, statistics = self.batch.queue, self.batch.statistics
+        self.batch.queue = None
+        for topic, (payload, qos, retain) in queue.items():
+            try:
+                if retain:
+                    with self.lock:
+                        unchanged = self.payload_hashes.get(topic) == _payload_hash(payload)
+                    if unchanged:
+                        statistics.unchanged += 1
+                        continue
+                self._publish(topic, payload, qos, retain)
+                statistics.messages += 1
+                statistics.bytes += len(topic) + len(str(payload).encode("utf-8"))
+            except Exception:
+                log.exception(f"Fehler beim Veröffentlichen von {topic}")
+        self.last_batch_statistics = statistics
+        log.debug(f"Veröffentlicht: {statistics.messages} Nachrichten, {statistics.bytes} Bytes "
+                  f"({statistics.queued} gesammelt, {statistics.unchanged} unverändert)")
+
+
+def _payload_hash(payload) -> int:
+    # der Typ wird einbezogen, da zB 1, 1.0 und True den gleichen Hash haben, aber unterschiedlich gesendet werden
+    return hash((type(payload), payload))
 
 
 class Pub:
@@ -0,0 +1,67 @@
+from threading import Thread
+from unittest.mock import Mock, call
+
+import pytest
+
+from helpermodules import pub
+from helpermodules.pub import PubSingleton
+
+
+@pytest.fixture
+def pub_singleton(monkeypatch) -> PubSingleton:
+    monkeypatch.setattr(pub, "InternalBrokerPublisher", Mock())
+    return PubSingleton()
+
+
+def test_batch_coalesces_topics(pub_singleton: PubSingleton):
+    # setup
+    publish_mock = pub_singleton.publisher.client.publish
+    pub_singleton.start_batch()
+
+    # execution
+    pub_singleton.pub("openWB/set/counter/0/get/power", 100)
+    pub_singleton.pub("openWB/set/counter/0/get/imported", 200)
+    pub_singleton.pub("openWB/set/counter/0/get/power", 300)
+    publish_mock.assert_not_called()
+    pub_singleton.flush_batch()
+
+    # evaluation
+    assert publish_mock.call_args_list == [call("openWB/set/counter/0/get/imported", "200", qos=0, retain=True),
+                                           call("openWB/set/counter/0/get/power", "300", qos=0, retain=True)]
+    assert pub_singleton.last_batch_statistics.queued == 3
+    assert pub_singleton.last_batch_statistics.messages == 2
+
+
+def test_batch_skips_unchanged_retained(pub_singleton: PubSingleton):
+    # setup
+    publish_mock = pub_singleton.publisher.client.publish
+    pub_singleton.pub("openWB/set/counter/0/get/power", 100)
+    pub_singleton.pub("openWB/set/counter/0/get/imported", 1)
+    publish_mock.reset_mock()
+    pub_singleton.start_batch()
+
+    # execution
+    pub_singleton.pub("openWB/set/counter/0/get/power", 100)
+    pub_singleton.pub("openWB/set/counter/0/get/imported", 1.0)
+    pub_singleton.pub("openWB/set/counter/0/get/exported", 100, retain=False)
+    pub_singleton.flush_batch()
+
+    # evaluation
+    assert publish_mock.call_args_list == [call("openWB/set/counter/0/get/imported", "1.0", qos=0, retain=True),
+                                           call("openWB/set/counter/0/get/exported", "100", qos=0, retain=False)]
+    assert pub_singleton.last_batch_statistics.unchanged == 1
+
+
+def test_other_threads_publish_immediately(pub_singleton: PubSingleton):
+    # setup
+    publish_mock = pub_singleton.publisher.client.publish
+    pub_singleton.start_batch()
+
+    # execution
+    thread = Thread(target=pub_singleton.pub, args=("openWB/set/system/time", 1))
+    thread.start()
+    thread.join()
+
+    # evaluation
+    publish_mock.assert_called_once_with("openWB/set/system/time", "1", qos=0, retain=True)
+    pub_singleton.flush_batch()
@@ -3,7 +3,6 @@
 
 import copy
 import dataclasses
-from pathlib import Path
 from threading import Event
 from typing import List, Optional, Tuple
 import re
@@ -16,6 +15,7 @@ from helpermodules.broker import BrokerClient
 from helpermodules.pub import Pub
 from helpermodules.utils.topic_parser import decode_payload, get_index, get_index_position
 from helpermodules.update_config import UpdateConfig
+from smarthome.smartstate import smart_state
 import dataclass_utils
 
 log = logging.getLogger(__name__)
@@ -757,6 +757,16 @@ class SetData:
                 self._validate_value(msg, int, [(10, 10), (20, 20), (60, 60)])
             elif "openWB/set/general/external_buttons_hw" in msg.topic:
                 self._validate_value(msg, bool)
+            elif "openWB/set/general/event_driven_control/active" in msg.topic:
+                self._validate_value(msg, bool)
+            elif "openWB/set/general/event_driven_control/grid_power_threshold" in msg.topic:
+                self._validate_value(msg, int, [(0, float("inf"))])
+            elif "openWB/set/general/event_driven_control/min_spacing" in msg.topic:
+                self._validate_value(msg, int, [(1, 60)])
+            elif "openWB/set/general/time_series/active" in msg.topic:
+                self._validate_value(msg, bool)
+            elif "openWB/set/general/time_series/max_size" in msg.topic:
+                self._validate_value(msg, int, [(10, 10000)])
             elif "openWB/set/general/chargemode_config/unbalanced_load_limit" in msg.topic:
                 self._validate_value(msg, int, [(10, 32)])
             elif ("openWB/set/general/chargemode_config/unbalanced_load" in msg.topic or
@@ -1194,18 +1204,13 @@ class SetData:
                     Pub().pub(msg.topic.replace('openWB/set/', 'openWB/', 1), msg.payload.decode("utf-8"),
                               retain=True, no_json=True)
                     Pub().pub(msg.topic, "", no_json=True)
-                    with open(self._get_ramdisk_path()/"rereadsmarthomedevices", 'w') as f:
-                        f.write(str(1))
+                    smart_state.set("rereadsmarthomedevices", 1)
                     if f"openWB/set/LegacySmartHome/config/set/Devices/{index}/mode" in msg.topic:
-                        with open(self._get_ramdisk_path()/f"smarthome_device_manual_{index}", 'w') as f:
-                            f.write(str(decode_payload(msg.payload)))
+                        smart_state.set(f"smarthome_device_manual_{index}", int(decode_payload(msg.payload)))
                     if f"openWB/set/LegacySmartHome/config/set/Devices/{index}/device_manual_control" in msg.topic:
-                        with open(self._get_ramdisk_path()/f"smarthome_device_manual_control_{index}", 'w') as f:
-                            f.write(str(decode_payload(msg.payload)))
+                        smart_state.set(f"smarthome_device_manual_control_{index}", int(decode_payload(msg.payload)))
                     if f"openWB/set/LegacySmartHome/config/set/Devices/{index}/manueb" in msg.topic:
-                        manueb = int(msg.payload)
-                        with open(self._get_ramdisk_path()/f"smarthome_device_manual_ueb_{index}", 'w') as f:
-                            f.write(str(manueb))
+                        smart_state.set(f"smarthome_device_manual_ueb_{index}", int(msg.payload))
                 elif (f"openWB/set/LegacySmartHome/Devices/{index}/Ueberschuss" in msg.topic or
                         f"openWB/set/LegacySmartHome/Devices/{index}/ReqRelay" in msg.topic or
                         f"openWB/set/LegacySmartHome/Devices/{index}/Aktpower" in msg.topic or
@@ -1219,6 +1224,3 @@ class SetData:
                 self.__unknown_topic(msg)
         except Exception:
             log.exception(f"Fehler im setdata-Modul: Topic {msg.topic}, Value: {msg.payload}")
-
-    def _get_ramdisk_path(self) -> Path:
-        return Path(__file__).resolve().parents[2]/"ramdisk"
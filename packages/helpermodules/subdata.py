@@ -15,6 +15,7 @@ from control.chargepoint.chargepoint_all import AllChargepoints
 from control.chargepoint.chargepoint_data import Log
 from control.chargepoint.chargepoint_state_update import ChargepointStateUpdate
 from control.chargepoint.chargepoint_template import CpTemplate, CpTemplateData
+from control.control_trigger import control_trigger
 from control.ev.charge_template import ChargeTemplate, ChargeTemplateData
 from control.ev import ev
 from control.ev.ev_template import EvTemplate, EvTemplateData
@@ -22,10 +23,12 @@ from control.limiting_value import LoadmanagementLimit
 from control.optional_data import Ocpp
 from helpermodules import graph, system
 from helpermodules.broker import BrokerClient
+from helpermodules.measurement_logging.time_series import time_series_store
 from helpermodules.messaging import MessageType, pub_system_message
 from helpermodules.mosquitto_dynsec.role_handler import add_acl_role, remove_acl_role
 from helpermodules.mosquitto_dynsec.user_handler import remove_display_user, create_display_user
 from helpermodules.utils import ProcessingCounter
+from helpermodules.utils.change_tracker import ChangeTracker
 from helpermodules.utils.run_command import run_command
 from helpermodules.utils.topic_parser import decode_payload, get_index, get_second_index
 from helpermodules.pub import Pub
@@ -41,6 +44,26 @@ from modules.vehicles.manual.config import ManualSoc
 log = logging.getLogger(__name__)
 mqtt_log = logging.getLogger("mqtt")
 
+# Topic-Präfix, Kategorie für Instanzen mit Index (Key-Präfix) und Kategorie für Topics ohne Index
+CHANGE_TRACKING_TOPICS = (
+    ("openWB/vehicle/template/charge_template/", None, "ev_charge_template_data"),
+    ("openWB/vehicle/template/ev_template/", None, "ev_template_data"),
+    ("openWB/vehicle/", ("ev_data", "ev"), "ev_data"),
+    ("openWB/chargepoint/template/", None, "cp_template_data"),
+    ("openWB/chargepoint/", ("cp_data", "cp"), "cp_all_data"),
+    ("openWB/pv/", ("pv_data", "pv"), "pv_all_data"),
+    ("openWB/bat/", ("bat_data", "bat"), "bat_all_data"),
+    ("openWB/general/", None, "general_data"),
+    ("openWB/graph/", None, "graph_data"),
+    ("openWB/io/action", None, "io_actions"),
+    ("openWB/io/states", None, "io_states"),
+    ("openWB/internal_io/states", None, "io_states"),
+    ("openWB/optional/", None, "optional_data"),
+    ("openWB/counter/", ("counter_data", "counter"), "counter_all_data"),
+    ("openWB/system/", None, "system_data"),
+    ("openWB/LegacySmartHome/", None, "counter_all_data"),
+)
+
 
 class SubData:
     """ Klasse, die die benötigten Topics abonniert, die Instanzen erstellt, wenn z.b. ein Modul neu konfiguriert
@@ -71,6 +94,8 @@ class SubData:
     optional_data = optional.Optional()
     system_data = {"system": system.System()}
     graph_data = graph.Graph()
+    # geänderte Instanzen, damit Data nur diese erneut kopieren muss
+    change_tracker = ChangeTracker()
 
     def __init__(self,
                  event_ev_template: Event,
@@ -161,6 +186,14 @@ class SubData:
         mqtt_log.debug("Topic: "+str(msg.topic) +
                        ", Payload: "+str(msg.payload.decode("utf-8")))
         self.heartbeat = True
+        try:
+            self.process_topic(client, msg)
+        finally:
+            # erst nach dem Verarbeiten markieren, damit beim Kopieren nicht der alte Stand unter der neuen Version
+            # gespeichert wird
+            self.track_change(msg.topic)
+
+    def process_topic(self, client: mqtt.Client, msg: mqtt.MQTTMessage):
         if "openWB/vehicle/template/charge_template/" in msg.topic:
             self.process_vehicle_charge_template_topic(
                 self.ev_charge_template_data, msg)
@@ -199,6 +232,21 @@ class SubData:
         else:
             log.warning("unknown subdata-topic: "+str(msg.topic))
 
+    def track_change(self, topic: str) -> None:
+        try:
+            for prefix, indexed_category, category in CHANGE_TRACKING_TOPICS:
+                if topic.startswith(prefix):
+                    if indexed_category is not None:
+                        index = re.match(f"{prefix}([0-9]+)(/|$)", topic)
+                        if index is not None:
+                            self.change_tracker.mark_changed(indexed_category[0],
+                                                             f"{indexed_category[1]}{index.group(1)}")
+                            break
+                    self.change_tracker.mark_changed(category)
+                    break
+        except Exception:
+            log.exception("Fehler im subdata-Modul")
+
     def set_json_payload(self, dict: Dict, msg: mqtt.MQTTMessage) -> None:
         """ dekodiert das JSON-Objekt und setzt diesen für den Value in das übergebene Dictionary, als Key wird der
         Name nach dem letzten / verwendet.
@@ -624,6 +672,11 @@ class SubData:
             if re.search("/general/", msg.topic) is not None:
                 if re.search("/general/prices/", msg.topic) is not None:
                     self.set_json_payload_class(var.data.prices, msg)
+                elif re.search("/general/event_driven_control/", msg.topic) is not None:
+                    self.set_json_payload_class(var.data.event_driven_control, msg)
+                elif re.search("/general/time_series/", msg.topic) is not None:
+                    self.set_json_payload_class(var.data.time_series, msg)
+                    time_series_store.configure(var.data.time_series.active, var.data.time_series.max_size)
                 elif re.search("/general/chargemode_config/", msg.topic) is not None:
                     if re.search("/general/chargemode_config/pv_charging/", msg.topic) is not None:
                         self.set_json_payload_class(var.data.chargemode_config.pv_charging, msg)
@@ -857,6 +910,13 @@ class SubData:
         except Exception:
             log.exception("Fehler im subdata-Modul")
 
+    def close_device(self, device) -> None:
+        try:
+            if hasattr(device, "close"):
+                device.close()
+        except Exception:
+            log.exception("Fehler beim Schließen des Geräts")
+
     def process_system_topic(self, client: mqtt.Client, var: dict, msg: mqtt.MQTTMessage):
         """ Handler für die System-Topics
 
@@ -870,6 +930,9 @@ class SubData:
         try:
             if re.search("/device/[0-9]+/config$", msg.topic) is not None:
                 index = get_index(msg.topic)
+                if "device"+index in var:
+                    # Verbindungen des bisherigen Geräts freigeben
+                    self.close_device(var["device"+index])
                 if decode_payload(msg.payload) == "":
                     if "device"+index in var:
                         var.pop("device"+index)
@@ -1096,6 +1159,8 @@ class SubData:
         try:
             if re.search("/graph/config/", msg.topic) is not None:
                 self.set_json_payload_class(var.data.config, msg)
+            elif re.search("/graph/alllivevaluesJson[0-9]+$", msg.topic) is not None:
+                var.restore_chunk(int(re.search("[0-9]+$", msg.topic).group()), msg.payload.decode("utf-8"))
         except Exception:
             log.exception("Fehler im subdata-Modul")
 
@@ -1114,6 +1179,8 @@ class SubData:
                     self.set_json_payload_class(var[f"cp{index}"].data, msg)
                 elif re.search("/internal_chargepoint/[0-1]/get/", msg.topic) is not None:
                     self.set_json_payload_class(var[f"cp{index}"].get, msg)
+                    if re.search("/internal_chargepoint/[0-1]/get/plug_state$", msg.topic) is not None:
+                        control_trigger.check_plug_state(f"Interner Ladepunkt {index}", decode_payload(msg.payload))
             elif "internal_chargepoint/global_data" in msg.topic:
                 self.set_json_payload_class(var["global_data"], msg)
                 if decode_payload(msg.payload)["parent_ip"] != var["global_data"].parent_ip:
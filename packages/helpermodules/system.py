@@ -32,9 +32,11 @@ class System:
         """ markiert ein aktives Update, triggert das Update auf dem Master und den externen WBs.
         """
         try:
-            pub.Pub().pub("openWB/set/system/perform_update", False)
+            # nicht bis zum Ende des Regelzyklus sammeln, da atreboot.sh den Prozess beendet. Sonst bleibt
+            # perform_update gesetzt und das Update wird nach jedem Neustart erneut ausgeführt.
+            pub.Pub().pub_immediately("openWB/set/system/perform_update", False)
             self.data["update_in_progress"] = True
-            pub.Pub().pub("openWB/set/system/update_in_progress", True)
+            pub.Pub().pub_immediately("openWB/set/system/update_in_progress", True)
             if self.data["release_train"] == "stable":
                 train = "stable17"
             else:
@@ -0,0 +1,31 @@
+from unittest.mock import Mock, call
+
+from helpermodules import pub, system
+from helpermodules.pub import PubSingleton
+from helpermodules.system import System
+
+
+def test_perform_update_publishes_before_reboot(monkeypatch):
+    # setup
+    monkeypatch.setattr(pub, "InternalBrokerPublisher", Mock())
+    pub_singleton = PubSingleton()
+    monkeypatch.setattr(pub.Pub, "instance", pub_singleton)
+    publish_mock = pub_singleton.publisher.client.publish
+    published_before_run_command = []
+    monkeypatch.setattr(system, "run_command",
+                        Mock(side_effect=lambda *args, **kwargs: published_before_run_command.extend(
+                            publish_mock.call_args_list)))
+    monkeypatch.setattr(system.time, "sleep", Mock())
+    monkeypatch.setattr(System, "_trigger_ext_update", Mock())
+    system_ = System()
+    system_.data["release_train"] = "master"
+
+    # execution
+    pub_singleton.start_batch()
+    system_.perform_update()
+
+    # evaluation
+    assert published_before_run_command == [
+        call("openWB/set/system/perform_update", "false", qos=0, retain=True),
+        call("openWB/set/system/update_in_progress", "true", qos=0, retain=True)]
+    pub_singleton.flush_batch()
@@ -26,7 +26,8 @@ from helpermodules.hardware_configuration import (
     update_hardware_configuration,
     get_serial_number
 )
-from helpermodules.measurement_logging.process_log import get_default_charge_log_columns, get_totals
+from helpermodules.measurement_logging.process_log import (create_monthly_summaries, get_default_charge_log_columns,
+                                                           get_totals)
 from helpermodules.measurement_logging.write_log import get_names
 from helpermodules.messaging import MessageType, pub_system_message
 from helpermodules.pub import Pub
@@ -40,7 +41,7 @@ from control.counter import get_counter_default_config
 from control.ev.charge_template import EcoCharging, get_charge_template_default
 from control.ev import ev
 from control.ev.ev_template import EvTemplateData
-from control.general import Prices, PvCharging
+from control.general import EventDrivenControl, Prices, PvCharging, TimeSeriesConfig
 from control.optional_data import OcppConfig
 from modules.common.abstract_vehicle import GeneralVehicleConfig
 from modules.common.component_type import ComponentType
@@ -57,7 +58,7 @@ NO_MODULE = {"type": None, "configuration": {}}
 
 class UpdateConfig:
 
-    DATASTORE_VERSION = 121
+    DATASTORE_VERSION = 122
 
     valid_topic = [
         "^openWB/bat/config/bat_control_permitted$",
@@ -218,6 +219,11 @@ class UpdateConfig:
         "^openWB/general/extern_display_mode$",
         "^openWB/general/charge_log_data_config$",
         "^openWB/general/control_interval$",
+        "^openWB/general/event_driven_control/active$",
+        "^openWB/general/event_driven_control/grid_power_threshold$",
+        "^openWB/general/event_driven_control/min_spacing$",
+        "^openWB/general/time_series/active$",
+        "^openWB/general/time_series/max_size$",
         "^openWB/general/external_buttons_hw$",
         "^openWB/general/grid_protection_configured$",
         "^openWB/general/grid_protection_active$",
@@ -603,6 +609,11 @@ class UpdateConfig:
         ("openWB/general/chargemode_config/unbalanced_load", False),
         ("openWB/general/chargemode_config/unbalanced_load_limit", 18),
         ("openWB/general/control_interval", 10),
+        ("openWB/general/event_driven_control/active", EventDrivenControl().active),
+        ("openWB/general/event_driven_control/grid_power_threshold", EventDrivenControl().grid_power_threshold),
+        ("openWB/general/event_driven_control/min_spacing", EventDrivenControl().min_spacing),
+        ("openWB/general/time_series/active", TimeSeriesConfig().active),
+        ("openWB/general/time_series/max_size", TimeSeriesConfig().max_size),
         ("openWB/general/extern", False),
         ("openWB/general/extern_display_mode", "primary"),
         ("openWB/general/external_buttons_hw", False),
@@ -3071,3 +3082,8 @@ class UpdateConfig:
                     return {topic: payload}
         self._loop_all_received_topics(upgrade)
         self._append_datastore_version(121)
+
+    def upgrade_datastore_122(self) -> None:
+        # Zusammenfassungen der vorhandenen Monats-Logs für die Jahresansicht erstellen
+        create_monthly_summaries(self.base_path / "data" / "monthly_log")
+        self._append_datastore_version(122)
@@ -1,3 +1,4 @@
 from helpermodules.utils._get_default import get_default
 from helpermodules.utils._thread_handler import joined_thread_handler, thread_handler
 from helpermodules.utils.processing_counter import ProcessingCounter
+from helpermodules.utils._worker_pool import Task, WorkerPool
@@ -0,0 +1,96 @@
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from threading import Lock, current_thread
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+
+class Task(NamedTuple):
+    name: str
+    target: Callable
+    args: Tuple = ()
+
+
+@dataclass
+class WorkerPoolStatistics:
+    queued: int
+    running: List[str]
+    durations: Dict[str, float]
+
+
+class WorkerPool:
+    """ Dauerhaft laufende Worker-Threads, die Aufgaben mit einem Namen ausführen. Im Gegensatz zum
+    joined_thread_handler werden nicht in jedem Zyklus neue Threads erzeugt. Eine Aufgabe, die nach Ablauf des Timeouts
+    noch läuft, wird wie ein nicht beendeter Thread behandelt: sie wird nicht erneut gestartet, solange sie aktiv ist.
+    Aufgaben, die bis zum Timeout noch nicht gestartet wurden, werden abgebrochen.
+    Während der Ausführung erhält der Worker-Thread den Namen der Aufgabe, da die Log-Filter den Thread-Namen auswerten.
+    """
+
+    def __init__(self, name: str, max_workers: int = 50) -> None:
+        self.name = name
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self.lock = Lock()
+        # Name -> Future, solange die Aufgabe wartet oder läuft
+        self.active: Dict[str, Future] = {}
+        self.started: Dict[str, float] = {}
+        self.durations: Dict[str, float] = {}
+
+    def run(self, tasks: List[Task], timeout: Optional[float]) -> List[str]:
+        """ führt die Aufgaben parallel aus und wartet maximal timeout Sekunden. Gibt die Namen der Aufgaben zurück,
+        die nicht abgeschlossen wurden."""
+        not_finished_tasks = []
+        futures: Dict[str, Future] = {}
+        for task in tasks:
+            with self.lock:
+                if task.name in self.active or task.name in futures:
+                    log.error(f"{task.name} ist bereits aktiv und wird nicht erneut gestartet.")
+                    not_finished_tasks.append(task.name)
+                    continue
+                future = self.executor.submit(self._execute, task)
+                self.active[task.name] = future
+                futures[task.name] = future
+        if futures:
+            wait(futures.values(), timeout)
+        for name, future in futures.items():
+            if future.cancel():
+                with self.lock:
+                    self.active.pop(name, None)
+                log.error(f"{name} wurde innerhalb des Timeouts nicht gestartet, da alle Worker belegt sind.")
+            elif future.done() is False:
+                log.error(f"{name} konnte nicht innerhalb des Timeouts abgearbeitet werden.")
+            else:
+                continue
+            not_finished_tasks.append(name)
+        return not_finished_tasks
+
+    def _execute(self, task: Task) -> None:
+        thread = current_thread()
+        worker_name = thread.name
+        thread.name = task.name
+        start = time.monotonic()
+        with self.lock:
+            self.started[task.name] = start
+        try:
+            task.target(*task.args)
+        except Exception:
+            log.exception(f"Fehler in {task.name}")
+        finally:
+            with self.lock:
+                self.durations[task.name] = time.monotonic() - start
+                self.started.pop(task.name, None)
+                self.active.pop(task.name, None)
+            thread.name = worker_name
+
+    def is_active(self, name: str) -> bool:
+        """ prüft, ob die Aufgabe noch wartet oder läuft."""
+        with self.lock:
+            return name in self.active
+
+    def get_statistics(self) -> WorkerPoolStatistics:
+        with self.lock:
+            return WorkerPoolStatistics(queued=len(self.active) - len(self.started),
+                                        running=list(self.started),
+                                        durations=dict(self.durations))
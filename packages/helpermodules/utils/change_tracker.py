@@ -0,0 +1,66 @@
+import copy
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class ChangeTracker:
+    """ zählt für jede Instanz, die per MQTT empfangen wird, eine Version hoch, wenn sie geändert wurde. Ist kein Key
+    angegeben, gilt die Änderung für alle Instanzen der Kategorie.
+    """
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.counter = 0
+        self.versions: Dict[Tuple[str, Optional[str]], int] = {}
+
+    def mark_changed(self, category: str, key: Optional[str] = None) -> None:
+        with self.lock:
+            self.counter += 1
+            self.versions[(category, key)] = self.counter
+
+    def get_version(self, category: str, key: Optional[str] = None) -> int:
+        with self.lock:
+            version = self.versions.get((category, None), 0)
+            if key is not None:
+                version = max(version, self.versions.get((category, key), 0))
+            return version
+
+
+class SnapshotCache:
+    """ speichert die Kopien einer Instanz zusammen mit der Version, zu der sie erstellt wurden. Solange sich die
+    Version im ChangeTracker nicht ändert, wird die bereits erstellte Kopie zurückgegeben.
+    Die Kopien werden vom Aufrufer verändert, daher dürfen sie nur wiederverwendet werden, solange der Aufrufer die
+    Kopien nicht verändert (zB während des Auslesens der Module). Außerhalb dieses Zeitraums wird immer kopiert.
+    """
+
+    def __init__(self, change_tracker: ChangeTracker) -> None:
+        self.change_tracker = change_tracker
+        self.active = False
+        self.snapshots: Dict[Tuple[str, Optional[str]], Tuple[int, Any]] = {}
+        self.copied = 0
+        self.reused = 0
+
+    def start(self) -> None:
+        self.snapshots.clear()
+        self.copied = 0
+        self.reused = 0
+        self.active = True
+
+    def stop(self) -> None:
+        self.active = False
+        self.snapshots.clear()
+
+    def get(self, category: str, key: Optional[str], source: Any, copy_func: Callable[[Any], Any] = copy.deepcopy):
+        # Die Version muss vor dem Kopieren ermittelt werden. Wird die Instanz während des Kopierens geändert, ist die
+        # Version beim nächsten Aufruf höher und die Instanz wird erneut kopiert.
+        version = self.change_tracker.get_version(category, key)
+        if self.active:
+            snapshot = self.snapshots.get((category, key))
+            if snapshot is not None and snapshot[0] == version:
+                self.reused += 1
+                return snapshot[1]
+        copied = copy_func(source)
+        self.copied += 1
+        if self.active:
+            self.snapshots[(category, key)] = (version, copied)
+        return copied
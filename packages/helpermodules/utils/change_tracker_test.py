@@ -0,0 +1,76 @@
+from unittest.mock import Mock
+
+import pytest
+
+from helpermodules.subdata import SubData
+from helpermodules.utils.change_tracker import ChangeTracker, SnapshotCache
+
+
+def test_snapshot_cache_reuses_unchanged_instances():
+    # setup
+    tracker = ChangeTracker()
+    cache = SnapshotCache(tracker)
+    source = {"value": 1}
+    cache.start()
+
+    # execution
+    first = cache.get("counter_data", "counter0", source)
+    second = cache.get("counter_data", "counter0", source)
+    tracker.mark_changed("counter_data", "counter0")
+    third = cache.get("counter_data", "counter0", source)
+
+    # evaluation
+    assert first is second
+    assert first is not source
+    assert third is not first
+    assert cache.copied == 2 and cache.reused == 1
+
+
+def test_snapshot_cache_category_change_invalidates_all_keys():
+    # setup
+    tracker = ChangeTracker()
+    cache = SnapshotCache(tracker)
+    cache.start()
+    first = cache.get("counter_data", "counter0", {"value": 1})
+
+    # execution
+    tracker.mark_changed("counter_data")
+    second = cache.get("counter_data", "counter0", {"value": 1})
+
+    # evaluation
+    assert first is not second
+
+
+def test_snapshot_cache_inactive_always_copies():
+    # setup
+    cache = SnapshotCache(ChangeTracker())
+    source = {"value": 1}
+
+    # execution
+    first = cache.get("counter_data", "counter0", source)
+    second = cache.get("counter_data", "counter0", source)
+
+    # evaluation
+    assert first is not second
+
+
+@pytest.mark.parametrize("topic, expected_version_key", [
+    pytest.param("openWB/chargepoint/3/get/power", ("cp_data", "cp3"), id="Ladepunkt"),
+    pytest.param("openWB/chargepoint/get/power", ("cp_all_data", None), id="alle Ladepunkte"),
+    pytest.param("openWB/chargepoint/template/1", ("cp_template_data", None), id="Ladepunkt-Vorlage"),
+    pytest.param("openWB/counter/12/get/power", ("counter_data", "counter12"), id="Zähler"),
+    pytest.param("openWB/counter/get/hierarchy", ("counter_all_data", None), id="Hierarchie"),
+    pytest.param("openWB/vehicle/template/ev_template/0", ("ev_template_data", None), id="Fahrzeug-Vorlage"),
+    pytest.param("openWB/vehicle/2/get/soc", ("ev_data", "ev2"), id="Fahrzeug"),
+])
+def test_track_change(topic: str, expected_version_key, monkeypatch):
+    # setup
+    tracker = ChangeTracker()
+    monkeypatch.setattr(SubData, "change_tracker", tracker)
+    subdata = SubData(*([Mock()]*16))
+
+    # execution
+    subdata.track_change(topic)
+
+    # evaluation
+    assert list(tracker.versions.keys()) == [expected_version_key]
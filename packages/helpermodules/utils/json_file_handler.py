@@ -1,49 +1,76 @@
+import gzip
 import json
 import logging
 import os
 import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Union
 
 log = logging.getLogger(__name__)
 
+GZIP_MAGIC = b"\x1f\x8b"
 
-def write_and_check(file_path, content):
-    """
-    Schreibt den Inhalt in die Datei und überprüft, ob der Inhalt erfolgreich geschrieben wurde.
-    Falls nicht, wird die Sicherung wiederhergestellt und der Schreibvorgang einmalig erneut durchgeführt.
-    Schlägt der Schreibvorgang wieder fehl, wird die Sicherung wiederhergestellt.
-    """
-    def _write_and_check():
-        with open(file_path, 'w', encoding="utf-8") as file:
-            json.dump(content, file)
-        with open(file_path, 'r', encoding="utf-8") as file:
-            written_content = json.load(file)
-            if content != written_content:
-                raise ValueError("Der geschriebene Inhalt stimmt nicht mit dem erwarteten Inhalt überein.")
-
-    def restore_backup():
-        shutil.copyfile(backup_path, file_path)
-        log.debug("Sicherung erfolgreich wiederhergestellt.")
-
-    def handle_broken_file():
-        restore_backup()
-        try:
-            _write_and_check()
-        except Exception:
-            log.exception("Fehler beim Wiederherstellen und erneuten Schreiben der Datei. "
-                          "Wiederherstellen der Sicherung.")
-            restore_backup()
 
+def write_atomic(file_path: Union[str, Path], content: Any, compress: bool = False) -> None:
+    """ Schreibt den Inhalt als JSON in eine temporäre Datei im selben Ordner, schreibt sie auf den Datenträger (fsync)
+    und ersetzt anschließend die Datei. Bei einem Absturz oder Stromausfall enthält die Datei daher entweder den alten
+    oder den neuen Inhalt, aber nie einen Teil davon.
+    compress: Inhalt gzip-komprimiert speichern, zum Lesen muss read_json verwendet werden.
+    """
+    file_path = str(file_path)
+    data = json.dumps(content, separators=(",", ":")).encode("utf-8")
+    if compress:
+        data = gzip.compress(data, mtime=0)
+    # eindeutiger Name, damit sich gleichzeitige Schreibvorgänge nicht gegenseitig die temporäre Datei überschreiben
+    fd, temp_path = tempfile.mkstemp(prefix=f"{os.path.basename(file_path)}.", suffix=".tmp",
+                                     dir=os.path.dirname(os.path.abspath(file_path)))
     try:
-        backup_path = file_path + '.bak'
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
         if os.path.exists(file_path):
-            shutil.copyfile(file_path, backup_path)
-            _write_and_check()
+            shutil.copymode(file_path, temp_path)
         else:
-            with open(file_path, 'w', encoding="utf-8") as file:
-                json.dump(content, file)
+            # mkstemp legt die Datei nur für den Besitzer lesbar an, neue Dateien erhalten die bisherigen Rechte
+            os.chmod(temp_path, 0o644)
+        os.replace(temp_path, file_path)
     except Exception:
-        log.exception("Fehler beim Schreiben der Datei. Wiederherstellen der Sicherung.")
-        handle_broken_file()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    # Umbenennen auf den Datenträger schreiben
+    directory = os.open(os.path.dirname(os.path.abspath(file_path)), os.O_RDONLY)
+    try:
+        os.fsync(directory)
     finally:
-        if os.path.exists(backup_path):
-            os.remove(backup_path)
+        os.close(directory)
+
+
+def read_json(file_path: Union[str, Path]) -> Any:
+    """ liest eine mit write_atomic geschriebene Datei, auch gzip-komprimiert."""
+    with open(file_path, "rb") as file:
+        data = file.read()
+    if data[:2] == GZIP_MAGIC:
+        data = gzip.decompress(data)
+    return json.loads(data)
+
+
+def write_and_check(file_path, content) -> bool:
+    """
+    Schreibt den Inhalt atomar in die Datei (siehe write_atomic). Schlägt der Schreibvorgang fehl, wird er einmalig
+    erneut durchgeführt. Schlägt er wieder fehl, bleibt der bisherige Inhalt der Datei erhalten.
+    Rückgabe: True, wenn der Inhalt geschrieben wurde, sonst False.
+    """
+    try:
+        write_atomic(file_path, content)
+        return True
+    except Exception:
+        log.exception(f"Fehler beim Schreiben der Datei {file_path}. Erneuter Versuch.")
+    try:
+        write_atomic(file_path, content)
+        return True
+    except Exception:
+        log.exception(f"Fehler beim erneuten Schreiben der Datei {file_path}. Der bisherige Inhalt bleibt erhalten.")
+        return False
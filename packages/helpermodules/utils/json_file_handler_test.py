@@ -1,34 +1,107 @@
 import json
 import os
-import tempfile
+import threading
+from pathlib import Path
 from unittest.mock import Mock
 
 from helpermodules.utils import json_file_handler
-from helpermodules.utils.json_file_handler import write_and_check
+from helpermodules.utils.json_file_handler import read_json, write_and_check, write_atomic
 
 import pytest
 
 
-@pytest.mark.parametrize("load_return, expected_content", [
-    ([{"new_key": "new_value"}], {"new_key": "new_value"}),
-    ([ValueError("Ungültige Daten"), {"new_key": "new_value"}], {"new_key": "new_value"}),
-    ([ValueError("Ungültige Daten"), ValueError("Ungültige Daten")], {"key": "value"})
-])
-def test_backup_restore_and_corrupt_data_handling(load_return, expected_content, monkeypatch):
-    mock_json_load = Mock(side_effect=load_return)
-    monkeypatch.setattr(json_file_handler.json, "load", mock_json_load)
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-        file_path = temp_file.name
-    try:
-        with open(file_path, 'w') as file:
-            json.dump({"key": "value"}, file)
-        write_and_check(file_path, {"new_key": "new_value"})
-        with open(file_path, 'r') as file:
-            # mocked auch hier json.load, obwohl monkeypatch für json_file_handler.json.load
-            restored_content = json.loads(file.read())
-            assert restored_content == expected_content
-    finally:
-        # Lösche die temporären Dateien
-        os.remove(file_path)
-        if os.path.exists(file_path + ".bak"):
-            os.remove(file_path + ".bak")
+def test_write_and_check(tmp_path: Path):
+    # setup
+    file_path = str(tmp_path / "file.json")
+    with open(file_path, 'w') as file:
+        json.dump({"key": "value"}, file)
+
+    # execution
+    written = write_and_check(file_path, {"new_key": "new_value"})
+
+    # evaluation
+    assert written is True
+    with open(file_path, 'r') as file:
+        assert json.load(file) == {"new_key": "new_value"}
+    assert os.listdir(tmp_path) == ["file.json"]
+
+
+def test_write_and_check_retries(tmp_path: Path, monkeypatch):
+    # setup
+    file_path = str(tmp_path / "file.json")
+    original_replace = os.replace
+    calls = []
+
+    def replace(src, dst):
+        calls.append(src)
+        if len(calls) == 1:
+            raise OSError("Stromausfall")
+        original_replace(src, dst)
+    monkeypatch.setattr(json_file_handler.os, "replace", replace)
+
+    # execution
+    written = write_and_check(file_path, {"new_key": "new_value"})
+
+    # evaluation
+    assert written is True
+    assert len(calls) == 2
+    with open(file_path, 'r') as file:
+        assert json.load(file) == {"new_key": "new_value"}
+    assert os.listdir(tmp_path) == ["file.json"]
+
+
+@pytest.mark.parametrize("failing", ["fsync", "replace"])
+def test_failed_write_keeps_previous_content(failing: str, tmp_path: Path, monkeypatch):
+    # setup
+    file_path = str(tmp_path / "file.json")
+    with open(file_path, 'w') as file:
+        json.dump({"key": "value"}, file)
+    monkeypatch.setattr(json_file_handler.os, failing, Mock(side_effect=OSError("Stromausfall")))
+
+    # execution
+    written = write_and_check(file_path, {"new_key": "new_value"})
+
+    # evaluation
+    assert written is False
+    with open(file_path, 'r') as file:
+        assert json.load(file) == {"key": "value"}
+    assert os.listdir(tmp_path) == ["file.json"]
+
+
+def test_write_atomic_concurrent(tmp_path: Path):
+    # setup
+    file_path = tmp_path / "file.json"
+    contents = [{"writer": i, "data": list(range(1000))} for i in range(8)]
+    errors = []
+
+    def write(content):
+        try:
+            for _ in range(20):
+                write_atomic(file_path, content)
+        except Exception as e:
+            errors.append(e)
+
+    # execution
+    threads = [threading.Thread(target=write, args=(content,)) for content in contents]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # evaluation
+    assert errors == []
+    assert read_json(file_path) in contents
+    assert os.listdir(tmp_path) == ["file.json"]
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_read_json(compress: bool, tmp_path: Path):
+    # setup
+    content = {"entries": [{"timestamp": i, "cp": {"all": {"imported": i * 100}}} for i in range(100)]}
+
+    # execution
+    write_atomic(tmp_path / "file.json", content, compress)
+
+    # evaluation
+    assert read_json(tmp_path / "file.json") == content
+    assert ((tmp_path / "file.json").stat().st_size < len(json.dumps(content, separators=(",", ":")))) is compress
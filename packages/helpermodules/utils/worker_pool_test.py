@@ -0,0 +1,53 @@
+from threading import Event, current_thread
+
+from helpermodules.utils._worker_pool import Task, WorkerPool
+
+
+def test_run():
+    # setup
+    pool = WorkerPool("test")
+    thread_names = {}
+
+    def store_thread_name(key: str):
+        thread_names[key] = current_thread().name
+
+    # execution
+    not_finished_tasks = pool.run([Task("device1", store_thread_name, ("device1",)),
+                                   Task("device2", store_thread_name, ("device2",))], 5)
+
+    # evaluation
+    assert not_finished_tasks == []
+    assert thread_names == {"device1": "device1", "device2": "device2"}
+    assert set(pool.get_statistics().durations) == {"device1", "device2"}
+
+
+def test_run_timeout():
+    # setup
+    pool = WorkerPool("test")
+    event_release = Event()
+    try:
+        # execution
+        not_finished_first_run = pool.run([Task("device1", event_release.wait), Task("device2", lambda: None)], 0.1)
+        not_finished_second_run = pool.run([Task("device1", event_release.wait)], 0.1)
+
+        # evaluation
+        assert not_finished_first_run == ["device1"]
+        assert not_finished_second_run == ["device1"]
+        assert pool.get_statistics().running == ["device1"]
+    finally:
+        event_release.set()
+
+
+def test_run_cancels_queued_tasks():
+    # setup
+    pool = WorkerPool("test", max_workers=1)
+    event_release = Event()
+    try:
+        # execution
+        not_finished_tasks = pool.run([Task("device1", event_release.wait), Task("device2", lambda: None)], 0.1)
+
+        # evaluation
+        assert not_finished_tasks == ["device1", "device2"]
+        assert pool.get_statistics().queued == 0
+    finally:
+        event_release.set()
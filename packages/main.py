@@ -23,14 +23,18 @@ from control.chargelog.chargelog import calc_energy_costs, calculate_charged_ene
 
 from control import data, prepare, process
 from control.algorithm import algorithm
+from control.control_trigger import control_trigger
 from helpermodules import command, setdata, subdata, timecheck, update_config
+from helpermodules.broker_cache import broker_cache
 from helpermodules.changed_values_handler import ChangedValuesContext
 from helpermodules.mosquitto_dynsec.mosquitto_dynsec import check_roles_at_start
+from helpermodules.measurement_logging.process_log import update_log_cache, update_monthly_summary
 from helpermodules.measurement_logging.update_yields import update_daily_yields, update_pv_monthly_yearly_yields
 from helpermodules.measurement_logging.write_log import LogType, save_log
 from helpermodules.modbusserver import start_modbus_server
 from helpermodules.pub import Pub
 from modules import configuration, loadvars, update_soc
+from modules.common.modbus_connection_pool import modbus_connection_pool
 from modules.internal_chargepoint_handler.internal_chargepoint_handler import GeneralInternalChargepointHandler
 from modules.internal_chargepoint_handler.gpio import InternalGpioHandler
 from modules.internal_chargepoint_handler.rfid import RfidReader
@@ -129,17 +133,25 @@ class HandlerAlgorithm:
 
     # decorator can not be used here as it would block logging before handler_with_control_interval()
     # @__with_handler_lock(error_threshold=30)
-    def handler10Sec(self):
-        """ führt den Algorithmus durch.
+    def handler10Sec(self, triggered: bool = False):
+        """ führt den Algorithmus durch. Bei triggered=True wurde der Zyklus im ereignisgesteuerten Modus vorzeitig
+        ausgelöst und wird unabhängig vom Regelintervall ausgeführt.
         """
         try:
             def handler_with_control_interval():
-                if (data.data.general_data.data.control_interval / 10) == self.interval_counter:
-                    data.data.copy_data()
-                    loadvars_.get_values()
-                    wait_for_module_update_completed(loadvars_.event_module_update_completed,
-                                                     "openWB/set/system/device/module_update_completed")
-                    data.data.copy_data()
+                if (data.data.general_data.data.control_interval / 10) == self.interval_counter or triggered:
+                    # Während des Auslesens werden die Daten nicht verändert, daher müssen nur die geänderten
+                    # Instanzen erneut kopiert werden.
+                    data.data.start_incremental_copy()
+                    try:
+                        data.data.copy_data()
+                        loadvars_.get_values()
+                        wait_for_module_update_completed(loadvars_.event_module_update_completed,
+                                                         "openWB/set/system/device/module_update_completed")
+                        data.data.copy_data()
+                    finally:
+                        data.data.stop_incremental_copy()
+                    self._start_control_trigger_cycle()
                     with ChangedValuesContext(loadvars_.event_module_update_completed):
                         self.heartbeat = True
                         if data.data.system_data["system"].data["perform_update"]:
@@ -173,6 +185,14 @@ class HandlerAlgorithm:
         except Exception:
             log.exception("Fehler im Main-Modul")
 
+    def _start_control_trigger_cycle(self):
+        try:
+            evu_counter = data.data.counter_all_data.get_id_evu_counter()
+            grid_power = data.data.counter_data[f"counter{evu_counter}"].data.get.power
+        except Exception:
+            evu_counter, grid_power = None, None
+        control_trigger.cycle_started(data.data.general_data.data.event_driven_control, evu_counter, grid_power)
+
     @__with_handler_lock(error_threshold=60)
     def handler5MinAlgorithm(self):
         """ Handler, der alle 5 Minuten aufgerufen wird und die Heartbeats der Threads überprüft und die Aufgaben
@@ -180,8 +200,9 @@ class HandlerAlgorithm:
         """
         try:
             with ChangedValuesContext(loadvars_.event_module_update_completed):
-                totals = save_log(LogType.DAILY)
-                update_daily_yields(totals)
+                content = save_log(LogType.DAILY)
+                update_log_cache(LogType.DAILY, content)
+                update_daily_yields(content["entries"] if content else None)
                 update_pv_monthly_yearly_yields()
                 for cp in data.data.cp_data.values():
                     calc_energy_costs(cp)
@@ -224,13 +245,16 @@ class HandlerAlgorithm:
                 else:
                     general_internal_chargepoint_handler.internal_chargepoint_handler.heartbeat = False
             sub.system_data["system"].update_ip_address()
+            modbus_connection_pool.log_statistics()
         except Exception:
             log.exception("Fehler im Main-Modul")
 
     @__with_handler_lock(error_threshold=60)
     def handler_midnight(self):
         try:
-            save_log(LogType.MONTHLY)
+            content = save_log(LogType.MONTHLY)
+            update_log_cache(LogType.MONTHLY, content)
+            update_monthly_summary(content)
             thread_errors_path = Path(Path(__file__).resolve().parents[1]/"ramdisk"/"thread_errors.log")
             with thread_errors_path.open("w") as f:
                 f.write("")
@@ -290,6 +314,8 @@ try:
     proc = process.Process()
     control = algorithm.Algorithm()
     handler = HandlerAlgorithm()
+    # gepushte Zählerwerte der MQTT-Geräte können einen vorzeitigen Regelzyklus auslösen
+    broker_cache.add_listener(control_trigger.check_pushed_value)
     prep = prepare.Prepare()
     general_internal_chargepoint_handler = GeneralInternalChargepointHandler()
     rfid = RfidReader()
@@ -367,6 +393,8 @@ while True:
         elif event_jobs_running.is_set() is False and len(schedule.get_jobs("algorithm")) > 0:
             schedule.clear("algorithm")
         schedule.run_pending()
+        if event_jobs_running.is_set() and control_trigger.cycle_due():
+            handler.handler10Sec(triggered=True)
         time.sleep(1)
     except Exception:
         log.exception("Fehler im Main-Modul")
@@ -15,6 +15,10 @@ class AbstractDevice:
     def update(self) -> None:
         pass
 
+    def close(self) -> None:
+        """ gibt die Verbindungen frei, wenn das Gerät entfernt oder neu konfiguriert wird."""
+        pass
+
 
 class AbstractBat:
     @abstractmethod
@@ -15,6 +15,7 @@ class VehicleUpdateData:
     last_soc_timestamp: Optional[int] = None
     last_soc: float = None
     average_consump: int = None
+    use_soc_estimate: bool = False
 
 
 @dataclass
@@ -29,3 +30,8 @@ class GeneralVehicleConfig:
 class CalculatedSocState:
     last_imported: Optional[float] = 0  # don't show in UI
     manual_soc: Optional[int] = None  # don't show in UI
+    # letzte Online-Abfrage als Ausgangspunkt für die Schätzung des SoC, siehe soc_estimator
+    api_soc: Optional[float] = None  # don't show in UI
+    api_soc_imported: Optional[float] = None  # don't show in UI
+    api_soc_timestamp: Optional[float] = None  # don't show in UI
+    efficiency_correction: float = 1  # don't show in UI
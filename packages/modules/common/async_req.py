@@ -0,0 +1,87 @@
+"""Asynchrone HTTP-Abfragen für Geräte-Module
+
+Geräte, die ihre Werte per HTTP abfragen, können über AsyncPrefetch die Abfrage in einer gemeinsamen asyncio-Ereignis-
+schleife ausführen. Loadvars startet zu Beginn des Auslesens die Abfragen aller dieser Geräte gleichzeitig, sodass die
+Dauer des Auslesens von der langsamsten Abfrage abhängt. Die Abfragen teilen sich eine aiohttp-Session, die die
+Verbindungen offen hält (keep-alive) und die Anzahl gleichzeitiger Verbindungen je Host begrenzt.
+Wird das Gerät ohne vorherigen Start der Abfrage aktualisiert (zB beim Aufruf über die Kommandozeile), wird die
+synchrone Abfrage verwendet.
+"""
+import asyncio
+from concurrent.futures import Future
+import json
+import logging
+from threading import Lock, Thread
+from typing import Any, Awaitable, Callable, Generic, Optional, TypeVar
+
+import aiohttp
+
+log = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 5
+LIMIT_PER_HOST = 2
+KEEPALIVE_TIMEOUT = 60
+
+T = TypeVar("T")
+
+
+class AsyncHttpRuntime:
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self.lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                Thread(target=self.loop.run_forever, name="async http", daemon=True).start()
+            return self.loop
+
+    def submit(self, coroutine: Awaitable[T]) -> "Future[T]":
+        return asyncio.run_coroutine_threadsafe(coroutine, self._get_loop())
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        # wird nur in der Ereignis-Schleife aufgerufen, daher ist kein Lock erforderlich
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=LIMIT_PER_HOST, keepalive_timeout=KEEPALIVE_TIMEOUT),
+                raise_for_status=True)
+        return self.session
+
+
+async_http_runtime = AsyncHttpRuntime()
+
+
+async def get_text(url: str, timeout: float = DEFAULT_TIMEOUT, **kwargs) -> str:
+    session = await async_http_runtime.get_session()
+    async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout), **kwargs) as response:
+        text = await response.text()
+        log.debug("Get-Response: " + text)
+        return text
+
+
+async def get_json(url: str, timeout: float = DEFAULT_TIMEOUT, **kwargs) -> Any:
+    return json.loads(await get_text(url, timeout, **kwargs))
+
+
+class AsyncPrefetch(Generic[T]):
+    def __init__(self, fetcher: Callable[[], Awaitable[T]]) -> None:
+        self.fetcher = fetcher
+        self.future: Optional["Future[T]"] = None
+        self.timeout: Optional[float] = None
+
+    def start(self, timeout: float) -> None:
+        """ startet die Abfrage in der Ereignis-Schleife, ohne auf das Ergebnis zu warten."""
+        self.timeout = timeout
+        self.future = async_http_runtime.submit(asyncio.wait_for(self.fetcher(), timeout))
+
+    def get(self, fallback: Callable[[], T]) -> T:
+        """ liefert das Ergebnis der gestarteten Abfrage. Wurde keine Abfrage gestartet, wird fallback aufgerufen."""
+        future, self.future = self.future, None
+        if future is None:
+            return fallback()
+        try:
+            return future.result(self.timeout)
+        finally:
+            future.cancel()
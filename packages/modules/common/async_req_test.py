@@ -0,0 +1,49 @@
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from modules.common.async_req import AsyncPrefetch
+
+
+def test_prefetch_not_started():
+    # setup
+    fallback = Mock(return_value={"power": 1})
+    prefetch = AsyncPrefetch(Mock())
+
+    # execution
+    result = prefetch.get(fallback)
+
+    # evaluation
+    assert result == {"power": 1}
+    prefetch.fetcher.assert_not_called()
+
+
+def test_prefetch_runs_concurrently():
+    # setup
+    async def fetch(value):
+        await asyncio.sleep(0.3)
+        return value
+    prefetches = [AsyncPrefetch(lambda value=value: fetch(value)) for value in range(5)]
+    fallback = Mock()
+
+    # execution
+    for prefetch in prefetches:
+        prefetch.start(1)
+    results = [prefetch.get(fallback) for prefetch in prefetches]
+
+    # evaluation
+    assert results == list(range(5))
+    fallback.assert_not_called()
+
+
+def test_prefetch_timeout():
+    # setup
+    prefetch = AsyncPrefetch(lambda: asyncio.sleep(5))
+
+    # execution
+    prefetch.start(0.1)
+
+    # evaluation
+    with pytest.raises(asyncio.TimeoutError):
+        prefetch.get(Mock())
@@ -6,8 +6,10 @@ from dataclass_utils import dataclass_from_dict
 from helpermodules import timecheck
 from helpermodules.pub import Pub
 from modules.common.abstract_device import AbstractBat, AbstractDevice
+from modules.common.async_req import AsyncPrefetch
 from modules.common.component_context import SingleComponentUpdateContext, MultiComponentUpdateContext
 from modules.common.fault_state import ComponentInfo, FaultState
+from modules.common.modbus import ModbusClient
 
 T_DEVICE_CONFIG = TypeVar("T_DEVICE_CONFIG")
 T_COMPONENT = TypeVar("T_COMPONENT")
@@ -76,12 +78,15 @@ class ConfigurableDevice(Generic[T_COMPONENT, T_DEVICE_CONFIG, T_COMPONENT_CONFI
                  component_factory: ComponentFactory[Any, T_COMPONENT],
                  component_updater: ComponentUpdater[T_COMPONENT],
                  initializer: Callable = lambda: None,
-                 error_handler: Callable = lambda: None) -> None:
+                 error_handler: Callable = lambda: None,
+                 prefetch: Optional[AsyncPrefetch] = None) -> None:
         self.__initializer = initializer
         self.__error_handler = error_handler
         self.__component_factory = component_factory
         self.__component_updater = component_updater
         self.device_config = device_config
+        # Geräte mit HTTP-Abfrage, deren Abfrage von Loadvars vorab asynchron gestartet wird
+        self.prefetch = prefetch
         self.components: Dict[str, T_COMPONENT] = {}
         self.error_timestamp = None
         try:
@@ -115,6 +120,17 @@ class ConfigurableDevice(Generic[T_COMPONENT, T_DEVICE_CONFIG, T_COMPONENT_CONFI
             component.initialize()
             component.initialized = True
 
+    def close(self) -> None:
+        """ gibt die Modbus-Clients der Komponenten frei, damit der ModbusConnectionPool die Verbindung schließen
+        kann."""
+        clients = {id(value): value for component in self.components.values()
+                   for value in getattr(component, "kwargs", {}).values() if isinstance(value, ModbusClient)}
+        for client in clients.values():
+            try:
+                client.close()
+            except Exception:
+                log.exception(f"Fehler beim Schließen der Verbindung von Gerät {self.device_config.name}")
+
     def update(self):
         initialized_components = []
         for component in self.components.values():
@@ -12,6 +12,7 @@ from modules.common.component_context import SingleComponentUpdateContext
 from modules.common.component_state import CarState
 from modules.common.fault_state import ComponentInfo, FaultState
 from modules.vehicles.common.calc_vehicle_data import calc_vehicle_data
+from modules.vehicles.common.soc_estimator import soc_estimator
 from modules.vehicles.manual.config import ManualSoc
 from modules.vehicles.mqtt.config import MqttSocSetup
 
@@ -26,6 +27,7 @@ class SocSource(Enum):
     CP = "chargepoint"
     MANUAL = "manual"
     CALCULATION = "calculation"
+    ESTIMATION = "estimation"
     NO_UPDATE = "no_update"
 
 
@@ -35,6 +37,7 @@ class ConfigurableVehicle(Generic[T_VEHICLE_CONFIG]):
                  component_updater: Callable[[VehicleUpdateData], CarState],
                  vehicle: int,
                  calc_while_charging: bool = False,
+                 estimate_soc: bool = False,
                  general_config: Optional[GeneralVehicleConfig] = None,
                  calculated_soc_state: Optional[CalculatedSocState] = None,
                  initializer: Callable = lambda: None) -> None:
@@ -52,6 +55,9 @@ class ConfigurableVehicle(Generic[T_VEHICLE_CONFIG]):
         else:
             self.general_config = general_config
         self.calc_while_charging = calc_while_charging
+        # SoC zwischen den Abfragen schätzen, nur für Module, die eine Cloud des Herstellers abfragen. Werte aus lokalen
+        # Quellen oder per MQTT/HTTP gesendete Werte werden immer übernommen.
+        self.estimate_soc = estimate_soc
         self.vehicle = vehicle
         self.store = store.get_car_value_store(self.vehicle)
         self.fault_state = FaultState(ComponentInfo(self.vehicle, self.vehicle_config.name, "vehicle"))
@@ -116,6 +122,9 @@ class ConfigurableVehicle(Generic[T_VEHICLE_CONFIG]):
                 if vehicle_update_data.charge_state and self.calc_while_charging:
                     # Wenn während dem Laden berechnet werden soll und gerade geladen wird, berechnen.
                     return SocSource.CALCULATION
+                elif self.estimate_soc and vehicle_update_data.use_soc_estimate:
+                    # Schätzung ist genau genug, Fahrzeug nicht online abfragen.
+                    return SocSource.ESTIMATION
                 else:
                     return SocSource.API
         else:
@@ -150,6 +159,9 @@ class ConfigurableVehicle(Generic[T_VEHICLE_CONFIG]):
                                                                         self.calculated_soc_state.last_imported or
                                                                         vehicle_update_data.imported)
                         _carState.odometer = _odometer
+                    elif self.estimate_soc:
+                        soc_estimator.update_state(self.calculated_soc_state, vehicle_update_data,
+                                                   _carState.soc, _carState.soc_timestamp)
             except Exception as e:
                 if vehicle_update_data.plug_state and\
                    vehicle_update_data.last_soc and\
@@ -180,6 +192,15 @@ class ConfigurableVehicle(Generic[T_VEHICLE_CONFIG]):
                                                             self.calculated_soc_state.last_imported or
                                                             vehicle_update_data.imported)
             return _carState
+        elif source == SocSource.ESTIMATION:
+            estimate = soc_estimator.estimate_soc(vehicle_update_data, self.calculated_soc_state)
+            if estimate is None:
+                raise ValueError("Soc estimation selected, but no soc estimate available.")
+            _range = None
+            if vehicle_update_data.average_consump:
+                _range = int(vehicle_update_data.battery_capacity * estimate.soc /
+                             vehicle_update_data.average_consump)
+            return CarState(soc=estimate.soc, range=_range)
         elif source == SocSource.CP:
             return CarState(soc=vehicle_update_data.soc_from_cp,
                             soc_timestamp=vehicle_update_data.timestamp_soc_from_cp)
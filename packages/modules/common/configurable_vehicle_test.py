@@ -62,6 +62,19 @@ def conf_vehicle_api():
                                calculated_soc_state=calculated_soc_state)
 
 
+def conf_vehicle_api_estimate():
+    component_updater_mock = Mock(return_value=CarState(soc=42))
+    general_config = GeneralVehicleConfig(use_soc_from_cp=False)
+    calculated_soc_state = CalculatedSocState()
+    return ConfigurableVehicle(vehicle_config=Tesla(),
+                               component_updater=component_updater_mock,
+                               vehicle=0,
+                               calc_while_charging=False,
+                               estimate_soc=True,
+                               general_config=general_config,
+                               calculated_soc_state=calculated_soc_state)
+
+
 def conf_vehicle_api_while_charging():
     component_updater_mock = Mock(return_value=CarState(soc=42))
     general_config = GeneralVehicleConfig(use_soc_from_cp=False)
@@ -106,6 +119,10 @@ def conf_vehicle_mqtt():
                      CalculatedSocState(), SocSource.CALCULATION,
                      id="Manuell mit SoC vom LP, LP-SoC berechnen"),
         pytest.param(conf_vehicle_api(), True, VehicleUpdateData(), CalculatedSocState(), SocSource.API, id="API"),
+        pytest.param(conf_vehicle_api_estimate(), False, VehicleUpdateData(plug_state=True, use_soc_estimate=True),
+                     CalculatedSocState(), SocSource.ESTIMATION, id="API, Schätzung ausreichend"),
+        pytest.param(conf_vehicle_api(), False, VehicleUpdateData(plug_state=True, use_soc_estimate=True),
+                     CalculatedSocState(), SocSource.API, id="API ohne Schätzung"),
         pytest.param(conf_vehicle_api_from_cp(), True, VehicleUpdateData(
             soc_from_cp=45, timestamp_soc_from_cp=TIMESTAMP_SOC_VALID), CalculatedSocState(), SocSource.CP,
             id="API mit SoC vom LP, neuer LP-SoC"),
@@ -121,6 +138,9 @@ def conf_vehicle_mqtt():
                      charge_state=True), CalculatedSocState(), SocSource.CALCULATION, id="API mit Berechnung, Ladung"),
         pytest.param(conf_vehicle_mqtt(), False, VehicleUpdateData(plug_state=True),
                      CalculatedSocState(), SocSource.API, id="MQTT-Werte werden vom Broker abgerufen"),
+        pytest.param(conf_vehicle_mqtt(), False, VehicleUpdateData(plug_state=True, use_soc_estimate=True),
+                     CalculatedSocState(api_soc=50, api_soc_imported=0, api_soc_timestamp=1),
+                     SocSource.API, id="MQTT-Werte werden nicht geschätzt"),
     ])
 def test_get_carstate_source(conf_vehicle: ConfigurableVehicle,
                              use_soc_from_cp,
@@ -181,6 +201,37 @@ def test_update_api(vehicle_update_data,
     assert c.calculated_soc_state == expected_calculated_soc_state
 
 
+def test_update_api_estimate(monkeypatch):
+    # setup
+    mock_value_store = Mock(name="value_store")
+    monkeypatch.setattr(store, "get_car_value_store", Mock(return_value=mock_value_store))
+    c = conf_vehicle_api_estimate()
+    car_state = c._ConfigurableVehicle__component_updater.return_value
+
+    # execution
+    c.update(VehicleUpdateData(imported=200, plug_state=True, average_consump=18))
+
+    # evaluation
+    assert mock_value_store.set.call_args[0][0].soc == 42
+    assert c.calculated_soc_state == CalculatedSocState(last_imported=200, api_soc=42, api_soc_imported=200,
+                                                        api_soc_timestamp=car_state.soc_timestamp)
+
+
+def test_update_mqtt_pushed_soc(monkeypatch):
+    # setup
+    mock_value_store = Mock(name="value_store")
+    monkeypatch.setattr(store, "get_car_value_store", Mock(return_value=mock_value_store))
+    c = conf_vehicle_mqtt()
+    c._ConfigurableVehicle__component_updater.return_value = CarState(soc=55)
+    c.calculated_soc_state = CalculatedSocState(api_soc=50, api_soc_imported=0, api_soc_timestamp=1)
+
+    # execution
+    c.update(VehicleUpdateData(imported=200, plug_state=True, use_soc_estimate=True, average_consump=18))
+
+    # evaluation
+    assert mock_value_store.set.call_args[0][0].soc == 55
+
+
 def test_1(monkeypatch):
     # Eintragen -> Anstecken -> aktueller SoC von EV -> SoC von Ev hochrechnen
     # setup
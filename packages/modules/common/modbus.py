@@ -4,11 +4,13 @@
 Das Modul baut eine Modbus-TCP-Verbindung auf. Es gibt verschiedene Funktionen, um die gelesenen Register zu
 formatieren.
 """
+from contextlib import contextmanager
 import logging
 import struct
 from enum import Enum
+from functools import lru_cache
 import time
-from typing import Any, Callable, Iterable, Optional, Union, overload, List
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Tuple, Union, overload, List
 
 import pymodbus
 from pymodbus.client.sync import ModbusTcpClient, ModbusUdpClient, ModbusSerialClient
@@ -17,6 +19,8 @@ from pymodbus.payload import BinaryPayloadBuilder, BinaryPayloadDecoder
 from pymodbus.transaction import ModbusSocketFramer
 from urllib3.util import parse_url
 
+from modules.common.modbus_connection_pool import ModbusEndpoint, modbus_connection_pool
+
 log = logging.getLogger(__name__)
 
 
@@ -40,6 +44,8 @@ class ModbusDataType(Enum):
 
 
 _MODBUS_HOLDING_REGISTER_SIZE = 16
+# maximale Anzahl Register, die mit einer Anfrage gelesen werden können (Modbus-Spezifikation)
+MAX_REGISTERS_PER_READ = 125
 Number = Union[int, float]
 
 NO_CONNECTION = ("Modbus-Client konnte keine Verbindung zu {}:{} aufbauen. Bitte "
@@ -48,6 +54,135 @@ NO_VALUES = ("TCP-Client {}:{} konnte keinen Wert abfragen. Falls vorhanden, par
              "beenden und bei anhaltender Fehlermeldung Zähler neu starten.")
 
 
+def _divide_rounding_up(numerator: int, denominator: int) -> int:
+    return -(-numerator // denominator)
+
+
+def _number_of_registers(types: Iterable[ModbusDataType]) -> int:
+    return sum(_divide_rounding_up(t.bits, _MODBUS_HOLDING_REGISTER_SIZE) for t in types)
+
+
+_STRUCT_FORMAT = {
+    ModbusDataType.UINT_16: "H",
+    ModbusDataType.UINT_32: "I",
+    ModbusDataType.UINT_64: "Q",
+    ModbusDataType.INT_16: "h",
+    ModbusDataType.INT_32: "i",
+    ModbusDataType.INT_64: "q",
+    ModbusDataType.FLOAT_16: "e",
+    ModbusDataType.FLOAT_32: "f",
+    ModbusDataType.FLOAT_64: "d",
+}
+
+
+class RegisterDecoder:
+    """ Dekodiert die Register für eine feste Folge von Datentypen mit einem vorab erzeugten struct.Struct.
+
+    Die Register werden mit der Byte-Reihenfolge in Bytes gewandelt, bei vertauschter Wort-Reihenfolge vorher je Wert
+    umsortiert. Anschließend werden alle Werte mit einem einzigen unpack_from ausgelesen. Das Ergebnis entspricht dem
+    des BinaryPayloadDecoder.
+    """
+
+    def __init__(self, types: Tuple[ModbusDataType, ...], byteorder: Endian, wordorder: Endian) -> None:
+        self.number_of_registers = _number_of_registers(types)
+        self.register_struct = struct.Struct(
+            f"{'<' if byteorder == Endian.Little else '>'}{self.number_of_registers}H")
+        self.value_struct = struct.Struct(">" + "".join(_STRUCT_FORMAT[t] for t in types))
+        self.permutation: Optional[Tuple[int, ...]] = None
+        if wordorder == Endian.Little:
+            permutation: List[int] = []
+            for t in types:
+                words = _divide_rounding_up(t.bits, _MODBUS_HOLDING_REGISTER_SIZE)
+                permutation.extend(reversed(range(len(permutation), len(permutation) + words)))
+            self.permutation = tuple(permutation)
+
+    def decode(self, registers: List[int], offset: int = 0) -> Tuple[Number, ...]:
+        if self.permutation is not None:
+            registers = [registers[offset + i] for i in self.permutation]
+        elif offset != 0 or len(registers) != self.number_of_registers:
+            registers = registers[offset:offset + self.number_of_registers]
+        return self.value_struct.unpack_from(self.register_struct.pack(*registers))
+
+
+@lru_cache(maxsize=1024)
+def get_register_decoder(types: Tuple[ModbusDataType, ...], byteorder: Endian, wordorder: Endian) -> RegisterDecoder:
+    return RegisterDecoder(types, byteorder, wordorder)
+
+
+def decode_registers(registers: List[int],
+                     types: Iterable[ModbusDataType],
+                     byteorder: Endian = Endian.Big,
+                     wordorder: Endian = Endian.Big,
+                     offset: int = 0) -> List[Number]:
+    types = tuple(types)
+    if all(t in _STRUCT_FORMAT for t in types):
+        return list(get_register_decoder(types, byteorder, wordorder).decode(registers, offset))
+    # 8-Bit-Werte belegen im BinaryPayloadDecoder nur ein Byte und nicht ein ganzes Register.
+    decoder = BinaryPayloadDecoder.fromRegisters(registers, byteorder, wordorder)
+    decoder.skip_bytes(offset * 2)
+    return [getattr(decoder, t.decoding_method)() for t in types]
+
+
+class RegisterEntry(NamedTuple):
+    address: int
+    types: Union[ModbusDataType, Tuple[ModbusDataType, ...]]
+    byteorder: Endian = Endian.Big
+    wordorder: Endian = Endian.Big
+
+    @property
+    def number_of_registers(self) -> int:
+        return _number_of_registers(self.types if isinstance(self.types, tuple) else (self.types,))
+
+
+class RegisterBlock(NamedTuple):
+    start_address: int
+    count: int
+    entries: Tuple[RegisterEntry, ...]
+
+
+class ModbusReadPlan:
+    """ Fasst die Register einer Komponente zu möglichst wenigen Anfragen zusammen.
+
+    mapping: Liste von Tupeln (Register, ModbusDataType oder Liste von ModbusDataType[, byteorder[, wordorder]])
+    max_gap: Anzahl nicht benötigter Register, die zwischen zwei Einträgen mitgelesen werden dürfen. Manche Geräte
+    melden einen Fehler, wenn nicht belegte Register gelesen werden, daher werden standardmäßig nur direkt
+    aufeinanderfolgende Register zusammengefasst.
+    max_registers: maximale Anzahl Register je Anfrage, manche Geräte unterstützen weniger als 125 Register.
+    """
+
+    def __init__(self, mapping: Iterable[tuple], max_gap: int = 0, max_registers: int = MAX_REGISTERS_PER_READ):
+        if not 0 < max_registers <= MAX_REGISTERS_PER_READ:
+            raise ValueError(f"max_registers muss zwischen 1 und {MAX_REGISTERS_PER_READ} liegen.")
+        entries = []
+        for entry in mapping:
+            address, types, *endian = entry
+            if isinstance(types, Iterable):
+                types = tuple(types)
+            entries.append(RegisterEntry(int(address), types, *endian))
+        self.blocks = self._plan(sorted(entries, key=lambda e: e.address), max_gap, max_registers)
+
+    @staticmethod
+    def _plan(entries: List[RegisterEntry], max_gap: int, max_registers: int) -> Tuple[RegisterBlock, ...]:
+        blocks = []
+        block_entries: List[RegisterEntry] = []
+        start = end = 0
+        for entry in entries:
+            entry_end = entry.address + entry.number_of_registers
+            if entry.number_of_registers > max_registers:
+                raise ValueError(f"Register {entry.address} ist größer als {max_registers} Register.")
+            if block_entries and (entry.address - end > max_gap or max(end, entry_end) - start > max_registers):
+                blocks.append(RegisterBlock(start, end - start, tuple(block_entries)))
+                block_entries = []
+            if not block_entries:
+                start = entry.address
+                end = entry_end
+            block_entries.append(entry)
+            end = max(end, entry_end)
+        if block_entries:
+            blocks.append(RegisterBlock(start, end - start, tuple(block_entries)))
+        return tuple(blocks)
+
+
 class ModbusClient:
     def __init__(self,
                  delegate: Union[ModbusSerialClient, ModbusTcpClient, ModbusUdpClient],
@@ -57,30 +192,87 @@ class ModbusClient:
         self.address = address
         self.port = port
         self.sleep_after_connect = sleep_after_connect
+        # Verbindung aus dem ModbusConnectionPool
+        self._endpoint: Optional[ModbusEndpoint] = None
+        # Verbindung des Endpunkts am Ende des with-Blocks nicht schließen
+        self.keep_alive = False
+        self._referenced = False
 
     def __enter__(self):
         try:
-            self._delegate.__enter__()
-            time.sleep(self.sleep_after_connect)
+            if self._endpoint is None:
+                self._delegate.__enter__()
+                time.sleep(self.sleep_after_connect)
+            else:
+                modbus_connection_pool.close_idle_connections()
+                self._add_reference()
+                # Der Endpunkt bleibt bis __exit__ für andere Geräte gesperrt.
+                self._endpoint.acquire()
+                try:
+                    self._endpoint.connect(self.sleep_after_connect)
+                except Exception:
+                    self._endpoint.release()
+                    raise
         except pymodbus.exceptions.ConnectionException as e:
             e.args += (NO_CONNECTION.format(self.address, self.port),)
             raise e
         return self
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
-        self._delegate.__exit__(exc_type, exc_value, exc_traceback)
+        if self._endpoint is None:
+            self._delegate.__exit__(exc_type, exc_value, exc_traceback)
+        else:
+            try:
+                if self.keep_alive is False:
+                    self._endpoint.close_connection()
+            finally:
+                self._endpoint.release()
 
     def connect(self) -> None:
-        self._delegate.connect()
-        time.sleep(self.sleep_after_connect)
+        if self._endpoint is None:
+            self._delegate.connect()
+            time.sleep(self.sleep_after_connect)
+        else:
+            self._add_reference()
+            self._endpoint.acquire()
+            try:
+                self._endpoint.connect(self.sleep_after_connect)
+            finally:
+                self._endpoint.release()
+
+    def _add_reference(self) -> None:
+        if self._referenced is False:
+            self._referenced = True
+            self._endpoint.add_reference()
+
+    @contextmanager
+    def _request(self):
+        if self._endpoint is None:
+            yield
+        else:
+            with self._endpoint.request():
+                yield
 
     def close(self) -> None:
         try:
             log.debug("Close Modbus TCP connection")
-            self._delegate.close()
+            if self._endpoint is None:
+                self._delegate.close()
+            elif self._referenced:
+                self._referenced = False
+                self._endpoint.release_reference()
         except Exception as e:
             raise Exception(__name__+" "+str(type(e))+" " + str(e)) from e
 
+    def _close_after_error(self) -> None:
+        if self._endpoint is None:
+            self.close()
+        else:
+            try:
+                self._endpoint.reset()
+            except Exception as e:
+                raise Exception(__name__+" "+str(type(e))+" " + str(e)) from e
+
     def is_socket_open(self) -> bool:
         return self._delegate.is_socket_open()
 
@@ -97,29 +289,24 @@ class ModbusClient:
             if not multi_request:
                 types = [types]
 
-            def divide_rounding_up(numerator: int, denominator: int):
-                return -(-numerator // denominator)
-
-            number_of_addresses = sum(divide_rounding_up(
-                t.bits, _MODBUS_HOLDING_REGISTER_SIZE) for t in types)
-            response = read_register_method(
-                address, number_of_addresses, **kwargs)
+            number_of_addresses = _number_of_registers(types)
+            with self._request():
+                response = read_register_method(
+                    address, number_of_addresses, **kwargs)
             if response.isError():
                 raise Exception(__name__+" "+str(response))
-            decoder = BinaryPayloadDecoder.fromRegisters(response.registers, byteorder, wordorder)
-            result = [struct.unpack(">e", struct.pack(">H", decoder.decode_16bit_uint())) if t ==
-                      ModbusDataType.FLOAT_16 else getattr(decoder, t.decoding_method)() for t in types]
+            result = decode_registers(response.registers, types, byteorder, wordorder)
             return result if multi_request else result[0]
         except pymodbus.exceptions.ConnectionException as e:
-            self.close()
+            self._close_after_error()
             e.args += (NO_CONNECTION.format(self.address, self.port),)
             raise e
         except pymodbus.exceptions.ModbusIOException as e:
-            self.close()
+            self._close_after_error()
             e.args += (NO_VALUES.format(self.address, self.port),)
             raise e
         except Exception as e:
-            self.close()
+            self._close_after_error()
             raise Exception(__name__+" "+str(type(e))+" " + str(e)) from e
 
     @overload
@@ -176,7 +363,8 @@ class ModbusClient:
 
     def read_coils(self, address: int, count: int, **kwargs):
         try:
-            response = self._delegate.read_coils(address, count, **kwargs)
+            with self._request():
+                response = self._delegate.read_coils(address, count, **kwargs)
             if response.isError():
                 raise Exception(__name__+" "+str(response))
             return response.bits[0] if count == 1 else response.bits[:count]
@@ -211,16 +399,20 @@ class ModbusClient:
                                                     ModbusDataType.FLOAT_32,
                                                     ModbusDataType.FLOAT_64]:
                 registers = self._build_binary_payload(value, data_type, byteorder, wordorder)
-                self._delegate.write_registers(address, registers, **kwargs)
+                with self._request():
+                    self._delegate.write_registers(address, registers, **kwargs)
             else:
                 # Einfache 16-bit oder kleinere Werte können direkt geschrieben werden
-                self._delegate.write_registers(address, [value], **kwargs)
+                with self._request():
+                    self._delegate.write_registers(address, [value], **kwargs)
         else:
             # Fallback für bestehenden Code ohne data_type
-            self._delegate.write_registers(address, value, **kwargs)
+            with self._request():
+                self._delegate.write_registers(address, value, **kwargs)
 
     def write_single_coil(self, address: int, value: Any, **kwargs):
-        self._delegate.write_coil(address, value, **kwargs)
+        with self._request():
+            self._delegate.write_coil(address, value, **kwargs)
 
     def __read_bulk(self,
                     read_register_method: Callable,
@@ -235,34 +427,70 @@ class ModbusClient:
         if self.is_socket_open() is False:
             self.connect()
         try:
-            response = read_register_method(start_address, count, **kwargs)
+            with self._request():
+                response = read_register_method(start_address, count, **kwargs)
             if response.isError():
                 raise Exception(__name__+" "+str(response))
-            decoder = BinaryPayloadDecoder.fromRegisters(response.registers, byteorder, wordorder)
             results = {}
             for register_address, data_type in mapping:
                 multiple_register_requested = isinstance(data_type, Iterable)
                 if not multiple_register_requested:
                     data_type = [data_type]
-                offset = register_address - start_address
-                decoder.reset()
-                decoder.skip_bytes(offset * 2)
-                val = [struct.unpack(">e", struct.pack(">H", decoder.decode_16bit_uint())) if t ==
-                       ModbusDataType.FLOAT_16 else getattr(decoder, t.decoding_method)() for t in data_type]
+                val = decode_registers(response.registers, data_type, byteorder, wordorder,
+                                       register_address - start_address)
                 results[register_address] = val if multiple_register_requested else val[0]
             return results
         except pymodbus.exceptions.ConnectionException as e:
-            self.close()
+            self._close_after_error()
             e.args += (NO_CONNECTION.format(self.address, self.port),)
             raise e
         except pymodbus.exceptions.ModbusIOException as e:
-            self.close()
+            self._close_after_error()
             e.args += (NO_VALUES.format(self.address, self.port),)
             raise e
         except Exception as e:
-            self.close()
+            self._close_after_error()
             raise Exception(__name__+" "+str(type(e))+" " + str(e)) from e
 
+    def __read_planned(self, read_register_method: Callable, plan: ModbusReadPlan, **kwargs) -> Dict[int, Any]:
+        """
+        Liest alle Register des ModbusReadPlan mit möglichst wenigen Anfragen und gibt ein dict mit dem Register als
+        Key und dem dekodierten Wert als Value zurück.
+        """
+        if self.is_socket_open() is False:
+            self.connect()
+        try:
+            results = {}
+            for block in plan.blocks:
+                with self._request():
+                    response = read_register_method(block.start_address, block.count, **kwargs)
+                if response.isError():
+                    raise Exception(__name__+" "+str(response))
+                for entry in block.entries:
+                    multiple_register_requested = isinstance(entry.types, tuple)
+                    val = decode_registers(response.registers,
+                                           entry.types if multiple_register_requested else (entry.types,),
+                                           entry.byteorder, entry.wordorder, entry.address - block.start_address)
+                    results[entry.address] = val if multiple_register_requested else val[0]
+            return results
+        except pymodbus.exceptions.ConnectionException as e:
+            self._close_after_error()
+            e.args += (NO_CONNECTION.format(self.address, self.port),)
+            raise e
+        except pymodbus.exceptions.ModbusIOException as e:
+            self._close_after_error()
+            e.args += (NO_VALUES.format(self.address, self.port),)
+            raise e
+        except Exception as e:
+            self._close_after_error()
+            raise Exception(__name__+" "+str(type(e))+" " + str(e)) from e
+
+    def read_input_registers_planned(self, plan: ModbusReadPlan, **kwargs) -> Dict[int, Any]:
+        return self.__read_planned(self._delegate.read_input_registers, plan, **kwargs)
+
+    def read_holding_registers_planned(self, plan: ModbusReadPlan, **kwargs) -> Dict[int, Any]:
+        return self.__read_planned(self._delegate.read_holding_registers, plan, **kwargs)
+
     def read_input_registers_bulk(self,
                                   start_address: int,
                                   count: int,
@@ -300,12 +528,19 @@ class ModbusTcpClient_(ModbusClient):
                  port: int = 502,
                  sleep_after_connect: Optional[int] = 0,
                  framer: type[ModbusSocketFramer] = ModbusSocketFramer,
+                 keep_alive: bool = False,
                  **kwargs):
+        """ keep_alive: Verbindung über mehrere Regelzyklen offen halten. Nur für Geräte, die mehrere Clients
+        zulassen."""
         parsed_url = parse_url(address)
         host = parsed_url.host
         if parsed_url.port is not None:
             port = parsed_url.port
-        super().__init__(ModbusTcpClient(host, port, framer, **kwargs), address, port, sleep_after_connect)
+        endpoint = modbus_connection_pool.get_endpoint(host, port, framer, **kwargs)
+        super().__init__(endpoint.delegate, address, port, sleep_after_connect)
+        self._endpoint = endpoint
+        self.keep_alive = keep_alive
+        self._add_reference()
 
 
 class ModbusUdpClient_(ModbusClient):
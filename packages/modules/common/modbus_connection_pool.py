@@ -0,0 +1,182 @@
+"""Prozessweiter Pool für Modbus-TCP-Verbindungen.
+
+Komponenten verschiedener Geräte, die denselben Host/Port (zB ein Gateway) abfragen, teilen sich eine Verbindung. Der
+Zugriff wird je Endpunkt serialisiert, da viele Gateways nur einen Client gleichzeitig zulassen. Auch das Schließen
+erfolgt unter der Sperre des Endpunkts, damit keine laufende Anfrage eines anderen Geräts unterbrochen wird. Schließt
+ein Client die Verbindung, bleibt sie bestehen, solange andere Clients den Endpunkt verwenden (Referenzzählung).
+Standardmäßig wird die Verbindung am Ende des with-Blocks geschlossen, da viele Gateways keinen weiteren Client
+zulassen. Clients mit keep_alive halten sie über mehrere Regelzyklen offen, sie wird dann erst nach IDLE_TIMEOUT
+Sekunden ohne Zugriff geschlossen. Schlägt der Verbindungsaufbau fehl, wird der nächste Versuch mit steigendem Abstand
+(Backoff) zugelassen. Wird ein Gerät entfernt oder neu konfiguriert, geben seine Clients ihre Referenz frei.
+"""
+from contextlib import contextmanager
+from dataclasses import dataclass
+import logging
+from threading import Lock, RLock
+import time
+from typing import Dict, Iterator, Optional, Tuple
+
+from pymodbus.client.sync import ModbusTcpClient
+from pymodbus.exceptions import ConnectionException
+
+log = logging.getLogger(__name__)
+
+# Sekunden ohne Zugriff, nach denen die Verbindung geschlossen wird
+IDLE_TIMEOUT = 60
+# maximale Wartezeit auf den Zugriff, wenn der Endpunkt von einem anderen Gerät verwendet wird
+LOCK_TIMEOUT = 10
+BACKOFF_BASE = 1
+BACKOFF_MAX = 60
+
+
+@dataclass
+class EndpointStatistics:
+    requests: int = 0
+    errors: int = 0
+    connects: int = 0
+    failed_connects: int = 0
+    total_latency: float = 0
+    last_latency: float = 0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.requests if self.requests else 0
+
+
+class ModbusEndpoint:
+    def __init__(self, name: str, delegate: ModbusTcpClient) -> None:
+        self.name = name
+        self.delegate = delegate
+        self.lock = RLock()
+        # Anzahl der Clients, die den Endpunkt verwenden
+        self.references = 0
+        self.last_used = time.monotonic()
+        self.consecutive_failed_connects = 0
+        self.next_connect_attempt = 0.0
+        self.statistics = EndpointStatistics()
+
+    def acquire(self) -> None:
+        if self.lock.acquire(timeout=LOCK_TIMEOUT) is False:
+            raise ConnectionException(f"Modbus-Verbindung zu {self.name} wird seit {LOCK_TIMEOUT}s von einem anderen "
+                                      "Gerät verwendet.")
+
+    def release(self) -> None:
+        self.last_used = time.monotonic()
+        self.lock.release()
+
+    def connect(self, sleep_after_connect: Optional[float] = 0) -> None:
+        """ baut die Verbindung auf, falls sie noch nicht besteht. Nach einem fehlgeschlagenen Verbindungsaufbau wird
+        erst nach Ablauf des Backoffs ein neuer Versuch unternommen."""
+        if self.delegate.is_socket_open():
+            return
+        now = time.monotonic()
+        if now < self.next_connect_attempt:
+            raise ConnectionException(f"Verbindungsaufbau zu {self.name} fehlgeschlagen, nächster Versuch in "
+                                      f"{self.next_connect_attempt - now:.0f}s.")
+        self.statistics.connects += 1
+        if self.delegate.connect():
+            self.consecutive_failed_connects = 0
+            self.next_connect_attempt = 0
+            if sleep_after_connect:
+                time.sleep(sleep_after_connect)
+        else:
+            self.consecutive_failed_connects += 1
+            self.statistics.failed_connects += 1
+            self.next_connect_attempt = now + min(BACKOFF_BASE * 2 ** (self.consecutive_failed_connects - 1),
+                                                  BACKOFF_MAX)
+            raise ConnectionException(f"Verbindungsaufbau zu {self.name} fehlgeschlagen.")
+
+    @contextmanager
+    def request(self) -> Iterator[None]:
+        """ serialisiert eine einzelne Anfrage und erfasst Laufzeit und Fehler."""
+        self.acquire()
+        start = time.monotonic()
+        try:
+            yield
+        except Exception:
+            self.statistics.errors += 1
+            raise
+        finally:
+            self.statistics.last_latency = time.monotonic() - start
+            self.statistics.total_latency += self.statistics.last_latency
+            self.statistics.requests += 1
+            self.release()
+
+    def add_reference(self) -> None:
+        with self.lock:
+            self.references += 1
+
+    def release_reference(self) -> None:
+        """ gibt den Endpunkt für einen Client frei und schließt die Verbindung, wenn kein anderer Client ihn
+        verwendet."""
+        self.acquire()
+        try:
+            self.references = max(self.references - 1, 0)
+            if self.references == 0:
+                self.close_connection()
+        finally:
+            self.release()
+
+    def reset(self) -> None:
+        """ schließt die Verbindung nach einem Fehler, der nächste Zugriff baut sie neu auf."""
+        self.acquire()
+        try:
+            self.close_connection()
+        finally:
+            self.release()
+
+    def close_connection(self) -> None:
+        # Aufruf nur mit gesperrtem Endpunkt
+        if self.delegate.is_socket_open():
+            log.debug(f"Schließe Modbus-Verbindung zu {self.name}")
+            self.delegate.close()
+
+    def close_if_idle(self, now: float) -> bool:
+        if now - self.last_used < IDLE_TIMEOUT or self.lock.acquire(blocking=False) is False:
+            return False
+        try:
+            if self.delegate.is_socket_open():
+                log.debug(f"Schließe ungenutzte Modbus-Verbindung zu {self.name}")
+                self.delegate.close()
+                return True
+            return False
+        finally:
+            self.lock.release()
+
+
+class ModbusConnectionPool:
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.endpoints: Dict[Tuple, ModbusEndpoint] = {}
+
+    def get_endpoint(self, host: str, port: int, framer, **kwargs) -> ModbusEndpoint:
+        key = (host, port, framer, tuple(sorted(kwargs.items())))
+        with self.lock:
+            endpoint = self.endpoints.get(key)
+            if endpoint is None:
+                endpoint = ModbusEndpoint(f"{host}:{port}", ModbusTcpClient(host, port, framer, **kwargs))
+                self.endpoints[key] = endpoint
+            return endpoint
+
+    def close_idle_connections(self) -> None:
+        now = time.monotonic()
+        with self.lock:
+            endpoints = list(self.endpoints.values())
+        for endpoint in endpoints:
+            try:
+                endpoint.close_if_idle(now)
+            except Exception:
+                log.exception(f"Fehler beim Schließen der Modbus-Verbindung zu {endpoint.name}")
+
+    def get_statistics(self) -> Dict[str, EndpointStatistics]:
+        with self.lock:
+            return {endpoint.name: endpoint.statistics for endpoint in self.endpoints.values()}
+
+    def log_statistics(self) -> None:
+        for name, statistics in self.get_statistics().items():
+            log.debug(f"Modbus-Verbindung {name}: {statistics.requests} Anfragen, {statistics.errors} Fehler, "
+                      f"{statistics.connects} Verbindungsaufbauten ({statistics.failed_connects} fehlgeschlagen), "
+                      f"mittlere Latenz {statistics.mean_latency * 1000:.0f}ms")
+
+
+modbus_connection_pool = ModbusConnectionPool()
@@ -0,0 +1,175 @@
+from threading import Event, Thread
+from unittest.mock import Mock
+
+import pytest
+from pymodbus.exceptions import ConnectionException
+from pymodbus.transaction import ModbusRtuFramer, ModbusSocketFramer
+
+from modules.common import modbus_connection_pool
+from modules.common.configurable_device import ComponentFactoryByType, ConfigurableDevice, IndependentComponentUpdater
+from modules.common.modbus import ModbusDataType, ModbusTcpClient_
+from modules.common.modbus_connection_pool import ModbusConnectionPool, ModbusEndpoint
+
+
+@pytest.fixture(autouse=True)
+def pool(monkeypatch) -> ModbusConnectionPool:
+    pool = ModbusConnectionPool()
+    monkeypatch.setattr(modbus_connection_pool, "ModbusTcpClient", Mock())
+    monkeypatch.setattr("modules.common.modbus.modbus_connection_pool", pool)
+    return pool
+
+
+def test_clients_share_endpoint(pool: ModbusConnectionPool):
+    # execution
+    client1 = ModbusTcpClient_("192.168.0.10", 502)
+    client2 = ModbusTcpClient_("192.168.0.10:502")
+    client3 = ModbusTcpClient_("192.168.0.10", 502, framer=ModbusRtuFramer)
+
+    # evaluation
+    assert client1._endpoint is client2._endpoint
+    assert client1._endpoint is not client3._endpoint
+    assert len(pool.endpoints) == 2
+
+
+def test_connect_backoff(monkeypatch):
+    # setup
+    delegate = Mock(is_socket_open=Mock(return_value=False), connect=Mock(return_value=False))
+    endpoint = ModbusEndpoint("192.168.0.10:502", delegate)
+    monkeypatch.setattr(modbus_connection_pool.time, "monotonic", Mock(return_value=100))
+
+    # execution
+    with pytest.raises(ConnectionException):
+        endpoint.connect()
+    with pytest.raises(ConnectionException):
+        endpoint.connect()
+    monkeypatch.setattr(modbus_connection_pool.time, "monotonic", Mock(return_value=102))
+    with pytest.raises(ConnectionException):
+        endpoint.connect()
+
+    # evaluation
+    assert delegate.connect.call_count == 2
+    assert endpoint.statistics.failed_connects == 2
+    assert endpoint.next_connect_attempt == 104
+
+
+def test_connection_kept_open_and_closed_when_idle(pool: ModbusConnectionPool, monkeypatch):
+    # setup
+    client = ModbusTcpClient_("192.168.0.10", 502, framer=ModbusSocketFramer, keep_alive=True)
+    delegate = client._endpoint.delegate
+    delegate.is_socket_open.return_value = True
+    delegate.read_holding_registers.return_value = Mock(isError=Mock(return_value=False), registers=[5])
+
+    # execution
+    with client:
+        value = client.read_holding_registers(0, ModbusDataType.UINT_16, unit=1)
+
+    # evaluation
+    assert value == 5
+    delegate.close.assert_not_called()
+    assert client._endpoint.statistics.requests == 1
+    client._endpoint.last_used -= modbus_connection_pool.IDLE_TIMEOUT
+    pool.close_idle_connections()
+    delegate.close.assert_called_once()
+
+
+def test_connection_closed_after_with_block(pool: ModbusConnectionPool):
+    # setup
+    client = ModbusTcpClient_("192.168.0.10", 502)
+    delegate = client._endpoint.delegate
+    delegate.is_socket_open.return_value = True
+
+    # execution
+    with client:
+        pass
+
+    # evaluation
+    delegate.close.assert_called_once()
+
+
+def test_close_keeps_connection_of_other_clients(pool: ModbusConnectionPool):
+    # setup
+    client1 = ModbusTcpClient_("192.168.0.10", 502)
+    client2 = ModbusTcpClient_("192.168.0.10", 502)
+    delegate = client1._endpoint.delegate
+    delegate.is_socket_open.return_value = True
+
+    # execution
+    client1.close()
+    client1.close()
+    closed_while_in_use = delegate.close.called
+    client2.close()
+
+    # evaluation
+    assert closed_while_in_use is False
+    delegate.close.assert_called_once()
+
+
+def test_close_waits_for_running_request(pool: ModbusConnectionPool):
+    # setup
+    client1 = ModbusTcpClient_("192.168.0.10", 502)
+    client2 = ModbusTcpClient_("192.168.0.10", 502)
+    delegate = client1._endpoint.delegate
+    delegate.is_socket_open.return_value = True
+    request_started, finish_request = Event(), Event()
+    closed_during_request = []
+
+    def read_holding_registers(*args, **kwargs):
+        request_started.set()
+        finish_request.wait(1)
+        closed_during_request.append(delegate.close.called)
+        return Mock(isError=Mock(return_value=False), registers=[5])
+    delegate.read_holding_registers.side_effect = read_holding_registers
+
+    # execution
+    thread = Thread(target=client2.read_holding_registers, args=(0, ModbusDataType.UINT_16), kwargs={"unit": 1})
+    thread.start()
+    request_started.wait(1)
+    closer = Thread(target=client1._close_after_error)
+    closer.start()
+    # Schließen muss auf das Ende der laufenden Anfrage warten
+    closer.join(0.05)
+    finish_request.set()
+    thread.join()
+    closer.join()
+
+    # evaluation
+    assert closed_during_request == [False]
+    delegate.close.assert_called_once()
+
+
+def test_device_close_releases_references(pool: ModbusConnectionPool):
+    # setup
+    client = ModbusTcpClient_("192.168.0.10", 502)
+    other_client = ModbusTcpClient_("192.168.0.10", 502)
+    delegate = client._endpoint.delegate
+    delegate.is_socket_open.return_value = True
+    device = ConfigurableDevice(device_config=Mock(),
+                                component_factory=ComponentFactoryByType(),
+                                component_updater=IndependentComponentUpdater(lambda component: None))
+    device.components = {"component1": Mock(kwargs={"client": client}),
+                         "component2": Mock(kwargs={"client": client, "device_id": 1})}
+
+    # execution
+    device.close()
+    references = client._endpoint.references
+    other_client.close()
+
+    # evaluation
+    # beide Komponenten verwenden denselben Client, die Referenz wird nur einmal freigegeben
+    assert references == 1
+    assert delegate.close.call_count == 1
+
+
+def test_log_statistics(pool: ModbusConnectionPool, caplog):
+    # setup
+    client = ModbusTcpClient_("192.168.0.10", 502)
+    client._endpoint.statistics.requests = 2
+    client._endpoint.statistics.total_latency = 0.1
+
+    # execution
+    with caplog.at_level("DEBUG"):
+        pool.log_statistics()
+
+    # evaluation
+    assert "Modbus-Verbindung 192.168.0.10:502: 2 Anfragen, 0 Fehler" in caplog.text
+    assert "mittlere Latenz 50ms" in caplog.text
@@ -0,0 +1,65 @@
+from unittest.mock import Mock
+
+import pytest
+
+from modules.common.modbus import (Endian, ModbusClient, ModbusDataType, ModbusReadPlan, RegisterBlock,
+                                   decode_registers)
+
+MAPPING = (
+    (10, ModbusDataType.UINT_16),
+    (0, [ModbusDataType.INT_16]*2),
+    (2, ModbusDataType.FLOAT_32),
+    (200, ModbusDataType.UINT_32, Endian.Big, Endian.Little),
+)
+
+
+@pytest.mark.parametrize("max_gap, max_registers, expected_blocks", [
+    pytest.param(0, 125, [(0, 4), (10, 1), (200, 2)], id="nur direkt aufeinanderfolgende Register"),
+    pytest.param(6, 125, [(0, 11), (200, 2)], id="Lücke wird mitgelesen"),
+    pytest.param(200, 125, [(0, 11), (200, 2)], id="maximale Anzahl Register"),
+    pytest.param(6, 5, [(0, 4), (10, 1), (200, 2)], id="reduzierte maximale Anzahl Register"),
+])
+def test_plan(max_gap: int, max_registers: int, expected_blocks):
+    # execution
+    plan = ModbusReadPlan(MAPPING, max_gap=max_gap, max_registers=max_registers)
+
+    # evaluation
+    assert [(block.start_address, block.count) for block in plan.blocks] == expected_blocks
+    assert all(isinstance(block, RegisterBlock) for block in plan.blocks)
+
+
+def test_read_planned():
+    # setup
+    registers = {0: [0xFFFF, 2, 0x3FC0, 0, 0, 0, 0, 0, 0, 0, 7], 200: [0x0001, 0x0002]}
+    delegate = Mock(is_socket_open=Mock(return_value=True),
+                    read_holding_registers=Mock(side_effect=lambda address, count, **kwargs: Mock(
+                        isError=Mock(return_value=False), registers=registers[address][:count])))
+    client = ModbusClient(delegate, "192.168.0.10")
+
+    # execution
+    resp = client.read_holding_registers_planned(ModbusReadPlan(MAPPING, max_gap=6), unit=1)
+
+    # evaluation
+    assert [c.args for c in delegate.read_holding_registers.call_args_list] == [(0, 11), (200, 2)]
+    assert resp == {0: [-1, 2], 2: 1.5, 10: 7, 200: 0x00020001}
+
+
+@pytest.mark.parametrize("registers, types, byteorder, wordorder, offset, expected", [
+    pytest.param([0x3FC0, 0x0000], [ModbusDataType.FLOAT_32], Endian.Big, Endian.Big, 0, [1.5], id="float32"),
+    pytest.param([0x0000, 0x3FC0], [ModbusDataType.FLOAT_32], Endian.Big, Endian.Little, 0, [1.5],
+                 id="float32 Wörter vertauscht"),
+    pytest.param([0xC03F, 0x0000], [ModbusDataType.FLOAT_32], Endian.Little, Endian.Big, 0, [1.5],
+                 id="float32 Bytes vertauscht"),
+    pytest.param([0x0000, 0xC03F], [ModbusDataType.FLOAT_32], Endian.Little, Endian.Little, 0, [1.5],
+                 id="float32 little endian"),
+    pytest.param([0, 0xFFFF, 0x0001, 0x0002, 0x3C00], [ModbusDataType.INT_16, ModbusDataType.UINT_32,
+                 ModbusDataType.FLOAT_16], Endian.Big, Endian.Big, 1, [-1, 0x00010002, 1.0], id="gemischt mit Offset"),
+    pytest.param([1, 2, 3, 4], [ModbusDataType.UINT_64], Endian.Big, Endian.Little, 0, [0x0004000300020001],
+                 id="uint64 Wörter vertauscht"),
+])
+def test_decode_registers(registers, types, byteorder, wordorder, offset, expected):
+    # execution
+    values = decode_registers(registers, types, byteorder, wordorder, offset)
+
+    # evaluation
+    assert values == expected
@@ -1,4 +1,5 @@
 from helpermodules import compatibility
+from helpermodules.measurement_logging.time_series import add_to_time_series
 from modules.common.component_state import BatState
 from modules.common.store import ValueStore
 from modules.common.store._api import LoggingValueStore
@@ -33,6 +34,7 @@ class BatteryValueStoreBroker(ValueStore[BatState]):
             pub_to_broker("openWB/set/bat/"+str(self.num)+"/get/exported", self.state.exported, 2)
         if self.state.serial_number is not None:
             pub_to_broker("openWB/set/bat/" + str(self.num) + "/get/serial_number", self.state.serial_number)
+        add_to_time_series(f"bat{self.num}", self.state)
 
 
 class PurgeBatteryState:
@@ -4,6 +4,7 @@ from modules.common.store._api import LoggingValueStore
 from modules.common.store._broker import pub_to_broker
 from modules.common.store.ramdisk import files
 from helpermodules import compatibility
+from helpermodules.measurement_logging.time_series import add_to_time_series
 
 
 class ChargepointValueStoreRamdisk(ValueStore[ChargepointState]):
@@ -65,6 +66,7 @@ class ChargepointValueStoreBroker(ValueStore[ChargepointState]):
         pub_to_broker("openWB/set/chargepoint/" + str(self.num) + "/get/current_branch", self.state.current_branch)
         pub_to_broker("openWB/set/chargepoint/" + str(self.num) + "/get/current_commit", self.state.current_commit)
         pub_to_broker("openWB/set/chargepoint/" + str(self.num) + "/get/evse_signaling", self.state.evse_signaling)
+        add_to_time_series(f"cp{self.num}", self.state)
 
 
 def get_chargepoint_value_store(id: int) -> ValueStore[ChargepointState]:
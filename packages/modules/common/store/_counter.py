@@ -4,6 +4,7 @@ from typing import Dict, Optional
 
 from control import data
 from helpermodules import compatibility
+from helpermodules.measurement_logging.time_series import add_to_time_series
 from helpermodules.phase_handling import convert_cp_currents_to_evu_currents
 from modules.common.component_state import CounterState
 from modules.common.component_type import ComponentType
@@ -49,6 +50,7 @@ class CounterValueStoreBroker(ValueStore[CounterState]):
         pub_to_broker("openWB/set/counter/" + str(self.num) + "/get/frequency", self.state.frequency)
         if self.state.serial_number is not None:
             pub_to_broker("openWB/set/counter/" + str(self.num) + "/get/serial_number", self.state.serial_number)
+        add_to_time_series(f"counter{self.num}", self.state)
 
 
 class PurgeCounterState:
@@ -2,6 +2,7 @@ import logging
 
 from control import data
 from helpermodules import compatibility
+from helpermodules.measurement_logging.time_series import add_to_time_series
 from modules.common.component_state import InverterState
 from modules.common.store import ValueStore
 from modules.common.store._api import LoggingValueStore
@@ -40,6 +41,7 @@ class InverterValueStoreBroker(ValueStore[InverterState]):
             pub_to_broker("openWB/set/pv/" + str(self.num) + "/get/currents", self.state.currents, 1)
         if self.state.serial_number is not None:
             pub_to_broker("openWB/set/pv/" + str(self.num) + "/get/serial_number", self.state.serial_number)
+        add_to_time_series(f"pv{self.num}", self.state)
 
 
 class PurgeInverterState:
@@ -20,6 +20,13 @@ sys.modules['pycarwings3'] = type(sys)('pycarwings3')
 
 # sys.modules['telnetlib3'] = type(sys)('telnetlib3')
 
+module = sys.modules['aiohttp']
+module.ClientConnectionError = type("ClientConnectionError", (Exception,), {})
+module.ClientResponseError = type("ClientResponseError", (Exception,), {})
+module.ClientSession = Mock()
+module.ClientTimeout = Mock()
+module.TCPConnector = Mock()
+
 module = type(sys)('pymodbus.client.sync')
 module.ModbusSerialClient = Mock()
 module.ModbusTcpClient = Mock()
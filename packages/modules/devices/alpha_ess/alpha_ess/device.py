@@ -55,7 +55,7 @@ def create_device(device_config: AlphaEss):
     def initializer():
         nonlocal client
         if device_config.configuration.source == 0:
-            client = modbus.ModbusTcpClient_("192.168.193.125", 8899)
+            client = modbus.ModbusTcpClient_("192.168.193.125", 8899, keep_alive=True)
         else:
             client = modbus.ModbusTcpClient_(
                 device_config.configuration.ip_address, device_config.configuration.port)
@@ -5,7 +5,7 @@ from modules.common.abstract_device import AbstractCounter
 from modules.common.component_state import CounterState
 from modules.common.component_type import ComponentDescriptor
 from modules.common.fault_state import ComponentInfo, FaultState
-from modules.common.modbus import ModbusDataType, ModbusTcpClient_
+from modules.common.modbus import ModbusDataType, ModbusReadPlan, ModbusTcpClient_
 from modules.common.store import get_counter_value_store
 from modules.devices.chint.chint.config import CHINTCounterSetup
 from modules.common.utils.peak_filter import PeakFilter
@@ -30,33 +30,37 @@ class CHINTCounter(AbstractCounter):
         self.__modbus_id = self.component_config.configuration.modbus_id
         self.peak_filter = PeakFilter(ComponentType.COUNTER, self.component_config.id, self.fault_state)
 
+    REG_MAPPING = (
+        (0x0006, ModbusDataType.INT_16),
+        (0x0007, ModbusDataType.INT_16),
+        (0x2006, [ModbusDataType.FLOAT_32]*3),
+        (0x200C, [ModbusDataType.FLOAT_32]*3),
+        (0x2012, ModbusDataType.FLOAT_32),
+        (0x2014, [ModbusDataType.FLOAT_32]*3),
+        (0x202C, [ModbusDataType.FLOAT_32]*3),
+        (0x2044, ModbusDataType.FLOAT_32),
+        (0x401E, ModbusDataType.FLOAT_32),
+        (0x4028, ModbusDataType.FLOAT_32),
+    )
+    READ_PLAN = ModbusReadPlan(REG_MAPPING)
+
     def update(self):
-        powers = voltages = currents = power_factors = None
-        imported_ep = exported_ep = power = frequency = 0
-        irat = self.client.read_holding_registers(0x0006, ModbusDataType.INT_16, unit=self.__modbus_id)
-        urat = self.client.read_holding_registers(0x0007, ModbusDataType.INT_16, unit=self.__modbus_id)
+        resp = self.client.read_holding_registers_planned(self.READ_PLAN, unit=self.__modbus_id)
+        irat = resp[0x0006]
+        urat = resp[0x0007]
         power_ratio = urat*0.1*irat*0.1
 
-        frequency = self.client.read_holding_registers(0x2044, ModbusDataType.FLOAT_32, unit=self.__modbus_id)/100
-        power = self.client.read_holding_registers(0x2012,
-                                                   ModbusDataType.FLOAT_32, unit=self.__modbus_id) * power_ratio
-        powers = [self.client.read_holding_registers(reg, ModbusDataType.FLOAT_32, unit=self.__modbus_id) * power_ratio
-                  for reg in [0x2014, 0x2016, 0x2018]]
+        frequency = resp[0x2044]/100
+        power = resp[0x2012] * power_ratio
+        powers = [power * power_ratio for power in resp[0x2014]]
         voltage_ratio = urat*0.1*0.1
-        voltages = [self.client.read_holding_registers(
-            reg, ModbusDataType.FLOAT_32, unit=self.__modbus_id) * voltage_ratio
-            for reg in [0x2006, 0x2008, 0x200A]]
+        voltages = [voltage * voltage_ratio for voltage in resp[0x2006]]
         current_ratio = irat*0.001
-        currents = [self.client.read_holding_registers(
-            reg, ModbusDataType.FLOAT_32, unit=self.__modbus_id) * current_ratio
-            for reg in [0x200C, 0x200E, 0x2010]]
-        power_factors = [self.client.read_holding_registers(reg, ModbusDataType.FLOAT_32, unit=self.__modbus_id) * 0.001
-                         for reg in [0x202C, 0x202E, 0x2030]]
+        currents = [current * current_ratio for current in resp[0x200C]]
+        power_factors = [power_factor * 0.001 for power_factor in resp[0x202C]]
         ep_ratio = irat * urat * 100
-        imported_ep = self.client.read_holding_registers(0x401E,
-                                                         ModbusDataType.FLOAT_32, unit=self.__modbus_id) * ep_ratio
-        exported_ep = self.client.read_holding_registers(0x4028,
-                                                         ModbusDataType.FLOAT_32, unit=self.__modbus_id) * ep_ratio
+        imported_ep = resp[0x401E] * ep_ratio
+        exported_ep = resp[0x4028] * ep_ratio
 
         imported_ep, exported_ep = self.peak_filter.check_values(power, imported_ep, exported_ep)
 
@@ -3,7 +3,7 @@ import logging
 from typing import List, Union, Iterable
 
 from helpermodules.cli import run_using_positional_cli_args
-from modules.common import req
+from modules.common import async_req, req
 from modules.common.abstract_device import DeviceDescriptor
 from modules.common.component_context import SingleComponentUpdateContext
 from modules.common.configurable_device import ConfigurableDevice, ComponentFactoryByType, MultiComponentUpdater
@@ -34,8 +34,10 @@ def create_device(device_config: Json):
     def create_inverter(component_config: JsonInverterSetup) -> JsonInverter:
         return JsonInverter(component_config=component_config, device_id=device_config.id)
 
+    prefetch = async_req.AsyncPrefetch(lambda: async_req.get_json(device_config.configuration.url, timeout=5))
+
     def update_components(components: Iterable[JsonComponent]):
-        response = req.get_http_session().get(device_config.configuration.url, timeout=5).json()
+        response = prefetch.get(lambda: req.get_http_session().get(device_config.configuration.url, timeout=5).json())
         for component in components:
             with SingleComponentUpdateContext(component.fault_state):
                 component.update(response)
@@ -43,7 +45,8 @@ def create_device(device_config: Json):
     return ConfigurableDevice(
         device_config,
         component_factory=ComponentFactoryByType(bat=create_bat, counter=create_counter, inverter=create_inverter),
-        component_updater=MultiComponentUpdater(update_components)
+        component_updater=MultiComponentUpdater(update_components),
+        prefetch=prefetch
     )
 
 
@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
+from typing import Optional
+
 from modules.common.component_setup import ComponentSetup
 from ..vendor import vendor_descriptor
 
 
 class MqttConfiguration:
-    def __init__(self):
-        pass
+    def __init__(self, stale_timeout: Optional[int] = None):
+        # Sekunden, nach denen nicht aktualisierte Topics als veraltet gemeldet werden. None: keine Prüfung, zB für
+        # Geräte, die nur bei Änderungen veröffentlichen.
+        self.stale_timeout = stale_timeout
 
 
 class Mqtt:
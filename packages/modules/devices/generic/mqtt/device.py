@@ -2,8 +2,7 @@
 from typing import Iterable, Union
 import logging
 
-from helpermodules.broker import BrokerClient
-from helpermodules.utils.topic_parser import decode_payload
+from helpermodules.broker_cache import broker_cache
 from modules.common.abstract_device import DeviceDescriptor
 from modules.common.component_context import SingleComponentUpdateContext
 from modules.common.component_type import type_to_topic_mapping
@@ -25,23 +24,26 @@ def create_device(device_config: Mqtt):
         return inverter.MqttInverter(component_config, device_id=device_config.id)
 
     def update_components(components: Iterable[Union[bat.MqttBat, counter.MqttCounter, inverter.MqttInverter]]):
-        def on_connect(client, userdata, flags, rc):
-            for component in components:
-                client.subscribe(f"openWB/mqtt/{type_to_topic_mapping(component.component_config.type)}/"
-                                 f"{component.component_config.id}/#")
-
-        def on_message(client, userdata, message):
-            received_topics.update({message.topic: decode_payload(message.payload)})
+        def topic_prefix(component) -> str:
+            return (f"openWB/mqtt/{type_to_topic_mapping(component.component_config.type)}/"
+                    f"{component.component_config.id}/")
 
         received_topics = {}
-        BrokerClient(f"subscribeMqttDevice{device_config.id}", on_connect, on_message).start_finite_loop()
-
+        for component in components:
+            received_topics.update(broker_cache.get_payloads(topic_prefix(component)))
         if received_topics:
             log.debug(f"Empfange MQTT Daten für Gerät {device_config.id}: {received_topics}")
             for component in components:
                 with SingleComponentUpdateContext(component.fault_state):
                     try:
                         component.update(received_topics)
+                        stale_timeout = device_config.configuration.stale_timeout
+                        if stale_timeout is not None:
+                            stale_topics = broker_cache.get_stale_topics(topic_prefix(component), stale_timeout)
+                            if stale_topics:
+                                component.fault_state.warning(
+                                    f"Die Topics {stale_topics} wurden seit mehr als {stale_timeout} Sekunden "
+                                    "nicht aktualisiert.")
                     except KeyError:
                         raise KeyError(
                             "Fehlende MQTT-Daten: Stelle sicher, dass Du Werte an die erforderlichen Topics "
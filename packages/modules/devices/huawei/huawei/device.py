@@ -54,10 +54,11 @@ def create_device(device_config: Huawei):
     def initializer():
         nonlocal client
         if HuaweiType(device_config.configuration.type) == HuaweiType.SDongle:
+            # Verbindung offen halten, damit die Wartezeit nach dem Verbindungsaufbau nicht in jedem Zyklus anfällt
             client = ModbusTcpClient_(device_config.configuration.ip_address,
-                                      device_config.configuration.port, sleep_after_connect=7)
+                                      device_config.configuration.port, sleep_after_connect=7, keep_alive=True)
         elif HuaweiType(device_config.configuration.type) == HuaweiType.Huawei_Kit:
-            client = ModbusTcpClient_("192.168.193.126", 8899)
+            client = ModbusTcpClient_("192.168.193.126", 8899, keep_alive=True)
         else:
             client = ModbusTcpClient_(device_config.configuration.ip_address,
                                       device_config.configuration.port)
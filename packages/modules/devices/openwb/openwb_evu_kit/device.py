@@ -40,7 +40,7 @@ def create_device(device_config: EvuKitSetup):
 
     def initializer():
         nonlocal client
-        client = modbus.ModbusTcpClient_("192.168.193.15", 8899)
+        client = modbus.ModbusTcpClient_("192.168.193.15", 8899, keep_alive=True)
 
     def error_handler():
         run_command([f"{Path(__file__).resolve().parents[4]}/modules/common/restart_protoss_admin",
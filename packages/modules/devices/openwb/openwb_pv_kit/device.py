@@ -29,7 +29,7 @@ def create_device(device_config: PvKitSetup):
 
     def initializer():
         nonlocal client
-        client = modbus.ModbusTcpClient_("192.168.193.13", 8899)
+        client = modbus.ModbusTcpClient_("192.168.193.13", 8899, keep_alive=True)
 
     def error_handler():
         run_command([f"{Path(__file__).resolve().parents[4]}/modules/common/restart_protoss_admin",
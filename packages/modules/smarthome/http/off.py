@@ -1,17 +1,23 @@
 #!/usr/bin/python3
 import sys
 import logging
+from typing import List
 from urllib.request import Request, urlopen
 from urllib.parse import urlparse
 
 log = logging.getLogger("http")
 
-devicenumber = int(sys.argv[1])
-uberschuss = int(sys.argv[3])
-url = str(sys.argv[4])
-if not urlparse(url).scheme:
-    url = 'http://' + url
-log.info('off devicenr %d url %s' % (devicenumber, url))
-headers = {'User-Agent': 'Mozilla/5.0'}
-request = Request(url, headers=headers)
-urlopen(request, timeout=5).read()
+
+def main(argv: List[str]) -> None:
+    devicenumber = int(argv[1])
+    url = str(argv[4])
+    if not urlparse(url).scheme:
+        url = 'http://' + url
+    log.info('off devicenr %d url %s' % (devicenumber, url))
+    headers = {'User-Agent': 'Mozilla/5.0'}
+    request = Request(url, headers=headers)
+    urlopen(request, timeout=5).read()
+
+
+if __name__ == "__main__":
+    main(sys.argv)
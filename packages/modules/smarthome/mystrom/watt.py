@@ -1,28 +1,28 @@
 #!/usr/bin/python3
 import logging
 import sys
-import time
 import json
 import urllib.request
+from typing import Any, Dict, List
+from smarthome.smartret import writeret
 
 log = logging.getLogger(__name__)
 
-named_tuple = time.localtime()  # getstruct_time
-time_string = time.strftime("%m/%d/%Y, %H:%M:%S mystrom watty.py", named_tuple)
-devicenumber = str(sys.argv[1])
-ipadr = str(sys.argv[2])
-uberschuss = int(sys.argv[3])
-answer = json.loads(str(urllib.request.urlopen("http://"+str(ipadr)+"/report", timeout=3).read().decode("utf-8")))
-aktpower = int(answer['power'])
-relaiss = str(answer['relay'])
-if (relaiss.lower() == "true"):
-    relais = 1
-else:
-    relais = 0
-templong = str(float(answer['temperature']))
-temp = templong[0:5]
-powerc = 0
-answer = '{"power":' + str(aktpower) + ',"powerc":' + str(powerc) + ',"on":' + \
-    str(relais) + ',"temp0":' + str(temp) + '} '
-with open('/var/www/html/openWB/ramdisk/smarthome_device_ret' + str(devicenumber), 'w') as f1:
-    json.dump(answer, f1)
+
+def main(argv: List[str]) -> Dict[str, Any]:
+    ipadr = str(argv[2])
+    answer = json.loads(str(urllib.request.urlopen("http://"+str(ipadr)+"/report", timeout=3).read().decode("utf-8")))
+    aktpower = int(answer['power'])
+    relaiss = str(answer['relay'])
+    if (relaiss.lower() == "true"):
+        relais = 1
+    else:
+        relais = 0
+    templong = str(float(answer['temperature']))
+    temp = templong[0:5]
+    powerc = 0
+    return {"power": aktpower, "powerc": powerc, "on": relais, "temp0": float(temp)}
+
+
+if __name__ == "__main__":
+    writeret(json.dumps(main(sys.argv)), int(sys.argv[1]))
@@ -1,11 +1,13 @@
 #!/usr/bin/python3
 import sys
-import time
 import urllib.request
+from typing import List
 
-named_tuple = time.localtime()  # getstruct_time
-time_string = time.strftime("%m/%d/%Y, %H:%M:%S tasmota off.py", named_tuple)
-devicenumber = str(sys.argv[1])
-ipadr = str(sys.argv[2])
-uberschuss = int(sys.argv[3])
-urllib.request.urlopen("http://"+str(ipadr)+"/cm?cmnd=Power%20off", timeout=3)
+
+def main(argv: List[str]) -> None:
+    ipadr = str(argv[2])
+    urllib.request.urlopen("http://"+str(ipadr)+"/cm?cmnd=Power%20off", timeout=3)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
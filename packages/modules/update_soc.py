@@ -1,5 +1,5 @@
 import logging
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 import copy
 from threading import Event, Thread
 
@@ -11,6 +11,7 @@ from helpermodules.constants import NO_ERROR
 from helpermodules.pub import Pub
 from helpermodules.utils import joined_thread_handler
 from modules.common.abstract_vehicle import VehicleUpdateData
+from modules.vehicles.common.soc_estimator import soc_estimator
 from modules.utils import wait_for_module_update_completed
 from helpermodules.logger import clear_in_memory_log_handler, write_logs_to_file
 
@@ -52,6 +53,7 @@ class UpdateSoc:
                 if ev.soc_module is not None:
                     vehicle_update_data = self._get_vehicle_update_data(ev.num)
                     if (ev.soc_interval_expired(vehicle_update_data) or ev.data.get.force_soc_update):
+                        vehicle_update_data.use_soc_estimate = self._use_soc_estimate(ev, vehicle_update_data)
                         self._reset_force_soc_update(ev)
                         if ev.data.get.fault_state == 2:
                             ev.data.set.soc_error_counter += 1
@@ -98,6 +100,28 @@ class UpdateSoc:
             ev.data.get.force_soc_update = False
             Pub().pub(f"openWB/set/vehicle/{ev.num}/get/force_soc_update", False)
 
+    def _use_soc_estimate(self, ev: Ev, vehicle_update_data: VehicleUpdateData) -> bool:
+        """ Statt der Online-Abfrage wird der SoC geschätzt, solange die Schätzung genau genug ist. Das spart Zeit
+        und vermeidet Sperren des Accounts bei zu häufigen Abfragen."""
+        if (ev.data.get.force_soc_update or vehicle_update_data.plug_state is False or
+                ev.soc_module.estimate_soc is False):
+            return False
+        estimate = soc_estimator.estimate_soc(vehicle_update_data, ev.soc_module.calculated_soc_state)
+        if soc_estimator.api_request_required(estimate, self._get_plan_soc(ev)):
+            return False
+        log.debug(f"EV{ev.num}: SoC wird geschätzt ({estimate.soc}% ± {estimate.uncertainty}%-Punkte), "
+                  "keine Online-Abfrage.")
+        return True
+
+    def _get_plan_soc(self, ev: Ev) -> Optional[float]:
+        # niedrigster Ziel-SoC der aktiven Zielladen-Pläne
+        charge_template = subdata.SubData.ev_charge_template_data.get(f"ct{ev.data.charge_template}")
+        if charge_template is None or charge_template.data.chargemode.selected != "scheduled_charging":
+            return None
+        plan_socs = [plan.limit.soc_scheduled for plan in charge_template.data.chargemode.scheduled_charging.plans
+                     if plan.active and plan.limit.selected == "soc"]
+        return min(plan_socs, default=None)
+
     def _get_vehicle_update_data(self, ev_num: int) -> VehicleUpdateData:
         ev = subdata.SubData.ev_data[f"ev{ev_num}"]
         ev_template = subdata.SubData.ev_template_data[f"et{ev.data.ev_template}"]
@@ -105,6 +129,7 @@ class UpdateSoc:
             cp = cp_state_update.chargepoint
             if cp.data.config.ev == ev_num:
                 plug_state = cp.data.get.plug_state
+                plug_time = cp.data.set.plug_time or 0.0
                 charge_state = cp.data.get.charge_state
                 imported = cp.data.get.imported
                 if ev.soc_module.general_config.use_soc_from_cp:
@@ -116,6 +141,7 @@ class UpdateSoc:
                 break
         else:
             plug_state = False
+            plug_time = 0.0
             charge_state = False
             imported = None
             soc_from_cp = None
@@ -125,6 +151,7 @@ class UpdateSoc:
         average_consump = ev_template.data.average_consump
         soc_timestamp = ev.data.get.soc_timestamp
         return VehicleUpdateData(plug_state=plug_state,
+                                 plug_time=plug_time,
                                  charge_state=charge_state,
                                  efficiency=efficiency,
                                  imported=imported,
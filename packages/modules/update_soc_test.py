@@ -7,12 +7,15 @@ from control import data
 from control.chargepoint.chargepoint import Chargepoint
 from control.chargepoint.chargepoint_data import Get, Log, Set
 from control.chargepoint.chargepoint_state_update import ChargepointStateUpdate
+from control.ev.charge_template import ChargeTemplate
 from control.ev.ev import Ev, EvData
 from control.ev.ev_template import EvTemplate, EvTemplateData
 from control.ev.ev import Get as EvGet
 from control.ev.ev import Set as EvSet
+from helpermodules import timecheck
+from helpermodules.abstract_plans import ScheduledChargingPlan, ScheduledLimit
 from helpermodules.subdata import SubData
-from modules.common.abstract_vehicle import GeneralVehicleConfig, VehicleUpdateData
+from modules.common.abstract_vehicle import CalculatedSocState, GeneralVehicleConfig, VehicleUpdateData
 from modules.common.configurable_vehicle import ConfigurableVehicle
 from modules.vehicles.tesla.soc import create_vehicle
 from modules.update_soc import UpdateSoc
@@ -98,3 +101,38 @@ def test_get_threads(soc_module: Optional[create_vehicle],
         assert threads_update[0].name == expected_threads_update[0]
     else:
         assert threads_update == expected_threads_update
+
+
+@pytest.mark.parametrize(
+    "estimate_soc, force_soc_update, chargemode, expected_use_soc_estimate",
+    [
+        pytest.param(True, False, "instant_charging", True, id="Schätzung genau genug"),
+        pytest.param(False, False, "instant_charging", False, id="Modul ohne Schätzung"),
+        pytest.param(True, True, "instant_charging", False, id="force soc update"),
+        pytest.param(True, False, "scheduled_charging", False, id="Ziel-SoC fast erreicht"),
+    ]
+)
+def test_use_soc_estimate(estimate_soc: bool,
+                          force_soc_update: bool,
+                          chargemode: str,
+                          expected_use_soc_estimate: bool,
+                          monkeypatch):
+    # setup
+    monkeypatch.setattr(timecheck, "create_timestamp", Mock(return_value=1700000000))
+    ev = Ev(0)
+    ev.soc_module = Mock(spec=ConfigurableVehicle, estimate_soc=estimate_soc, calculated_soc_state=CalculatedSocState(
+        api_soc=60, api_soc_imported=10000, api_soc_timestamp=1700000000 - 600))
+    ev.data.get.force_soc_update = force_soc_update
+    charge_template = ChargeTemplate()
+    charge_template.data.chargemode.selected = chargemode
+    charge_template.data.chargemode.scheduled_charging.plans = [
+        ScheduledChargingPlan(limit=ScheduledLimit(selected="soc", soc_scheduled=75))]
+    SubData.ev_charge_template_data["ct0"] = charge_template
+    vehicle_update_data = VehicleUpdateData(plug_state=True, plug_time=1700000000 - 3600, imported=20000,
+                                            battery_capacity=82000, efficiency=90)
+
+    # execution
+    use_soc_estimate = UpdateSoc(Mock())._use_soc_estimate(ev, vehicle_update_data)
+
+    # evaluation
+    assert use_soc_estimate == expected_use_soc_estimate
@@ -41,7 +41,8 @@ def create_vehicle(vehicle_config: AiwaysVehicleSoc, vehicle: int):
     return ConfigurableVehicle(vehicle_config=vehicle_config,
                                component_updater=updater,
                                vehicle=vehicle,
-                               calc_while_charging=False)
+                               calc_while_charging=False,
+                               estimate_soc=True)
 
 
 device_descriptor = DeviceDescriptor(configuration_factory=AiwaysVehicleSoc)
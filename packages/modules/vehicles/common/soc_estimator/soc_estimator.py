@@ -0,0 +1,96 @@
+"""Schätzung des SoC zwischen zwei Online-Abfragen
+
+Ausgehend von der letzten Online-Abfrage wird der SoC aus der am Ladepunkt geladenen Energie, dem Wirkungsgrad und der
+Batteriekapazität aus dem Fahrzeug-Profil geschätzt. Der Wirkungsgrad wird mit einem je Fahrzeug gelernten
+Korrekturfaktor angepasst, der bei jeder Online-Abfrage mit dem geschätzten Hub verglichen wird. Jede Schätzung hat eine
+Unsicherheit in Prozentpunkten, die mit der geladenen Energie und der Zeit seit der Abfrage wächst. Das Fahrzeug wird
+erst wieder online abgefragt, wenn die Unsicherheit zu groß ist oder ein Zielladen-Plan einen genauen SoC benötigt.
+"""
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+from helpermodules import timecheck
+from modules.common.abstract_vehicle import CalculatedSocState, VehicleUpdateData
+
+log = logging.getLogger(__name__)
+
+# Unsicherheit der Online-Abfrage [%-Punkte]
+API_UNCERTAINTY = 1
+# relativer Fehler des aus der geladenen Energie berechneten Hubs
+GAIN_UNCERTAINTY = 0.1
+# Zunahme der Unsicherheit durch Verbrauch im Stand [%-Punkte je Stunde]
+UNCERTAINTY_PER_HOUR = 0.2
+# Ab dieser Unsicherheit wird das Fahrzeug online abgefragt [%-Punkte].
+MAX_UNCERTAINTY = 3
+# Abstand zum Ziel-SoC eines Zielladen-Plans, ab dem online abgefragt wird [%-Punkte]
+PLAN_SOC_MARGIN = 5
+# Korrekturfaktor nur lernen, wenn seit der letzten Abfrage mindestens so viel geladen wurde [%-Punkte]
+MIN_LEARNING_GAIN = 5
+# Gewichtung einer neuen Abfrage beim Lernen des Korrekturfaktors
+CORRECTION_WEIGHT = 0.2
+MIN_CORRECTION = 0.7
+MAX_CORRECTION = 1.3
+
+
+@dataclass
+class SocEstimate:
+    soc: float
+    # SoC liegt mit hoher Wahrscheinlichkeit in soc ± uncertainty
+    uncertainty: float
+
+
+def _soc_gain(vehicle_update_data: VehicleUpdateData, imported: float, correction: float) -> float:
+    energy_battery_gain = (vehicle_update_data.imported - imported) * vehicle_update_data.efficiency / 100 * correction
+    return energy_battery_gain / vehicle_update_data.battery_capacity * 100
+
+
+def _is_anchor_valid(vehicle_update_data: VehicleUpdateData, state: CalculatedSocState) -> bool:
+    # Seit der letzten Abfrage muss das Fahrzeug am selben Ladepunkt angesteckt sein, sonst kann es gefahren sein.
+    return (state.api_soc is not None and
+            state.api_soc_imported is not None and
+            state.api_soc_timestamp is not None and
+            vehicle_update_data.imported is not None and
+            vehicle_update_data.plug_state and
+            vehicle_update_data.plug_time <= state.api_soc_timestamp)
+
+
+def estimate_soc(vehicle_update_data: VehicleUpdateData, state: CalculatedSocState) -> Optional[SocEstimate]:
+    """ schätzt den SoC ausgehend von der letzten Online-Abfrage, None wenn keine Schätzung möglich ist."""
+    if _is_anchor_valid(vehicle_update_data, state) is False:
+        return None
+    gain = _soc_gain(vehicle_update_data, state.api_soc_imported, state.efficiency_correction)
+    hours = max(timecheck.create_timestamp() - state.api_soc_timestamp, 0) / 3600
+    uncertainty = API_UNCERTAINTY + abs(gain) * GAIN_UNCERTAINTY + hours * UNCERTAINTY_PER_HOUR
+    soc = min(state.api_soc + gain, 100)
+    log.debug(f"Geschätzter SoC: {state.api_soc}% + {gain}% = {soc}% ± {uncertainty}%-Punkte, "
+              f"Korrekturfaktor {state.efficiency_correction}")
+    return SocEstimate(soc=soc, uncertainty=uncertainty)
+
+
+def api_request_required(estimate: Optional[SocEstimate], plan_soc: Optional[float]) -> bool:
+    """ prüft, ob die Schätzung zu ungenau ist oder der Ziel-SoC eines Zielladen-Plans so nah ist, dass der SoC
+    abgefragt werden muss."""
+    if estimate is None or estimate.uncertainty > MAX_UNCERTAINTY:
+        return True
+    if plan_soc is not None and estimate.soc + estimate.uncertainty >= plan_soc - PLAN_SOC_MARGIN:
+        return True
+    return False
+
+
+def update_state(state: CalculatedSocState,
+                 vehicle_update_data: VehicleUpdateData,
+                 soc: float,
+                 soc_timestamp: float) -> None:
+    """ lernt den Korrekturfaktor aus einer neuen Online-Abfrage und merkt sie als Ausgangspunkt für die Schätzung."""
+    if _is_anchor_valid(vehicle_update_data, state):
+        gain = _soc_gain(vehicle_update_data, state.api_soc_imported, 1)
+        # Bei vollem Akku ist der Hub begrenzt und nicht aussagekräftig.
+        if gain >= MIN_LEARNING_GAIN and soc < 100:
+            correction = min(max((soc - state.api_soc) / gain, MIN_CORRECTION), MAX_CORRECTION)
+            state.efficiency_correction = round(
+                (1 - CORRECTION_WEIGHT) * state.efficiency_correction + CORRECTION_WEIGHT * correction, 3)
+            log.debug(f"Gelernter Korrekturfaktor für den Wirkungsgrad: {state.efficiency_correction}")
+    state.api_soc = soc
+    state.api_soc_imported = vehicle_update_data.imported
+    state.api_soc_timestamp = soc_timestamp
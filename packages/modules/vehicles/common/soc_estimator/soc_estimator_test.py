@@ -0,0 +1,79 @@
+from typing import Optional
+
+import pytest
+
+from helpermodules import timecheck
+from modules.common.abstract_vehicle import CalculatedSocState, VehicleUpdateData
+from modules.vehicles.common.soc_estimator import soc_estimator
+from modules.vehicles.common.soc_estimator.soc_estimator import SocEstimate
+
+NOW = 1700000000
+
+
+@pytest.fixture(autouse=True)
+def mock_timestamp(monkeypatch) -> None:
+    monkeypatch.setattr(timecheck, "create_timestamp", lambda: NOW)
+
+
+def vehicle_update_data(imported: float, plug_time: float = NOW - 7200) -> VehicleUpdateData:
+    return VehicleUpdateData(plug_state=True, plug_time=plug_time, imported=imported, efficiency=90,
+                             battery_capacity=100000)
+
+
+@pytest.mark.parametrize(
+    "data, state, expected_estimate",
+    [
+        pytest.param(vehicle_update_data(20000), CalculatedSocState(), None, id="keine Abfrage"),
+        pytest.param(vehicle_update_data(20000, plug_time=NOW - 1800),
+                     CalculatedSocState(api_soc=20, api_soc_imported=10000, api_soc_timestamp=NOW - 3600),
+                     None, id="seit der Abfrage abgesteckt"),
+        pytest.param(vehicle_update_data(20000),
+                     CalculatedSocState(api_soc=20, api_soc_imported=10000, api_soc_timestamp=NOW - 3600),
+                     SocEstimate(soc=29, uncertainty=2.1), id="geladen"),
+        pytest.param(vehicle_update_data(20000),
+                     CalculatedSocState(api_soc=20, api_soc_imported=10000, api_soc_timestamp=NOW - 3600,
+                                        efficiency_correction=0.9),
+                     SocEstimate(soc=28.1, uncertainty=2.01), id="mit Korrekturfaktor"),
+    ])
+def test_estimate_soc(data: VehicleUpdateData, state: CalculatedSocState, expected_estimate: Optional[SocEstimate]):
+    # execution
+    estimate = soc_estimator.estimate_soc(data, state)
+
+    # evaluation
+    if expected_estimate is None:
+        assert estimate is None
+    else:
+        assert estimate.soc == pytest.approx(expected_estimate.soc)
+        assert estimate.uncertainty == pytest.approx(expected_estimate.uncertainty)
+
+
+@pytest.mark.parametrize(
+    "estimate, plan_soc, expected_request",
+    [
+        pytest.param(None, None, True, id="keine Schätzung"),
+        pytest.param(SocEstimate(soc=50, uncertainty=2), None, False, id="Schätzung genau genug"),
+        pytest.param(SocEstimate(soc=50, uncertainty=4), None, True, id="Schätzung zu ungenau"),
+        pytest.param(SocEstimate(soc=50, uncertainty=2), 80, False, id="Ziel-SoC weit entfernt"),
+        pytest.param(SocEstimate(soc=74, uncertainty=2), 80, True, id="Ziel-SoC fast erreicht"),
+    ])
+def test_api_request_required(estimate: Optional[SocEstimate], plan_soc: Optional[float], expected_request: bool):
+    # execution
+    request = soc_estimator.api_request_required(estimate, plan_soc)
+
+    # evaluation
+    assert request == expected_request
+
+
+def test_update_state():
+    # setup
+    state = CalculatedSocState(api_soc=20, api_soc_imported=10000, api_soc_timestamp=NOW - 3600)
+
+    # execution
+    # 10kWh geladen, geschätzt 9%-Punkte, tatsächlich 8.1%-Punkte
+    soc_estimator.update_state(state, vehicle_update_data(20000), 28.1, NOW)
+
+    # evaluation
+    assert state.efficiency_correction == 0.98
+    assert state.api_soc == 28.1
+    assert state.api_soc_imported == 20000
+    assert state.api_soc_timestamp == NOW
@@ -15,7 +15,8 @@ def create_vehicle(vehicle_config: EVCCVehicleSoc, vehicle: int):
     def updater(vehicle_update_data: VehicleUpdateData) -> CarState:
         return fetch_soc(vehicle_config.configuration, vehicle_update_data, vehicle)
     return ConfigurableVehicle(vehicle_config=vehicle_config, component_updater=updater, vehicle=vehicle,
-                               calc_while_charging=vehicle_config.configuration.calculate_soc)
+                               calc_while_charging=vehicle_config.configuration.calculate_soc,
+                               estimate_soc=True)
 
 
 device_descriptor = DeviceDescriptor(configuration_factory=EVCCVehicleSoc)
@@ -23,7 +23,8 @@ def create_vehicle(vehicle_config: KIA, vehicle: int):
             vehicle_config.configuration.pin,
             vehicle_config.configuration.vin,
             vehicle)
-    return ConfigurableVehicle(vehicle_config=vehicle_config, component_updater=updater, vehicle=vehicle)
+    return ConfigurableVehicle(vehicle_config=vehicle_config, component_updater=updater, vehicle=vehicle,
+                               estimate_soc=True)
 
 
 def kia_update(user_id: str, password: str, pin: str, vin: str, charge_point: int):
@@ -24,7 +24,8 @@ def create_vehicle(vehicle_config: LeafSoc, vehicle: int):
             vehicle)
     return ConfigurableVehicle(vehicle_config=vehicle_config,
                                component_updater=updater,
-                               vehicle=vehicle)
+                               vehicle=vehicle,
+                               estimate_soc=True)
 
 
 def leaf_update(user_id: str, password: str, region: str, charge_point: int):
@@ -22,7 +22,8 @@ def create_vehicle(vehicle_config: Polestar2, vehicle: int):
             vehicle_config.configuration.password,
             vehicle_config.configuration.vin,
             vehicle)
-    return ConfigurableVehicle(vehicle_config=vehicle_config, component_updater=updater, vehicle=vehicle)
+    return ConfigurableVehicle(vehicle_config=vehicle_config, component_updater=updater, vehicle=vehicle,
+                               estimate_soc=True)
 
 
 def Polestar2_update(user_id: str, password: str, vin: str, charge_point: int):
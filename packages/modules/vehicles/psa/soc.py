@@ -21,7 +21,8 @@ def create_vehicle(vehicle_config: PSA, vehicle: int):
     return ConfigurableVehicle(vehicle_config=vehicle_config,
                                component_updater=updater,
                                vehicle=vehicle,
-                               calc_while_charging=True)
+                               calc_while_charging=True,
+                               estimate_soc=True)
 
 
 def psa_update(user_id: str,
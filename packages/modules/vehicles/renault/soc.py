@@ -18,7 +18,8 @@ log = logging.getLogger(__name__)
 def create_vehicle(vehicle_config: Renault, vehicle: int):
     def updater(vehicle_update_data: VehicleUpdateData) -> CarState:
         return api.fetch_soc(vehicle_config.configuration)
-    return ConfigurableVehicle(vehicle_config=vehicle_config, component_updater=updater, vehicle=vehicle)
+    return ConfigurableVehicle(vehicle_config=vehicle_config, component_updater=updater, vehicle=vehicle,
+                               estimate_soc=True)
 
 
 def renault_update(user_id: str, password: str, location: str, country: str, vin: str, charge_point: int):
@@ -27,7 +27,8 @@ def create_vehicle(vehicle_config: Skoda, vehicle: int):
     return ConfigurableVehicle(vehicle_config=vehicle_config,
                                component_updater=updater,
                                vehicle=vehicle,
-                               calc_while_charging=vehicle_config.configuration.calculate_soc)
+                               calc_while_charging=vehicle_config.configuration.calculate_soc,
+                               estimate_soc=True)
 
 
 def skoda_update(user_id: str, password: str, vin: str, refreshToken: str, charge_point: int):
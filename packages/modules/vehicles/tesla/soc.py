@@ -53,7 +53,8 @@ def create_vehicle(vehicle_config: TeslaSoc, vehicle: int):
         return fetch(vehicle_config, vehicle_update_data)
     return ConfigurableVehicle(vehicle_config=vehicle_config,
                                component_updater=updater,
-                               vehicle=vehicle)
+                               vehicle=vehicle,
+                               estimate_soc=True)
 
 
 def read_legacy(id: int,
@@ -35,7 +35,8 @@ def create_vehicle(vehicle_config: VWId, vehicle: int):
     return ConfigurableVehicle(vehicle_config=vehicle_config,
                                component_updater=updater,
                                vehicle=vehicle,
-                               calc_while_charging=vehicle_config.configuration.calculate_soc)
+                               calc_while_charging=vehicle_config.configuration.calculate_soc,
+                               estimate_soc=True)
 
 
 device_descriptor = DeviceDescriptor(configuration_factory=VWId)
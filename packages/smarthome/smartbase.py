@@ -1,15 +1,24 @@
 #!/usr/bin/python3
 import time
-import os
 from typing import Dict, Tuple
 from smarthome.smartbase0 import Sbase0
 from smarthome.smartmeas import SlElgris, Slsdm630, Sllovato, Slsdm120, Slwe514, Slfronius
 from smarthome.smartmeas import Sljson, Slsmaem, Slshelly, Sltasmota, Slmqtt
 from smarthome.smartmeas import Slhttp, Slavm, Slmystrom, Slb23
 from smarthome.smartbut import Sbshelly
+from smarthome.smartstate import smart_state
 from datetime import datetime, timezone
 import logging
 log = logging.getLogger(__name__)
+# maximale Dauer eines Auslesens in Sekunden je Geräte- bzw. Messtyp, mindestens so lang wie die Timeouts der Treiber
+# (zB http: bis zu drei Abfragen mit je 5 s, Modbus: mehrere Anfragen mit je 3 s). Dauert das Auslesen länger als ein
+# Zyklus, werden die Werte entsprechend mehr Zyklen lang verwendet.
+POLLTIMEOUT = 4
+POLLTIMEOUTS = {'http': 16, 'avm': 16,
+                'acthor': 10, 'elwa': 10, 'idm': 10, 'lambda': 10, 'nibe': 10, 'NXDACXX': 10, 'askoheat': 10,
+                'ratiotherm': 10, 'stiebel': 10, 'vampair': 10, 'viessmann': 10,
+                'elgris': 10, 'sdm630': 10, 'lovato': 10, 'b23': 10, 'sdm120': 10, 'we514': 10,
+                'mqtt': 7, 'shelly': 7, 'tasmota': 7}
 
 
 class Sbase(Sbase0):
@@ -98,37 +107,31 @@ class Sbase(Sbase0):
                   '_relais', 'w') as f:
             f.write(str(self.relais))
         try:
-            with open(self._basePath+'/ramdisk/smarthome_device_' +
-                      str(self.device_nummer) + 'watt0pos', 'r') as value:
-                importtemp = int(value.read())
-                if (self.newwattk > 0):
-                    # Shadow calculation for devices mit gelierten Zaehler (z.b. sdm630)
-                    self.newwattks = self.simcount(self._oldwatt, "smarthome_device_" +
-                                                   str(self.device_nummer),
-                                                   "device" + str(self.device_nummer) + "_wh",
-                                                   "device" + str(self.device_nummer) + "_whe",
-                                                   str(self.device_nummer), self.newwattk)
-                    #                              str(self.device_nummer), 0)
-                    # um Simulation zweiter Zaehler zu aktivieren
-                    #
-                else:
-                    # uebernehmen gerechneten Zaehlerstand für alle anderen devices (z.b. shelly)
-                    self.newwattk = self.simcount(self._oldwatt, "smarthome_device_" +
-                                                  str(self.device_nummer),
-                                                  "device" + str(self.device_nummer) + "_wh",
-                                                  "device" + str(self.device_nummer) + "_whe",
-                                                  str(self.device_nummer), 0)
-
+            # ohne Startpunkt wird die Zählersimulation initialisiert
+            int(smart_state.get('smarthome_device_' + str(self.device_nummer) + 'watt0pos'))
+            if (self.newwattk > 0):
+                # Shadow calculation for devices mit gelierten Zaehler (z.b. sdm630)
+                self.newwattks = self.simcount(self._oldwatt, "smarthome_device_" +
+                                               str(self.device_nummer),
+                                               "device" + str(self.device_nummer) + "_wh",
+                                               "device" + str(self.device_nummer) + "_whe",
+                                               str(self.device_nummer), self.newwattk)
+                #                              str(self.device_nummer), 0)
+                # um Simulation zweiter Zaehler zu aktivieren
+                #
+            else:
+                # uebernehmen gerechneten Zaehlerstand für alle anderen devices (z.b. shelly)
+                self.newwattk = self.simcount(self._oldwatt, "smarthome_device_" +
+                                              str(self.device_nummer),
+                                              "device" + str(self.device_nummer) + "_wh",
+                                              "device" + str(self.device_nummer) + "_whe",
+                                              str(self.device_nummer), 0)
         except Exception:
             # first run simcount also update
             # add start point for shadow
             importtemp = self._whimported_tmp
-            with open(self._basePath+'/ramdisk/smarthome_device_' +
-                      str(self.device_nummer) + 'watt0pos', 'w') as f:
-                f.write(str(importtemp))
-            with open(self._basePath+'/ramdisk/smarthome_device_' +
-                      str(self.device_nummer) + 'watt0neg', 'w') as f:
-                f.write(str("0"))
+            smart_state.update({'smarthome_device_' + str(self.device_nummer) + 'watt0pos': importtemp,
+                                'smarthome_device_' + str(self.device_nummer) + 'watt0neg': 0})
             if (self.newwattk > 0):
                 log.info("(" + str(self.device_nummer) +
                          ") Simcount Startwert aus Z1 (HW) übernommen " +
@@ -197,12 +200,22 @@ class Sbase(Sbase0):
         else:
             sendstatus = self.devstatus
         self.mqtt_param[pref + 'Status'] = str(sendstatus)
+
+    def addgruppe(self, watt: int, relais: int, devstatus: int) -> None:
+        # dyn daten einschaltgruppe, erst nach dem Auslesen aller Geräte
+        # ergänzen, da die Geräte parallel ausgelesen werden
         if (self.gruppe == 'A'):
-            Sbase.ausschaltwatt = Sbase.ausschaltwatt + self._oldwatt
+            Sbase.ausschaltwatt = Sbase.ausschaltwatt + watt
         elif (self.gruppe == 'E'):
-            if (self.relais == 1):
+            if (relais == 1):
                 Sbase.einrelais = 1
-            Sbase.eindevstatus = max(Sbase.eindevstatus, self.devstatus)
+            Sbase.eindevstatus = max(Sbase.eindevstatus, devstatus)
+
+    def getpolltimeout(self) -> float:
+        polltimeout = POLLTIMEOUTS.get(self.device_type, POLLTIMEOUT)
+        if (self._device_differentmeasurement == 1):
+            polltimeout = max(polltimeout, POLLTIMEOUTS.get(self._device_measuretype, POLLTIMEOUT))
+        return polltimeout
 
     def updatepar(self, input_param: Dict[str, str]) -> None:
         self._smart_param = input_param.copy()
@@ -1093,35 +1106,22 @@ class Sbase(Sbase0):
             wattnegkh = 0
             wattposh = wattks * 3600
             wattnegh = 0
-            with open(self._basePath+'/ramdisk/'+pref+'watt0pos', 'w') as f:
-                f.write(str(wattposh))
             self._wpos = wattposh
-            with open(self._basePath+'/ramdisk/'+pref+'watt0neg', 'w') as f:
-                f.write(str(wattnegh))
-            with open(self._basePath+'/ramdisk/' + importfn, 'w') as f:
-                f.write(str(round(wattposkh, 2)))
-            with open(self._basePath+'/ramdisk/' + exportfn, 'w') as f:
-                f.write(str(wattnegkh))
             # start punkt für simulation schreiben
-            value1 = "%22.6f" % seconds2
-            with open(self._basePath+'/ramdisk/'+pref+'sec0', 'w') as f:
-                f.write(str(value1))
-            with open(self._basePath+'/ramdisk/'+pref+'wh0', 'w') as f:
-                f.write(str(watt2))
+            smart_state.update({pref + 'watt0pos': wattposh,
+                                pref + 'watt0neg': wattnegh,
+                                importfn: round(wattposkh, 2),
+                                exportfn: wattnegkh,
+                                pref + 'sec0': seconds2,
+                                pref + 'wh0': watt2})
             self._wh = round(wattposkh, 2)
             return self._wh
         # emulate import  export
-        if os.path.isfile(self._basePath+'/ramdisk/'+pref+'sec0'):
-            with open(self._basePath+'/ramdisk/'+pref+'sec0', 'r') as f:
-                seconds1 = float(f.read())
-            with open(self._basePath+'/ramdisk/'+pref+'wh0', 'r') as f:
-                watt1 = int(f.read())
-            with open(self._basePath+'/ramdisk/'+pref+'watt0pos', 'r') as f:
-                wattposh = int(f.read())
-            with open(self._basePath+'/ramdisk/'+pref+'watt0neg', 'r') as f:
-                wattnegh = int(f.read())
-            with open(self._basePath+'/ramdisk/'+pref+'wh0', 'w') as f:
-                f.write(str(watt2))
+        if smart_state.get(pref + 'sec0') is not None:
+            seconds1 = float(smart_state.get(pref + 'sec0'))
+            watt1 = int(smart_state.get(pref + 'wh0'))
+            wattposh = int(smart_state.get(pref + 'watt0pos'))
+            wattnegh = int(smart_state.get(pref + 'watt0neg'))
             seconds1 = seconds1 + 1
             deltasec = seconds2 - seconds1
             stepsize = int((watt2-watt1)/(deltasec + 1))
@@ -1153,28 +1153,19 @@ class Sbase(Sbase0):
                     watt1 = min(watt1, watt2)
                 seconds1 = seconds1 + 1
             seconds1 = seconds1 - 1
-            value1 = "%22.6f" % seconds1
-            with open(self._basePath+'/ramdisk/'+pref+'sec0', 'w') as f:
-                f.write(str(value1))
             wattnegkh = int((wattnegh*-1)/3600)
-            with open(self._basePath+'/ramdisk/'+pref+'watt0pos', 'w') as f:
-                f.write(str(wattposh))
             self._wpos = wattposh
-            with open(self._basePath+'/ramdisk/'+pref+'watt0neg', 'w') as f:
-                f.write(str(wattnegh))
             wattposkh = int(wattposh/3600)
-            with open(self._basePath+'/ramdisk/' + importfn, 'w') as f:
-                f.write(str(round(wattposkh, 2)))
-            with open(self._basePath+'/ramdisk/' + exportfn, 'w') as f:
-                f.write(str(wattnegkh))
+            smart_state.update({pref + 'sec0': seconds1,
+                                pref + 'wh0': watt2,
+                                pref + 'watt0pos': wattposh,
+                                pref + 'watt0neg': wattnegh,
+                                importfn: round(wattposkh, 2),
+                                exportfn: wattnegkh})
         else:
-            value1 = "%22.6f" % seconds2
-            with open(self._basePath+'/ramdisk/'+pref+'sec0', 'w') as f:
-                f.write(str(value1))
-            with open(self._basePath+'/ramdisk/'+pref+'wh0', 'w') as f:
-                f.write(str(watt2))
-            with open(self._basePath+'/ramdisk/'+pref+'watt0pos', 'r') as f:
-                wattposh = int(f.read())
+            smart_state.update({pref + 'sec0': seconds2,
+                                pref + 'wh0': watt2})
+            wattposh = int(smart_state.get(pref + 'watt0pos'))
             wattposkh = int(wattposh/3600)
         self._wh = round(wattposkh, 2)
         return self._wh
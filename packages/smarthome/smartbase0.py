@@ -3,16 +3,30 @@ import time
 import os
 import subprocess
 import logging
-from typing import Any, Dict
-from typing import List
+from typing import Any, Dict, NamedTuple
+from typing import List, Optional
+from smarthome.smartdriver import get_driver
 log = logging.getLogger(__name__)
 
 
+class PolledValues(NamedTuple):
+    # Werte des zuletzt abgeschlossenen Auslesens
+    cycle: int
+    watt: int
+    wattk: int
+    wattks: int
+    relais: int
+    devstatus: int
+    mqtt_param: Dict[str, str]
+
+
 class Sbase0:
     _basePath = '/var/www/html/openWB'
     _prefixpy = _basePath+'/packages/modules/smarthome/'
 
     def readret(self) -> Dict[str, Any]:
+        if self._ret_answer is not None:
+            return self._ret_answer
         with open(self._basePath+'/ramdisk/smarthome_device_ret' +
                   str(self.device_nummer), 'r') as f1:
             answer = json.loads(json.load(f1))
@@ -125,6 +139,11 @@ class Sbase0:
         self.btchange = 0
         self._mydevicemeasure = 'none'  # type: Any
         self.device_nummer = 0
+        # Antwort des zuletzt im selben Prozess aufgerufenen Treibers
+        self._ret_answer: Optional[Dict[str, Any]] = None
+        self.polled_values: Optional[PolledValues] = None
+        # Gerät wurde im letzten Zyklus nicht rechtzeitig ausgelesen
+        self.stale = False
 
     def checkbefsend(self) -> int:
         newtime = int(time.time())
@@ -159,6 +178,17 @@ class Sbase0:
                         % (str(e1)))
 
     def callpro(self, argumentList: List[str]) -> None:
+        driver = get_driver(argumentList[1])
+        if driver is not None:
+            try:
+                answer = driver(argumentList[1:])
+                if answer is not None:
+                    self._ret_answer = answer
+            except Exception:
+                # wie beim Prozess bleibt die letzte Antwort erhalten
+                log.exception("Treiber Fehlermeldung: argumentList %s " % argumentList[1])
+            return
+        self._ret_answer = None
         try:
             my_env = os.environ.copy()
             my_env["PYTHONPATH"] = "/var/www/html/openWB/packages"
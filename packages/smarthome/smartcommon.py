@@ -17,11 +17,14 @@ from modules.smarthome.acthor.smartacthor import Sacthor
 from modules.smarthome.avmhomeautomation.smartavm import Savm
 from modules.smarthome.nibe.smartnibe import Snibe
 from smarthome.smartbase import Sbase
+from smarthome.smartbase0 import PolledValues
+from smarthome.smartstate import smart_state
+from helpermodules.pub import Pub
+from helpermodules.utils import Task, WorkerPool
 from typing import Dict, Tuple, Any
 import paho.mqtt.client as mqtt
 import re
 import time
-import os
 import math
 import logging
 log = logging.getLogger(__name__)
@@ -38,6 +41,13 @@ ramdiskwrite = True
 mqttport = 0
 bp = '/var/www/html/openWB'
 numberOfSupportedDevices = 9  # limit number of smarthome devices
+pollcycle = 0
+# Werte eines verspätet abgeschlossenen Auslesens werden bis zu so vielen Zyklen verwendet. Erst danach wird das Gerät
+# nicht mehr geschaltet.
+maxstalecycles = 3
+# maximale Wartezeit auf das Auslesen je Zyklus in Sekunden, der SmartHome-Zyklus wird alle 5 s gestartet
+maxpollwait = 4
+worker_pool = WorkerPool("smarthome", max_workers=numberOfSupportedDevices)
 resetmaxeinschaltdauer = 0
 maxspeicher = 0
 firststart = True
@@ -111,8 +121,19 @@ def on_message(client: mqtt.Client, userdata: Any, msg: mqtt.MQTTMessage) -> Non
         log.warning(" Skipped msg " + msg.topic + " Value " + value)
 
 
+def polldevice(mydevice: Sbase, cycle: int, uberschuss: int, uberschussoffset: int) -> None:
+    mydevice.getwatt(uberschuss, uberschussoffset)
+    mydevice.polled_values = PolledValues(cycle, mydevice.newwatt, mydevice.newwattk, mydevice.newwattks,
+                                          mydevice.relais, mydevice.devstatus, dict(mydevice.mqtt_param))
+
+
+def gettaskname(mydevice: Sbase) -> str:
+    return "smarthome device " + str(mydevice.device_nummer)
+
+
 def getdevicevalues(uberschuss: int, uberschussoffset: int, pvwatt: int, chargestatus: bool) -> None:
     global mydevices
+    global pollcycle
     totalwatt = 0
     totalwattot = 0
     totalminhaus = 0
@@ -121,14 +142,51 @@ def getdevicevalues(uberschuss: int, uberschussoffset: int, pvwatt: int, charges
     Sbase.einrelais = 0
     Sbase.eindevstatus = 0
     mqtt_all = {}
+    # Geräte parallel auslesen, ein langsames Gerät verzögert die anderen nicht
+    pollcycle = pollcycle + 1
+    tasks = []
+    polltimeout = 0
     for mydevice in mydevices:
+        # ein noch laufendes Auslesen wird nicht erneut gestartet
+        if worker_pool.is_active(gettaskname(mydevice)):
+            continue
         mydevice.pvwatt = pvwatt
         mydevice.chargestatus = chargestatus
-        mydevice.getwatt(uberschuss, uberschussoffset)
-        watt = mydevice.newwatt
-        wattk = mydevice.newwattk
-        wattks = mydevice.newwattks
-        relais = mydevice.relais
+        tasks.append(Task(gettaskname(mydevice), polldevice,
+                          (mydevice, pollcycle, uberschuss, uberschussoffset)))
+        polltimeout = max(polltimeout, mydevice.getpolltimeout())
+    # höchstens maxpollwait warten, damit sich die Zyklen nicht überschneiden. Langsamere Geräte werden im Hintergrund
+    # weiter ausgelesen.
+    worker_pool.run(tasks, min(polltimeout, maxpollwait))
+    for mydevice in mydevices:
+        values = mydevice.polled_values
+        # Während des Auslesens ändert der Worker das Geräte-Objekt, das Gerät darf dann nicht geschaltet werden.
+        running = worker_pool.is_active(gettaskname(mydevice))
+        # Geräte mit langem Timeout benötigen mehrere Zyklen für ein Auslesen.
+        maxcycles = maxstalecycles + math.ceil(mydevice.getpolltimeout() / maxpollwait)
+        outdated = (values is None) or (pollcycle - values.cycle > maxcycles)
+        mydevice.stale = running or outdated
+        if values is None:
+            log.warning("(" + str(mydevice.device_nummer) + ") " +
+                        str(mydevice.device_name) + " noch keine Werte ausgelesen")
+            continue
+        if outdated:
+            log.warning("(" + str(mydevice.device_nummer) + ") " +
+                        str(mydevice.device_name) + " seit " + str(pollcycle - values.cycle) +
+                        " Zyklen nicht ausgelesen, Gerät wird nicht geschaltet")
+        elif running:
+            log.info("(" + str(mydevice.device_nummer) + ") " +
+                     str(mydevice.device_name) +
+                     " wird noch ausgelesen, letzte Werte werden verwendet, Gerät wird nicht geschaltet")
+        elif values.cycle != pollcycle:
+            log.info("(" + str(mydevice.device_nummer) + ") " +
+                     str(mydevice.device_name) +
+                     " nicht rechtzeitig ausgelesen, letzte Werte werden verwendet")
+        watt = values.watt
+        wattk = values.wattk
+        wattks = values.wattks
+        relais = values.relais
+        mydevice.addgruppe(watt, relais, values.devstatus)
         # temp0 = mydevice.temp0
         # temp1 = mydevice.temp1
         # temp2 = mydevice.temp2
@@ -148,7 +206,7 @@ def getdevicevalues(uberschuss: int, uberschussoffset: int, pvwatt: int, charges
                  str(mydevice.ueberschussberechnung) + " akt: " + str(watt) +
                  " Z1: " + str(wattk) + " Z2: " + str(wattks))
         #  mqtt_all.update(mydevice.mqtt_param)
-        for keyread, value in mydevice.mqtt_param.items():
+        for keyread, value in values.mqtt_param.items():
             key = mqttsdevstat + keyread
             mqtt_all[key] = value
         topic = mqttsdevstat + '/' + str(mydevice.device_nummer) + '/mode'
@@ -196,36 +254,40 @@ def getdevicevalues(uberschuss: int, uberschussoffset: int, pvwatt: int, charges
     sendmq(mqtt_all)
 
 
-def pub(client: mqtt.Client, key: str, value: str) -> None:
-    if ("TemperatureSensor" in key and "300" in value):
-        client.publish(key, payload="", qos=0, retain=True)
+def pub(key: str, value: str) -> None:
+    if ("TemperatureSensor" in key and "300" in str(value)):
+        Pub().pub(key, "", qos=0, retain=True, no_json=True)
     else:
-        client.publish(key, payload=value, qos=0, retain=True)
+        Pub().pub(key, value, qos=0, retain=True, no_json=True)
 
 
 def sendmq(mqtt_input: Dict[str, str]) -> None:
+    # über die dauerhafte Verbindung von Pub als ein Paket senden, ohne auf jede Nachricht zu warten
     global mqtt_cache
-    client = mqtt.Client("openWB-SmartHome-bulkpublisher-" + str(os.getpid()))
-    client.connect("localhost", mqttport)
-    for key, value in mqtt_input.items():
-        valueold = mqtt_cache.get(key, 'not in cache')
-        if (valueold == value):
-            pass
-        else:
-            log.info("Mq pub " + str(key) + "=" +
-                     str(value) + " old " + str(valueold))
-            if (mqttcs in str(key)):
-                log.info("Mq no caching " + str(key))
+    Pub().start_batch()
+    try:
+        for key, value in mqtt_input.items():
+            valueold = mqtt_cache.get(key, 'not in cache')
+            if (valueold == value):
+                pass
             else:
-                mqtt_cache[key] = value
-            pub(client, key, value)
-            client.loop(timeout=2.0)
-    client.disconnect()
+                log.info("Mq pub " + str(key) + "=" +
+                         str(value) + " old " + str(valueold))
+                if (mqttcs in str(key)):
+                    log.info("Mq no caching " + str(key))
+                else:
+                    mqtt_cache[key] = value
+                pub(key, value)
+    finally:
+        Pub().flush_batch()
 
 
 def conditions(speichersoc: int) -> None:
     global mydevices
     for mydevice in mydevices:
+        # erst nach dem Auslesen aller Geräte, nicht ausgelesene Geräte nicht schalten
+        if mydevice.stale:
+            continue
         mydevice.conditions(speichersoc)
 
 
@@ -233,8 +295,6 @@ def update_devices() -> None:
     global parammqtt
     global mydevices
     global mqtt_cache
-    client = mqtt.Client("openWB-SmartHome-bulkpublisher-" + str(os.getpid()))
-    client.connect("localhost", mqttport)
     # statische daten einschaltgruppe
     Sbase.ausdevices = 0
     Sbase.eindevices = 0
@@ -328,15 +388,13 @@ def update_devices() -> None:
                         valueold = mqtt_cache.pop(key, 'not in cache')
                         log.info("Mq pub " + str(key) + "=" +
                                  str(value) + " old " + str(valueold))
-                        pub(client, key, value)
-                        client.loop(timeout=2.0)
+                        pub(key, value)
                     mydevice.device_nummer = 0
                     mydevice._device_configured = '9'
                     # del mydevice
                     mydevices.remove(mydevice)
                     log.info("(" + str(i) + ") " +
                              "Device gelöscht")
-    client.disconnect()
 
 
 def readmq() -> None:
@@ -362,9 +420,8 @@ def readmq() -> None:
     log.info("Config reRead / Parameter check done")
     update_devices()
     log.info("Config reRead done")
-    if ramdiskwrite:
-        with open(bp+'/ramdisk/smartparam.sh', 'a') as f:
-            print('%s' % ('echo 1 > /var/www/html/openWB/ramdisk/rereadsmarthomedevices'), file=f)
+    # Die Datei rereadsmarthomedevices wird nicht mehr gelesen (smart_state). Das erneute Einlesen wird über die
+    # Topics openWB/set/LegacySmartHome/config/... in setdata ausgelöst.
 
 
 def resetmaxeinschaltdauerfunc() -> None:
@@ -419,42 +476,28 @@ def loadregelvars(wattbezug: int, speicherleistung: int, speichersoc: int,
              " Uberschuss mit Offset: " + str(uberschussoffset) + " Pv: " + str(pvwatt))
     log.info("Speicher Entladung(-)/Ladung(+): " +
              str(speicherleistung) + " SpeicherSoC: " + str(speichersoc) + " Ladung: " + str(chargestatus))
-    reread = 0
     try:
-        with open(bp+'/ramdisk/rereadsmarthomedevices', 'r') as value:
-            reread = int(value.read())
+        reread = int(smart_state.get('rereadsmarthomedevices', 1))
     except Exception:
         reread = 1
     if (reread == 1):
-        with open(bp+'/ramdisk/rereadsmarthomedevices', 'w') as f:
-            f.write(str(0))
+        smart_state.set('rereadsmarthomedevices', 0)
         readmq()
     if firststart:
         pass
     else:
-        for i in range(1, (numberOfSupportedDevices+1)):
+        for mydevice in mydevices:
+            i = mydevice.device_nummer
             try:
-                with open(bp+'/ramdisk/smarthome_device_manual_'
-                          + str(i), 'r') as value:
-                    for mydevice in mydevices:
-                        if (str(i) == str(mydevice.device_nummer)):
-                            mydevice.device_manual = int(value.read())
+                mydevice.device_manual = int(smart_state.get('smarthome_device_manual_' + str(i)))
             except Exception:
                 pass
             try:
-                with open(bp+'/ramdisk/smarthome_device_manual_control_'
-                          + str(i), 'r') as value:
-                    for mydevice in mydevices:
-                        if (str(i) == str(mydevice.device_nummer)):
-                            mydevice.device_manual_control = int(value.read())
+                mydevice.device_manual_control = int(smart_state.get('smarthome_device_manual_control_' + str(i)))
             except Exception:
                 pass
             try:
-                with open(bp+'/ramdisk/smarthome_device_manual_ueb_'
-                          + str(i), 'r') as value:
-                    for mydevice in mydevices:
-                        if (str(i) == str(mydevice.device_nummer)):
-                            mydevice.device_manual_ueb = int(value.read())
+                mydevice.device_manual_ueb = int(smart_state.get('smarthome_device_manual_ueb_' + str(i)))
             except Exception:
                 pass
     return uberschuss, uberschussoffset
@@ -484,28 +527,15 @@ def mainloop(wattbezug: int, speicherleistung: int, speichersoc: int, pvwatt: in
     if firststart:
         readmq()
         firststart = False
-        for i in range(1, (numberOfSupportedDevices+1)):
-            # restore manual mode from mqtt
-            for mydevice in mydevices:
-                if (str(i) == str(mydevice.device_nummer)):
-                    fname = bp+'/ramdisk/smarthome_device_manual_'+str(i)
-                    if not os.path.isfile(fname):
-                        with open(fname, 'w') as f:
-                            f.write(str(mydevice.device_manual))
-                    os.chmod(fname, 0o777)
-                    log.info("File: " + str(fname) + " created. Content: " + str(mydevice.device_manual))
-                    fname = bp+'/ramdisk/smarthome_device_manual_control_'+str(i)
-                    if not os.path.isfile(fname):
-                        with open(fname,  'w') as f:
-                            f.write(str(mydevice.device_manual_control))
-                    log.info("File: " + str(fname) + " created. Content: " + str(mydevice.device_manual_control))
-                    os.chmod(fname, 0o777)
-                    fname = bp+'/ramdisk/smarthome_device_manual_ueb_'+str(i)
-                    if not os.path.isfile(fname):
-                        with open(fname,  'w') as f:
-                            f.write(str(mydevice.device_manual_ueb))
-                    log.info("File: " + str(fname) + " created. Content: " + str(mydevice.device_manual_ueb))
-                    os.chmod(fname, 0o777)
+        # restore manual mode from mqtt
+        for mydevice in mydevices:
+            i = mydevice.device_nummer
+            for key, value in (('smarthome_device_manual_', mydevice.device_manual),
+                               ('smarthome_device_manual_control_', mydevice.device_manual_control),
+                               ('smarthome_device_manual_ueb_', mydevice.device_manual_ueb)):
+                if smart_state.get(key + str(i)) is None:
+                    smart_state.set(key + str(i), value)
+                log.info(key + str(i) + " Content: " + str(smart_state.get(key + str(i))))
     mqtt_man = {}
     sendmess = 0
     uberschuss, uberschussoffset = loadregelvars(wattbezug, speicherleistung, speichersoc, pvwatt, chargestatus)
@@ -516,7 +546,7 @@ def mainloop(wattbezug: int, speicherleistung: int, speichersoc: int, pvwatt: in
     for i in range(1, (numberOfSupportedDevices+1)):
         for mydevice in mydevices:
             if (str(i) == str(mydevice.device_nummer)):
-                if (mydevice.device_manual == 1):
+                if (mydevice.device_manual == 1) and not mydevice.stale:
                     if (mydevice.device_manual_control == 0):
                         if (mydevice.relais == 1):
                             mydevice.turndevicerelais(0, 0, 1)
@@ -542,3 +572,4 @@ def mainloop(wattbezug: int, speicherleistung: int, speichersoc: int, pvwatt: in
                     mqtt_man[pref + 'device_manual_control'] = workman
     if (sendmess == 1):
         sendmq(mqtt_man)
+    smart_state.checkpoint()
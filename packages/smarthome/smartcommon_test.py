@@ -0,0 +1,145 @@
+from threading import Event
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from smarthome import smartcommon
+from smarthome.smartbase import Sbase
+from smarthome.smartbase0 import PolledValues
+
+
+class DeviceMock(Sbase):
+    def __init__(self, device_nummer: int, watt: int, blocked: Event = None) -> None:
+        super().__init__()
+        self.device_nummer = device_nummer
+        self.watt = watt
+        self.blocked = blocked
+
+    def getpolltimeout(self) -> float:
+        return 0.1
+
+    def getwatt(self, uberschuss: int, uberschussoffset: int) -> None:
+        if self.blocked is not None:
+            self.blocked.wait()
+        self.newwatt = self.watt
+        self.relais = 1
+        self.mqtt_param = {'/' + str(self.device_nummer) + '/Watt': str(self.watt)}
+
+
+def test_getdevicevalues_slow_device(monkeypatch):
+    # setup
+    blocked = Event()
+    slow_device = DeviceMock(2, 2000, blocked)
+    fast_device = DeviceMock(1, 500)
+    sendmq_mock = Mock()
+    monkeypatch.setattr(smartcommon, "sendmq", sendmq_mock)
+    monkeypatch.setattr(smartcommon, "ramdiskwrite", False)
+    monkeypatch.setattr(smartcommon, "mydevices", [fast_device, slow_device])
+    monkeypatch.setattr(smartcommon, "worker_pool", smartcommon.WorkerPool("smarthome"))
+
+    # execution
+    smartcommon.getdevicevalues(0, 0, 0, False)
+    stale = slow_device.stale
+    blocked.set()
+    while smartcommon.worker_pool.active:
+        time.sleep(0.01)
+    smartcommon.getdevicevalues(0, 0, 0, False)
+
+    # evaluation
+    first, second = [call.args[0] for call in sendmq_mock.call_args_list]
+    # langsames Gerät hat noch keine Werte, das schnelle wird nicht verzögert
+    assert first[smartcommon.mqtttopicdisengageable] == 0
+    assert first[smartcommon.mqttsglobstat + 'wattnichtschalt'] == 500
+    assert smartcommon.mqttsdevstat + '/2/Watt' not in first
+    assert first[smartcommon.mqttsdevstat + '/1/Watt'] == '500'
+    assert stale is True
+    # das langsame Gerät liefert seine Werte nach, sie werden im nächsten Zyklus verwendet
+    assert slow_device.stale is False
+    assert second[smartcommon.mqttsglobstat + 'wattnichtschalt'] == 2500
+
+
+def test_getdevicevalues_running_device(monkeypatch):
+    # setup
+    blocked = Event()
+    device = DeviceMock(1, 2000, blocked)
+    device.polled_values = PolledValues(9, 500, 0, 0, 1, 0, {})
+    sendmq_mock = Mock()
+    monkeypatch.setattr(smartcommon, "sendmq", sendmq_mock)
+    monkeypatch.setattr(smartcommon, "ramdiskwrite", False)
+    monkeypatch.setattr(smartcommon, "mydevices", [device])
+    monkeypatch.setattr(smartcommon, "pollcycle", 9)
+    monkeypatch.setattr(smartcommon, "worker_pool", smartcommon.WorkerPool("smarthome"))
+    run_spy = Mock(wraps=smartcommon.worker_pool.run)
+    monkeypatch.setattr(smartcommon.worker_pool, "run", run_spy)
+
+    # execution
+    smartcommon.getdevicevalues(0, 0, 0, False)
+    smartcommon.getdevicevalues(0, 0, 0, False)
+    stale = device.stale
+    blocked.set()
+    while smartcommon.worker_pool.active:
+        time.sleep(0.01)
+
+    # evaluation
+    # das Gerät wird während des Auslesens nicht geschaltet, die letzten Werte werden verwendet
+    assert stale is True
+    assert sendmq_mock.call_args.args[0][smartcommon.mqttsglobstat + 'wattnichtschalt'] == 500
+    # das laufende Auslesen wird nicht erneut gestartet
+    assert [len(call.args[0]) for call in run_spy.call_args_list] == [1, 0]
+
+
+def test_getdevicevalues_late_values(monkeypatch):
+    # setup
+    device = DeviceMock(1, 500)
+    monkeypatch.setattr(smartcommon, "sendmq", Mock())
+    monkeypatch.setattr(smartcommon, "ramdiskwrite", False)
+    monkeypatch.setattr(smartcommon, "mydevices", [device])
+    monkeypatch.setattr(smartcommon, "worker_pool", Mock(is_active=Mock(return_value=False)))
+    stale = []
+
+    # execution
+    # DeviceMock benötigt einen Zyklus für das Auslesen
+    for age in (smartcommon.maxstalecycles + 1, smartcommon.maxstalecycles + 2):
+        device.polled_values = PolledValues(10 - age, 500, 0, 0, 1, 0, {})
+        monkeypatch.setattr(smartcommon, "pollcycle", 9)
+        smartcommon.getdevicevalues(0, 0, 0, False)
+        stale.append(device.stale)
+
+    # evaluation
+    # verspätete Werte werden bis maxstalecycles Zyklen nach dem Auslesen verwendet
+    assert stale == [False, True]
+
+
+def test_sendmq(monkeypatch, mock_pub):
+    # setup
+    monkeypatch.setattr(smartcommon, "mqtt_cache", {})
+    values = {"openWB/LegacySmartHome/Devices/1/Watt": "500",
+              "openWB/LegacySmartHome/Devices/1/TemperatureSensor0": "300"}
+
+    # execution
+    smartcommon.sendmq(values)
+    smartcommon.sendmq(dict(values, **{"openWB/LegacySmartHome/Devices/1/Watt": "600"}))
+
+    # evaluation
+    assert [call.args[:2] for call in mock_pub.pub.call_args_list] == [
+        ("openWB/LegacySmartHome/Devices/1/Watt", "500"),
+        ("openWB/LegacySmartHome/Devices/1/TemperatureSensor0", ""),
+        ("openWB/LegacySmartHome/Devices/1/Watt", "600")]
+    assert mock_pub.start_batch.call_count == mock_pub.flush_batch.call_count == 2
+
+
+@pytest.mark.parametrize("device_type, differentmeasurement, measuretype, expected_timeout", [
+    pytest.param("tasmota", 0, "none", 7, id="Treiber-Timeout"),
+    pytest.param("tasmota", 1, "http", 16, id="separate Messung"),
+    pytest.param("none", 0, "none", 4, id="Standard"),
+])
+def test_getpolltimeout(device_type: str, differentmeasurement: int, measuretype: str, expected_timeout: float):
+    # setup
+    device = Sbase()
+    device.device_type = device_type
+    device._device_differentmeasurement = differentmeasurement
+    device._device_measuretype = measuretype
+
+    # execution & evaluation
+    assert device.getpolltimeout() == expected_timeout
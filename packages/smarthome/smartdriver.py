@@ -0,0 +1,47 @@
+"""Treiber der SmartHome-Geräte im selben Prozess
+
+Die Treiber (modules/smarthome/<typ>/watt.py, on.py, off.py) werden bisher je Aufruf als eigener Python-Prozess
+gestartet und liefern ihre Antwort über die Datei ramdisk/smarthome_device_ret<nummer>. Stellt ein Treiber eine
+Funktion main(argv) bereit (IN_PROCESS_DRIVERS), wird diese direkt aufgerufen und gibt die Antwort als Dict zurück
+(on/off: None). argv entspricht sys.argv beim Start als Prozess. Alle anderen Treiber und Treiber, deren Abhängigkeiten
+fehlen, werden weiterhin als Prozess gestartet.
+"""
+import importlib
+import logging
+import os
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional
+
+log = logging.getLogger(__name__)
+
+Driver = Callable[[List[str]], Optional[Dict[str, Any]]]
+
+# Gerätetypen, deren Treiber main(argv) bereitstellen. Andere Treiber dürfen nicht importiert werden, da sie beim
+# Import ausgeführt werden.
+IN_PROCESS_DRIVERS = ("acthor", "elwa", "http", "json", "mystrom", "shelly", "tasmota")
+
+_drivers = {}  # type: Dict[str, Optional[Driver]]
+_lock = Lock()
+
+
+def _get_module_name(script: str) -> Optional[str]:
+    device_type = os.path.basename(os.path.dirname(script))
+    name, extension = os.path.splitext(os.path.basename(script))
+    if device_type in IN_PROCESS_DRIVERS and extension == ".py":
+        return f"modules.smarthome.{device_type}.{name}"
+    return None
+
+
+def get_driver(script: str) -> Optional[Driver]:
+    """ liefert die Funktion main des Treibers, None wenn der Treiber als Prozess gestartet werden muss."""
+    with _lock:
+        if script not in _drivers:
+            driver = None
+            module_name = _get_module_name(script)
+            if module_name is not None:
+                try:
+                    driver = getattr(importlib.import_module(module_name), "main", None)
+                except Exception:
+                    log.exception(f"Treiber {module_name} kann nicht geladen werden und wird als Prozess gestartet.")
+            _drivers[script] = driver
+        return _drivers[script]
@@ -0,0 +1,57 @@
+import io
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from modules.smarthome.tasmota import watt as tasmota_watt
+from smarthome import smartdriver
+from smarthome.smartbase0 import Sbase0
+
+
+@pytest.mark.parametrize("script, expected_module", [
+    pytest.param("/var/www/html/openWB/packages/modules/smarthome/shelly/watt.py", "modules.smarthome.shelly.watt",
+                 id="im Prozess"),
+    pytest.param("/var/www/html/openWB/packages/modules/smarthome/nibe/watt.py", None, id="als Prozess"),
+])
+def test_get_module_name(script, expected_module):
+    # execution
+    module = smartdriver._get_module_name(script)
+
+    # evaluation
+    assert module == expected_module
+
+
+def test_callpro_in_process(monkeypatch):
+    # setup
+    driver = Mock(side_effect=[{"power": 500, "powerc": 0, "on": 1}, Exception("Timeout")])
+    monkeypatch.setattr(smartdriver, "_drivers", {"tasmota/watt.py": driver})
+    popen_mock = Mock()
+    monkeypatch.setattr("subprocess.Popen", popen_mock)
+    device = Sbase0()
+
+    # execution
+    device.callpro(["python3", "tasmota/watt.py", "1", "192.168.1.2", "0"])
+    first = device.readret()
+    device.callpro(["python3", "tasmota/watt.py", "1", "192.168.1.2", "0"])
+
+    # evaluation
+    driver.assert_called_with(["tasmota/watt.py", "1", "192.168.1.2", "0"])
+    assert first == {"power": 500, "powerc": 0, "on": 1}
+    # bei einem Fehler bleibt die letzte Antwort erhalten
+    assert device.readret() == first
+    popen_mock.assert_not_called()
+
+
+def test_tasmota_watt(monkeypatch):
+    # setup
+    responses = {"http://192.168.1.2/cm?cmnd=Status": {"Status": {"Power": 0}},
+                 "http://192.168.1.2/cm?cmnd=Status%208": {"StatusSNS": {"ENERGY": {"Power": 230}}}}
+    monkeypatch.setattr(tasmota_watt.urllib.request, "urlopen",
+                        lambda url, timeout: io.BytesIO(json.dumps(responses[url]).encode("utf-8")))
+
+    # execution
+    answer = tasmota_watt.main(["tasmota/watt.py", "1", "192.168.1.2", "0"])
+
+    # evaluation
+    assert answer == {"power": 230, "powerc": 0, "on": 1}
@@ -0,0 +1,96 @@
+"""Zustand der SmartHome-Geräte im Speicher
+
+Die Zählerstände der Zählersimulation (simcount) und die Flags des manuellen Modus wurden bisher je Gerät in einzelnen
+Dateien in der Ramdisk abgelegt und in jedem Zyklus gelesen und geschrieben. Sie werden jetzt threadsicher im Speicher
+gehalten, die Schlüssel entsprechen den bisherigen Dateinamen. setdata und der SmartHome-Thread verwenden denselben
+Speicher. Damit der Zustand einen Neustart des Prozesses übersteht, wird er regelmäßig gesichert
+(ramdisk/smarthome_state.json). Fehlt ein Schlüssel, wird einmalig die bisherige Datei gelesen.
+"""
+import json
+import logging
+from pathlib import Path
+from threading import Lock
+import time
+from typing import Any, Dict, Set
+
+from helpermodules.utils.json_file_handler import write_atomic
+
+log = logging.getLogger(__name__)
+
+# Sekunden zwischen zwei Sicherungen
+CHECKPOINT_INTERVAL = 60
+
+
+class SmartState:
+    def __init__(self, folder: Path) -> None:
+        self.folder = folder
+        self.lock = Lock()
+        self.values: Dict[str, Any] = {}
+        # Schlüssel, für die keine bisherige Datei existiert
+        self.missing: Set[str] = set()
+        self.loaded = False
+        self.changed = False
+        self.last_checkpoint = 0.0
+
+    @property
+    def path(self) -> Path:
+        return self.folder / "smarthome_state.json"
+
+    def _load(self) -> None:
+        if self.loaded:
+            return
+        self.loaded = True
+        try:
+            with open(self.path, "r") as file:
+                self.values = json.load(file)
+        except FileNotFoundError:
+            pass
+        except (json.decoder.JSONDecodeError, UnicodeDecodeError):
+            log.warning(f"Ungültige Sicherung {self.path} wird verworfen.")
+
+    def _read_legacy(self, key: str) -> None:
+        if key in self.missing:
+            return
+        try:
+            with open(self.folder / key, "r") as file:
+                self.values[key] = file.read().strip()
+        except (FileNotFoundError, IsADirectoryError, UnicodeDecodeError):
+            self.missing.add(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self.lock:
+            self._load()
+            if key not in self.values:
+                self._read_legacy(key)
+            return self.values.get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        self.update({key: value})
+
+    def update(self, values: Dict[str, Any]) -> None:
+        with self.lock:
+            self._load()
+            for key, value in values.items():
+                if self.values.get(key) != value:
+                    self.values[key] = value
+                    self.changed = True
+
+    def checkpoint(self, force: bool = False) -> None:
+        """ sichert den Zustand, wenn er sich geändert hat und die letzte Sicherung CHECKPOINT_INTERVAL Sekunden
+        zurückliegt."""
+        with self.lock:
+            if self.changed is False or (force is False and
+                                         time.time() - self.last_checkpoint < CHECKPOINT_INTERVAL):
+                return
+            values = dict(self.values)
+            self.changed = False
+            self.last_checkpoint = time.time()
+        try:
+            write_atomic(self.path, values)
+        except Exception:
+            log.exception(f"Fehler beim Sichern von {self.path}")
+            with self.lock:
+                self.changed = True
+
+
+smart_state = SmartState(Path(__file__).resolve().parents[2] / "ramdisk")
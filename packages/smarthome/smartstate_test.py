@@ -0,0 +1,62 @@
+import json
+
+from smarthome import smartbase
+from smarthome.smartbase import Sbase
+from smarthome.smartstate import SmartState
+
+
+def test_legacy_file_and_checkpoint(tmp_path):
+    # setup
+    (tmp_path / "smarthome_device_manual_1").write_text("1")
+    state = SmartState(tmp_path)
+
+    # execution
+    manual = state.get("smarthome_device_manual_1")
+    missing = state.get("smarthome_device_manual_2", 0)
+    state.set("smarthome_device_manual_control_1", 1)
+    state.checkpoint()
+    restored = SmartState(tmp_path)
+
+    # evaluation
+    assert manual == "1"
+    assert missing == 0
+    assert json.loads((tmp_path / "smarthome_state.json").read_text()) == {
+        "smarthome_device_manual_1": "1", "smarthome_device_manual_control_1": 1}
+    assert restored.get("smarthome_device_manual_control_1") == 1
+
+
+def test_checkpoint_interval(tmp_path):
+    # setup
+    state = SmartState(tmp_path)
+    state.set("rereadsmarthomedevices", 0)
+    state.checkpoint()
+
+    # execution
+    state.set("rereadsmarthomedevices", 1)
+    state.checkpoint()
+    unchanged = json.loads(state.path.read_text())
+    state.checkpoint(force=True)
+
+    # evaluation
+    assert unchanged == {"rereadsmarthomedevices": 0}
+    assert json.loads(state.path.read_text()) == {"rereadsmarthomedevices": 1}
+
+
+def test_simcount(monkeypatch, tmp_path):
+    # setup
+    state = SmartState(tmp_path)
+    monkeypatch.setattr(smartbase, "smart_state", state)
+    times = iter([1000.0, 1000.0 + 3600])
+    monkeypatch.setattr(smartbase.time, "time", lambda: next(times))
+    device = Sbase()
+    state.update({"smarthome_device_1watt0pos": 0, "smarthome_device_1watt0neg": 0})
+
+    # execution
+    device.simcount(1000, "smarthome_device_1", "device1_wh", "device1_whe", "1", 0)
+    wh = device.simcount(1000, "smarthome_device_1", "device1_wh", "device1_whe", "1", 0)
+
+    # evaluation
+    assert wh == 999
+    assert state.get("device1_wh") == 999
+    assert state.get("smarthome_device_1wh0") == 1000
+    assert not any(path.name.startswith("smarthome_device_1") for path in tmp_path.iterdir())
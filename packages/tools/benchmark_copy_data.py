@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+""" Vergleicht die Dauer von Data.copy_data/copy_module_data mit vollständiger und inkrementeller Kopie.
+Aufruf: PYTHONPATH=packages python packages/tools/benchmark_copy_data.py [Ladepunkte] [Zähler] [Zyklen]
+"""
+import sys
+import timeit
+from threading import Event
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from control import data
+from control.chargepoint.chargepoint import Chargepoint
+from control.chargepoint.chargepoint_template import CpTemplate
+from control.counter import Counter
+from helpermodules.subdata import SubData
+
+NUMBER_OF_CPS = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+NUMBER_OF_COUNTERS = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+CYCLES = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+# Anzahl der Ebenen in der Hierarchie, für jede Ebene wird copy_module_data aufgerufen
+LEVELS = 3
+
+
+def setup_subdata():
+    SubData.cp_template_data = {"cpt0": CpTemplate()}
+    for i in range(NUMBER_OF_CPS):
+        cp = Chargepoint(i, None)
+        cp.data.config.template = 0
+        SubData.cp_data[f"cp{i}"] = SimpleNamespace(chargepoint=cp)
+    components = {}
+    for i in range(NUMBER_OF_COUNTERS):
+        SubData.counter_data[f"counter{i}"] = Counter(i)
+        components[f"component{i}"] = None
+    SubData.system_data["device0"] = SimpleNamespace(components=components)
+
+
+def simulate_cycle(incremental: bool):
+    if incremental:
+        data.data.start_incremental_copy()
+    try:
+        data.data.copy_data()
+        for level in range(LEVELS):
+            # Werte der Zähler der jeweiligen Ebene wurden neu empfangen
+            for i in range(level, NUMBER_OF_COUNTERS, LEVELS):
+                SubData.change_tracker.mark_changed("counter_data", f"counter{i}")
+            data.data.copy_module_data()
+        for i in range(NUMBER_OF_CPS):
+            SubData.change_tracker.mark_changed("cp_data", f"cp{i}")
+        data.data.copy_module_data()
+        data.data.copy_data()
+    finally:
+        if incremental:
+            data.data.stop_incremental_copy()
+
+
+if __name__ == "__main__":
+    event = Event()
+    event.set()
+    data.data_init(event)
+    setup_subdata()
+    with patch("control.data.log"):
+        full = timeit.timeit(lambda: simulate_cycle(False), number=CYCLES) / CYCLES
+        incremental = timeit.timeit(lambda: simulate_cycle(True), number=CYCLES) / CYCLES
+    print(f"{NUMBER_OF_CPS} Ladepunkte, {NUMBER_OF_COUNTERS} Zähler, {LEVELS} Ebenen")
+    print(f"vollständige Kopie:   {full*1000:.1f} ms pro Zyklus")
+    print(f"inkrementelle Kopie:  {incremental*1000:.1f} ms pro Zyklus ({full/incremental:.1f}x)")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+""" Vergleicht die je Speichervorgang geschriebenen und gelesenen Bytes des bisherigen write_and_check (Sicherung,
+Schreiben, erneutes Lesen) mit dem atomaren Schreiben (temporäre Datei, fsync, Umbenennen) mit und ohne Komprimierung
+für ein Monats-Ladelog und ein Tages-Log.
+Gemessen wird über /proc/self/io (wchar/rchar), die Größe der Datei wird zusätzlich ausgegeben.
+Aufruf: PYTHONPATH=packages python packages/tools/benchmark_json_write.py [Durchläufe]
+"""
+import json
+import os
+from pathlib import Path
+import shutil
+import sys
+import tempfile
+import time
+
+from helpermodules.utils.json_file_handler import write_atomic
+
+RUNS = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+
+def write_and_check_with_backup(file_path, content):
+    # bisherige Implementierung aus write_and_check (ohne Fehlerbehandlung)
+    backup_path = file_path + '.bak'
+    shutil.copyfile(file_path, backup_path)
+    with open(file_path, 'w', encoding="utf-8") as file:
+        json.dump(content, file)
+    with open(file_path, 'r', encoding="utf-8") as file:
+        if content != json.load(file):
+            raise ValueError("Der geschriebene Inhalt stimmt nicht mit dem erwarteten Inhalt überein.")
+    os.remove(backup_path)
+
+
+def get_io():
+    with open("/proc/self/io", "r") as file:
+        values = dict(line.split(": ") for line in file.read().splitlines())
+    return int(values["wchar"]), int(values["rchar"])
+
+
+def create_charge_log():
+    return [{"chargepoint": {"id": 3, "name": "Garage", "serial_number": "1234567890"},
+             "vehicle": {"id": 1, "name": "Auto", "chargemode": "pv_charging", "prio": False, "rfid": None,
+                         "soc_at_start": 20, "soc_at_end": 80, "range_at_start": 80, "range_at_end": 320},
+             "time": {"begin": "01/05/2024, 08:00:00", "end": "01/05/2024, 12:00:00", "time_charged": "4:00"},
+             "data": {"range_charged": 240, "imported_since_mode_switch": 30000, "imported_since_plugged": 30000,
+                      "power": 7500, "costs": 9.0,
+                      "power_source": {"grid": 0.2, "pv": 0.7, "bat": 0.1, "cp": 0}}}
+            for _ in range(60)]
+
+
+def create_daily_log():
+    return {"entries": [{"timestamp": 1704067200 + i * 300, "date": f"{i // 12:02}:{i % 12 * 5:02}",
+                         "cp": {"cp3": {"imported": 1000.0 + i, "exported": 0},
+                                "all": {"imported": 1000.0 + i, "exported": 0}},
+                         "ev": {"ev1": {"soc": 50}},
+                         "counter": {"counter0": {"imported": 5000.0 + i, "exported": 200.0 + i, "grid": True}},
+                         "pv": {"pv1": {"exported": 3000.0 + i}, "all": {"exported": 3000.0 + i}},
+                         "bat": {"bat2": {"imported": 100.0 + i, "exported": 90.0 + i, "soc": 50},
+                                 "all": {"imported": 100.0 + i, "exported": 90.0 + i, "soc": 50}},
+                         "sh": {}, "hc": {"all": {"imported": 700.0 + i}}} for i in range(288)],
+            "names": {"counter0": "EVU", "pv1": "PV", "bat2": "Speicher", "cp3": "Garage"}}
+
+
+def measure(name, write, path, content):
+    write(path, content)
+    written, read = get_io()
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        write(path, content)
+    duration = time.perf_counter() - start
+    written_after, read_after = get_io()
+    print(f"  {name}: {(written_after - written) / RUNS / 1024:.1f} kB geschrieben, "
+          f"{(read_after - read) / RUNS / 1024:.1f} kB gelesen, Datei {os.path.getsize(path) / 1024:.1f} kB, "
+          f"{duration / RUNS * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as folder:
+        for log_name, content in (("Ladelog (60 Einträge)", create_charge_log()),
+                                  ("Tages-Log (288 Einträge)", create_daily_log())):
+            print(log_name)
+            path = str(Path(folder) / "log.json")
+            write_atomic(path, content)
+            measure("bisher (Sicherung, Schreiben, Prüfen)", write_and_check_with_backup, path, content)
+            measure("atomar", write_atomic, path, content)
+            measure("atomar, komprimiert", lambda path, content: write_atomic(path, content, True), path, content)
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+""" Vergleicht das Dekodieren von Registern mit dem BinaryPayloadDecoder und dem RegisterDecoder.
+Aufruf: PYTHONPATH=packages python packages/tools/benchmark_modbus_decoder.py [Durchläufe]
+"""
+import struct
+import sys
+import timeit
+
+from pymodbus.constants import Endian
+from pymodbus.payload import BinaryPayloadDecoder
+
+from modules.common.modbus import ModbusDataType, decode_registers
+
+RUNS = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+CASES = {
+    "1x FLOAT_32": ([ModbusDataType.FLOAT_32], [0x3FC0, 0x0000]),
+    "3x INT_16": ([ModbusDataType.INT_16]*3, [1, 2, 3]),
+    "Zähler (3x FLOAT_32 + 2x UINT_64)": ([ModbusDataType.FLOAT_32]*3 + [ModbusDataType.UINT_64]*2, list(range(14))),
+}
+
+
+def binary_payload_decoder(types, registers, byteorder, wordorder):
+    # bisherige Implementierung aus ModbusClient.__read_registers
+    decoder = BinaryPayloadDecoder.fromRegisters(registers, byteorder, wordorder)
+    return [struct.unpack(">e", struct.pack(">H", decoder.decode_16bit_uint())) if t ==
+            ModbusDataType.FLOAT_16 else getattr(decoder, t.decoding_method)() for t in types]
+
+
+if __name__ == "__main__":
+    for wordorder in (Endian.Big, Endian.Little):
+        for name, (types, registers) in CASES.items():
+            old = timeit.timeit(lambda: binary_payload_decoder(types, registers, Endian.Big, wordorder), number=RUNS)
+            new = timeit.timeit(lambda: decode_registers(registers, types, Endian.Big, wordorder), number=RUNS)
+            print(f"{name}, wordorder {wordorder}: BinaryPayloadDecoder {old / RUNS * 1e6:.2f} µs, "
+                  f"RegisterDecoder {new / RUNS * 1e6:.2f} µs ({old / new:.1f}x)")
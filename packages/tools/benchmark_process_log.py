@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+""" Vergleicht die Auswertung der Logs (Differenzen und Summen) mit der bisherigen eintragsweisen Berechnung und der
+spaltenweisen Berechnung je Modul für einen Tag (288 Einträge) und einen Zeitraum von 365 Tagen.
+Aufruf: PYTHONPATH=packages python packages/tools/benchmark_process_log.py [Durchläufe]
+"""
+from copy import deepcopy
+from decimal import Decimal
+import random
+import sys
+import timeit
+
+from control import data  # noqa: F401 (löst den zirkulären Import von process_log auf)
+from helpermodules.measurement_logging.process_log import (CalculationType, _process_entries, get_totals,
+                                                           process_entry, string_to_float, string_to_int)
+
+RUNS = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+MODULES = {"cp": ["cp3", "cp4", "cp5", "all"],
+           "counter": ["counter0", "counter1"],
+           "pv": ["pv1", "all"],
+           "bat": ["bat2", "all"],
+           "sh": ["sh1"],
+           "hc": ["all"]}
+
+
+def create_entries(number: int, interval: int):
+    random.seed(0)
+    meters = {}
+    entries = []
+    for i in range(number):
+        entry = {"timestamp": 1690529761 + i * interval, "date": str(i)}
+        for type, modules in MODULES.items():
+            entry[type] = {}
+            for module in modules:
+                if module == "cp5" and i < number // 2:
+                    # Ladepunkt kommt erst später hinzu
+                    continue
+                module_data = {}
+                for key in (("exported",) if type == "pv" else ("imported", "exported")):
+                    value = meters.get((module, key), random.uniform(0, 10000)) + random.uniform(0, interval / 10)
+                    if random.random() < 0.01:
+                        # Rücksprung des Zählerstands
+                        value -= 1000
+                    meters[(module, key)] = round(value, 3)
+                    module_data[key] = meters[(module, key)]
+                if type == "counter":
+                    module_data["grid"] = module == "counter0"
+                entry[type][module] = module_data
+        entries.append(entry)
+    return entries
+
+
+def process_entries_by_entry(entries, calculation):
+    # bisherige Implementierung aus _process_entries
+    for i in range(0, len(entries)-1):
+        entries[i] = process_entry(entries[i], entries[i+1], calculation)
+    entries.pop()
+    return entries
+
+
+def get_totals_by_entry(entries):
+    # bisherige Implementierung aus get_totals
+    totals = {"cp": {}, "counter": {}, "pv": {}, "bat": {}, "sh": {}, "hc": {}}
+    for totals_group in totals.keys():
+        for entry in entries:
+            if totals_group in entry:
+                for entry_module in entry[totals_group]:
+                    if entry_module not in totals[totals_group]:
+                        if totals_group == "hc":
+                            totals[totals_group][entry_module] = {"energy_imported": 0.0}
+                        elif totals_group == "pv":
+                            totals[totals_group][entry_module] = {"energy_exported": 0.0}
+                        else:
+                            totals[totals_group][entry_module] = {"energy_imported": 0.0, "energy_exported": 0.0}
+                            if totals_group == "counter" and "grid" in entry[totals_group][entry_module]:
+                                totals[totals_group][entry_module]["grid"] = entry[totals_group][entry_module]["grid"]
+                    for entry_module_key, entry_module_value in entry[totals_group][entry_module].items():
+                        if "grid" != entry_module_key and entry_module_key in totals[totals_group][entry_module]:
+                            value = (Decimal(str(totals[totals_group][entry_module][entry_module_key]))
+                                     + Decimal(str(entry_module_value * 1000)))
+                            value.quantize(Decimal('0.001'))
+                            value = f'{value: f}'
+                            totals[totals_group][entry_module][entry_module_key] = string_to_float(
+                                value) if "." in value else string_to_int(value)
+    return totals
+
+
+def by_entry(entries, calculation):
+    entries = process_entries_by_entry(entries, calculation)
+    return entries, get_totals_by_entry(entries)
+
+
+def by_column(entries, calculation):
+    entries = _process_entries(entries, calculation)
+    return entries, get_totals(entries, False)
+
+
+if __name__ == "__main__":
+    for name, entries, calculation in (("Tag (288 Einträge)", create_entries(289, 300), CalculationType.ALL),
+                                       ("365 Tage", create_entries(366, 86400), CalculationType.ENERGY)):
+        if by_entry(deepcopy(entries), calculation) != by_column(deepcopy(entries), calculation):
+            raise ValueError(f"{name}: Die Ergebnisse stimmen nicht überein.")
+        copies = [deepcopy(entries) for _ in range(2 * RUNS)]
+        old = timeit.timeit(lambda: by_entry(copies.pop(), calculation), number=RUNS)
+        new = timeit.timeit(lambda: by_column(copies.pop(), calculation), number=RUNS)
+        print(f"{name}: eintragsweise {old / RUNS * 1e3:.1f} ms, spaltenweise {new / RUNS * 1e3:.1f} ms "
+              f"({old / new:.1f}x)")